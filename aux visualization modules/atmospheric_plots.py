@@ -3,7 +3,7 @@
 
 # Author       : Edgar Carrillo
 # Created      : 2021-12-21
-# Last Modified: 2024-06-21
+# Last Modified: 2026-10-17
 # Affiliation  : Fisk University, Vanderbilt University
 
 '''
@@ -14,11 +14,15 @@ NOTE: please change file paths, directory names, and parameters as needed.
 '''
 
 
-import math
+import os
+import sys
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeviz', 'plumeria_wrappers'))
+from derived_quantities import relative_humidity
+
 sns.set_style("darkgrid")
 
 def read_sounding_file(file_path):
@@ -57,21 +61,15 @@ def process_sounding_data(lines):
 
 def calculate_relative_humidity(temp, dew):
     """
-    calculates the relative humidity given temperature and dew point
+    calculates the relative humidity given temperature and dew point, scalars or whole columns
     """
-    
-    beta = 17.625
-    lambd = 243.04
-    e_top = math.exp((beta * dew) / (lambd + dew))
-    e_bot = math.exp((beta * temp) / (lambd + temp))
-    rel_h = (e_top / e_bot) * 100
-    return rel_h
+    return relative_humidity(temp, dew)
 
 def add_relative_humidity(df):
     """
     adds a column for relative humidity to the DataFrame
     """
-    df['rel_humid (%)'] = df.apply(lambda x: calculate_relative_humidity(x['temp (c)'], x['dew pt (c)']), axis=1)
+    df['rel_humid (%)'] = calculate_relative_humidity(df['temp (c)'].astype(float), df['dew pt (c)'].astype(float))
     return df
 
 def plot_sounding_data(df):
@@ -3,7 +3,7 @@
 
 # Author       : Edgar Carrillo
 # Created      : 2023-05-01
-# Last Modified: 2024-06-21
+# Last Modified: 2026-10-17
 # Affiliation  : Fisk University, Vanderbilt University
 
 '''
@@ -25,8 +25,12 @@ import matplotlib.colors as mcolors
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 #import colormaps as cmaps
 import logging
+import os
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeviz', 'plumeria_wrappers'))
+from plume_dataset import PlumeDataset
+
 # set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -64,13 +68,15 @@ def plot_density_vs_mass_fraction(file_path, save_plots='no', plots_dir='plots_t
     """
     plot mixture density vs. mass fraction of external water with an inset plot for mass fractions.
     """
+    # only the plotted columns of the u = 100 m/s, T = 900 C runs are read
+    columns = ['initial velocity (m/s)', 'magma temperature (c)', 'T_mix', 'mixture density (kg/m3)',
+               'mass fraction water added', 'm_v', 'm_l', 'm_m']
     try:
-        df = pd.read_csv(file_path)
+        df = PlumeDataset(file_path).read(columns, u=100, T=900)
     except FileNotFoundError:
         logging.error(f"File not found: {file_path}")
         sys.exit(1)
 
-    df = df.loc[(df['initial velocity (m/s)'] == 100) & (df['magma temperature (c)'] == 900)]
     df['T_mix (c)'] = df['T_mix'].apply(k2c)
 
     minvalueT = df['T_mix (c)'].min()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Loose output files against run archives (run_archive.py, compression level 6 and 0): size and number
+of files on disk, bulk extraction of the CSV rows with profiles, and random access to single runs.
+The outputs are written by the mock Plumeria model (mock_plumeria.py).
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+from timeit import default_timer as timer
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(here, '..', 'plumeria_wrappers'))
+from plumeria_parser import format_output, parse_file
+from parallel_extract import extract_rows
+from run_archive import RunArchive, compact
+from mock_plumeria import mock_output
+
+n_runs = 20000
+n_random = 1000
+n_workers = os.cpu_count()
+
+
+def write_outputs(out_loc):
+    rng = np.random.default_rng(0)
+    for i in range(n_runs):
+        params = {'vent_diam': 2.0**rng.uniform(0, 15), 'vent_vel': 100., 'water_wt': rng.uniform(0, 0.2),
+                  'magma_temp': 900., 'gas_frac': 0.03, 'humid': 0., 'air_temp': 0., 'vent_elev': 0.,
+                  'specific_heat': 1000., 'magma_density': 2500.}
+        with open(os.path.join(out_loc, f"Grid_Runs_out_run{i}.txt"), 'w') as output_file:
+            output_file.write(format_output(*mock_output(params)))
+
+
+def timed(func):
+    start = timer()
+    result = func()
+    return result, timer() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        out_loc = os.path.join(directory, 'out')
+        os.makedirs(out_loc)
+        write_outputs(out_loc)
+        names = sorted(os.listdir(out_loc))
+        loose_size = sum(os.path.getsize(os.path.join(out_loc, name)) for name in names)
+
+        paths = [os.path.join(out_loc, name) for name in names]
+        sample = np.random.default_rng(1).choice(names, n_random)
+        loose_rows, loose_time = timed(lambda: extract_rows(paths, n_workers=n_workers, profiles=True))
+        loose_random = timed(lambda: [parse_file(os.path.join(out_loc, name)) for name in sample])[1]
+        results = {'loose': (len(names), loose_size, None, loose_time, loose_random)}
+
+        for level in [6, 0]:
+            archive_dir, compact_time = timed(lambda: compact(out_loc, f"{out_loc}_{level}.pvar", level=level))
+            archive = RunArchive(archive_dir)
+            archive_files = os.listdir(archive_dir)
+            archive_size = sum(os.path.getsize(os.path.join(archive_dir, name)) for name in archive_files)
+            rows, archive_time = timed(lambda: archive.extract_rows(names, n_workers=n_workers, profiles=True))
+            assert np.allclose(np.array(loose_rows[0], dtype=float), np.array(rows[0], dtype=float), equal_nan=True)
+            archive_random = timed(lambda: [archive.parse(name) for name in sample])[1]
+            results[f"level {level}"] = (len(archive_files), archive_size, compact_time, archive_time, archive_random)
+
+        print(f"{n_runs} runs, {n_workers} workers")
+        print(f"{'':<32}" + ''.join(f"{label:>12}" for label in results))
+        for i, (label, fmt, factor) in enumerate([('files', '.0f', 1), ('size on disk (MB)', '.1f', 1e-6),
+                                                  ('compaction (s)', '.1f', 1), ('bulk extraction with dz (s)', '.2f', 1),
+                                                  ('random run parse (ms)', '.3f', 1e3 / n_random)]):
+            print(f"{label:<32}" + ''.join(f"{'':>12}" if values[i] is None else f"{values[i] * factor:>12{fmt}}"
+                                           for values in results.values()))
+
+
+if __name__ == '__main__':
+    main()
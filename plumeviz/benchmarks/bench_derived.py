@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Time of the derived columns of the extract scripts, row-wise df.apply (copied below as legacy_*)
+against the vectorized functions of derived_quantities, on a synthetic frame of n_rows runs.
+Both paths must give the same columns.
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+from timeit import default_timer as timer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from derived_quantities import (adjust_vent, vent_equivalent, mer_eq, mass_flux, delta_z, richardson,
+                                reduced_gravity, relative_humidity)
+
+n_rows = 1_000_000
+
+m_cal   = 'mass flux total (kg/s)'
+ext_w   = 'mass fraction water added'
+vent    = 'vent diameter (m)'
+vel     = 'initial velocity (m/s)'
+rho_mix = 'mixture density (kg/m3)'
+plume_z = 'calculated heigth (km)'
+z_dry   = 'dry plume height (km)'
+Temp    = 'T_mix'
+vent_eq = 'vent equivalent init (m)'
+rho_0, g = 1.292, 9.81
+
+
+def make_frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        vent: rng.choice(2.0**np.arange(3, 10), n_rows),
+        vel: rng.choice([75., 100., 125.], n_rows),
+        ext_w: rng.choice(np.round(np.arange(0, 0.5, 0.02), 2), n_rows),
+        rho_mix: rng.uniform(2, 12, n_rows),
+        m_cal: rng.uniform(1e6, 1e10, n_rows),
+        plume_z: rng.uniform(0, 40, n_rows),
+        z_dry: rng.uniform(0, 40, n_rows),
+        Temp: rng.uniform(600, 1400, n_rows),
+        'temp (c)': rng.uniform(-60, 30, n_rows),
+        'dew pt (c)': rng.uniform(-80, 20, n_rows),
+    })
+
+
+def legacy(df, rho_dry):
+    """ batch_extract_plumeria_ouput_AUX.py, batch_extract_plumeria_output_Main.py and atmospheric_plots.py """
+    def vent_init(vent, rho_mix, w):
+        return round(vent * np.sqrt((rho_mix * (1 - w)) / rho_dry), 1)
+
+    def legacy_mer_eq(r, vel):
+        return np.pi * r**2 * 5.62 * vel
+
+    def legacy_richardson(rho, v_d, u_0):
+        red_g = (g * (rho - rho_0)) / rho_0
+        return (red_g * v_d) / (u_0**2)
+
+    def legacy_relative_humidity(temp, dew):
+        import math
+        return math.exp((17.625 * dew) / (243.04 + dew)) / math.exp((17.625 * temp) / (243.04 + temp)) * 100
+
+    out = pd.DataFrame(index=df.index)
+    out[vent_eq] = df.apply(lambda a: vent_init(a[vent], a[rho_mix], a[ext_w]), axis=1)
+    df = df.assign(**{vent_eq: out[vent_eq]})
+    out['mer eq'] = df.apply(lambda a: legacy_mer_eq(a[vent_eq], a[vel]), axis=1)
+    out['mass flux (kg/s)'] = df.apply(lambda a: a[m_cal] * (1 - a[ext_w]), axis=1)
+    out['delta z (km)'] = df.apply(lambda a: a[plume_z] - a[z_dry], axis=1)
+    out['Ri'] = df.apply(lambda a: legacy_richardson(a[rho_mix], a[vent_eq], a[vel]), axis=1)
+    out['Thermal Ri'] = df.apply(lambda a: legacy_richardson(a[vent_eq], a[vel], a[Temp]), axis=1)
+    out['g prime'] = df.apply(lambda a: (9.81 * a[rho_mix] - rho_0) / rho_0, axis=1)
+    out['vent adjusted (m)'] = df.apply(lambda a: np.sqrt(rho_dry / (a[rho_mix] * (1 - a[ext_w]))) * a[vent], axis=1)
+    out['rel_humid (%)'] = df.apply(lambda x: legacy_relative_humidity(x['temp (c)'], x['dew pt (c)']), axis=1)
+    return out
+
+
+def vectorized(df, rho_dry):
+    out = pd.DataFrame(index=df.index)
+    out[vent_eq] = vent_equivalent(df[vent], df[rho_mix], df[ext_w], rho_dry)
+    out['mer eq'] = mer_eq(out[vent_eq], df[vel])
+    out['mass flux (kg/s)'] = mass_flux(df[m_cal], df[ext_w])
+    out['delta z (km)'] = delta_z(df[plume_z], df[z_dry])
+    out['Ri'] = richardson(df[rho_mix], out[vent_eq], df[vel])
+    out['Thermal Ri'] = richardson(out[vent_eq], df[vel], df[Temp])
+    out['g prime'] = reduced_gravity(df[rho_mix])
+    out['vent adjusted (m)'] = adjust_vent(df[vent], df[rho_mix], df[ext_w], rho_dry)
+    out['rel_humid (%)'] = relative_humidity(df['temp (c)'], df['dew pt (c)'])
+    return out
+
+
+def main():
+    df = make_frame()
+    rho_dry = 5.62
+
+    start = timer()
+    expected = legacy(df, rho_dry)
+    legacy_time = timer() - start
+
+    start = timer()
+    result = vectorized(df, rho_dry)
+    vectorized_time = timer() - start
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)
+    print(f"{n_rows} rows, {len(result.columns)} derived columns")
+    print(f"{'df.apply':<16}{legacy_time:>10.2f} s")
+    print(f"{'vectorized':<16}{vectorized_time:>10.3f} s   ({legacy_time / vectorized_time:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Throughput (plots/second, one process) of the dz profile plots of plotting/batch_dz_plots_all.py:
+the reused DzFigure against a new pyplot figure per run as make_plots() did before (copied below as
+legacy_make_plots), and a check that both write the same PNG bytes. The outputs are written by the
+mock Plumeria model (mock_plumeria.py).
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from timeit import default_timer as timer
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.ticker import LogLocator
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(here, '..', 'plumeria_wrappers'))
+sys.path.append(os.path.join(here, '..', 'plotting'))
+from plumeria_parser import format_output
+import batch_dz_plots_all
+from batch_dz_plots_all import data_labels, plot_size, line_color, read_run, make_plots
+from mock_plumeria import mock_output
+
+n_plots = 200
+
+
+def legacy_make_plots(run_name):
+    """ batch_dz_plots_all.make_plots() before the DzFigure template """
+    plot_output_name = run_name.replace('.txt', '.png')
+    w, mer, v, dz = read_run(run_name)
+    df = pd.DataFrame(dz, columns=data_labels)
+
+    x_labels = [
+        r'$u \, \left( \frac{m}{s}\right)$', r'$T_{mix} (°C)$', r'$ \rho \, \left(\frac{kg}{m^3}\right) $',
+        'mass fraction, vapor & air', 'mass fraction, liquid & ice'
+    ]
+    f, axs = plt.subplots(1, 5, figsize=plot_size, sharey=True)
+
+    for i in range(5):
+        axs[i].grid(True, linestyle='--', linewidth=0.5, color='grey')
+        axs[i].grid(which='minor', color='lightgrey', linestyle=':', linewidth=0.5)
+        axs[i].minorticks_on()
+        axs[i].tick_params(axis="x", direction="in")
+        axs[i].tick_params(axis="y", direction="in")
+        axs[i].tick_params(which='minor', axis="x", direction="in")
+        axs[i].tick_params(which='minor', axis="y", direction="in")
+        axs[i].set_xlabel(x_labels[i])
+
+    axs[0].set_ylabel('z above vent (km)')
+
+    Z = df['z'] / 1000
+    axs[0].plot(df['u'], Z, linewidth=2, color=line_color)
+    axs[1].plot(df['T_mix'] - 273, Z, linewidth=2, color=line_color)
+    axs[2].plot(df['rho_mix'], Z, linewidth=2, color=line_color, label=r'$\rho_m$')
+    axs[2].plot(df['rho_air'], Z, linewidth=2, color='black', label=r'$\rho_a$')
+    axs[3].semilogx(df['m_v'], Z, linewidth=2, color=line_color, label=r'm$_{v}$')
+    axs[3].semilogx(df['m_a'], Z, linewidth=2, color='black', label=r'm$_{a}$')
+    axs[4].semilogx(df['m_l'], Z, linewidth=2, color=line_color, label=r'm$_{l}$')
+    axs[4].semilogx(df['m_i'], Z, linewidth=2, color='black', label=r'm$_{i}$')
+
+    for i in [2, 3, 4]:
+        axs[i].legend(loc=0, fancybox=True, shadow=True)
+
+    for i in [3, 4]:
+        axs[i].xaxis.set_minor_locator(LogLocator(base=100))
+        axs[i].tick_params(which='minor', labelbottom=False)
+        axs[i].set_xlim(left=0.0000001, right=1.1)
+
+    plt.suptitle('MER = ' + str(mer) + 'kg/s' + ', d = ' + str(v) + 'm')
+    plt.tight_layout()
+    plt.savefig(os.path.join(batch_dz_plots_all.plot_dir, plot_output_name))
+    plt.close('all')
+
+
+def write_outputs(out_loc):
+    rng = np.random.default_rng(0)
+    for i in range(n_plots):
+        params = {'vent_diam': 2.0**rng.uniform(0, 15), 'vent_vel': 100., 'water_wt': rng.uniform(0, 0.2),
+                  'magma_temp': 900., 'gas_frac': 0.03, 'humid': 0., 'air_temp': 0., 'vent_elev': 0.,
+                  'specific_heat': 1000., 'magma_density': 2500.}
+        with open(os.path.join(out_loc, f"Grid_Runs_out_run{i}.txt"), 'w') as output_file:
+            output_file.write(format_output(*mock_output(params)))
+
+
+def render(plot, out_loc, plot_dir, runs):
+    batch_dz_plots_all.output_dir, batch_dz_plots_all.plot_dir = out_loc, plot_dir
+    os.makedirs(plot_dir)
+    start = timer()
+    for run in runs:
+        plot(run)
+    return len(runs) / (timer() - start)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        out_loc = os.path.join(directory, 'out')
+        os.makedirs(out_loc)
+        write_outputs(out_loc)
+        runs = sorted(os.listdir(out_loc))
+
+        legacy_dir, template_dir = os.path.join(directory, 'legacy'), os.path.join(directory, 'template')
+        legacy_rate = render(legacy_make_plots, out_loc, legacy_dir, runs)
+        template_rate = render(make_plots, out_loc, template_dir, runs)
+
+        identical = 0
+        for run in runs:
+            name = run.replace('.txt', '.png')
+            with open(os.path.join(legacy_dir, name), 'rb') as a, open(os.path.join(template_dir, name), 'rb') as b:
+                identical += a.read() == b.read()
+
+        print(f"{n_plots} dz plots, one process")
+        print(f"{'pyplot figure per run':<28}{legacy_rate:>8.1f} plots/s")
+        print(f"{'DzFigure template':<28}{template_rate:>8.1f} plots/s ({template_rate / legacy_rate:.1f}x)")
+        print(f"identical PNGs: {identical}/{len(runs)}")
+
+
+if __name__ == '__main__':
+    main()
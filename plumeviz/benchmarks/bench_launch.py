@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Launch cost per run of the batch_executor backends: 'thread' (subprocess.run on a thread pool)
+against 'spawn' (posix_spawn and one reaping loop, process_launcher.py). The launched program does
+no work (/bin/true by default), so the runs per second are the launch throughput. The parent holds
+ballast_mb of touched memory, like an extraction or plotting session running the sweep.
+
+    python bench_launch.py [executable] [n_runs]
+"""
+
+import os
+import sys
+import numpy as np
+from timeit import default_timer as timer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from batch_executor import iter_batch
+
+n_runs = 5000
+n_workers = os.cpu_count()
+ballast_mb = 1000
+
+
+def main(executable):
+    ballast = np.ones(ballast_mb * 2**20 // 8)  # noqa: F841, kept alive during the launches
+    jobs = [(f"run{i}", 'Grid_Runs_in_run.txt') for i in range(n_runs)]
+    print(f"{n_runs} launches of {executable}, {n_workers} workers, {ballast_mb} MB parent")
+    print(f"{'':<10}{'runs/s':>10}{'us/run':>10}{'not on CPU (us)':>20}")
+    for backend in ['thread', 'spawn']:
+        start = timer()
+        results = list(iter_batch(jobs, executable, backend, n_workers, timeout=10))
+        elapsed = timer() - start
+        assert all(r.returncode == 0 for r in results)
+        measured = [r.wall_time - r.cpu_time for r in results if r.cpu_time is not None]
+        off_cpu = f"{np.mean(measured) * 1e6:>20.0f}" if measured else f"{'':>20}"
+        print(f"{backend:<10}{n_runs / elapsed:>10.0f}{elapsed / n_runs * 1e6:>10.0f}{off_cpu}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        n_runs = int(sys.argv[2])
+    main(sys.argv[1] if len(sys.argv) > 1 else '/bin/true')
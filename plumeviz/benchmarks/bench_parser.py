@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Throughput benchmark (files/second) of plumeria_parser against the readlines() based readers
+that the extract and plot scripts used before (copied below as legacy_*).
+
+Synthetic output files are written to a temporary directory with plumeria_parser.format_output().
+"""
+
+import os
+import re
+import sys
+import tempfile
+import numpy as np
+from contextlib import suppress
+from timeit import default_timer as timer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from plumeria_parser import format_output, parse_file, read_row
+
+n_files = 2000
+n_dz_rows = 300
+
+
+def legacy_read(path, expected_length=33):
+    """ extraction reader, batch_extract_plumeria_ouput_AUX.read() """
+    values_list = [np.nan] * expected_length
+    with open(path, "r") as output_file:
+        lines = output_file.readlines()
+    main_lines = lines[7:20]
+    end_lines = lines[-4:-1]
+    dz_0_line = lines[24] if len(lines) > 24 else "0"
+    for i, line in enumerate(main_lines):
+        values_list[i] = float(line.split(':')[1].strip())
+    start_index = len(main_lines)
+    for i, line in enumerate(end_lines):
+        values_list[start_index + i] = float(re.sub("km", "", line).strip().split('=')[1])
+    dz_values = [float(value) for value in dz_0_line.strip().split()]
+    values_list[start_index + len(end_lines):start_index + len(end_lines) + len(dz_values)] = dz_values
+    return values_list
+
+
+def legacy_plot_read(path):
+    """ dz plot readers, batch_dz_plots_all.read_mer_and_w() + read_txt(), opens the file twice """
+    with open(path, "r") as output_file:
+        lines = output_file.readlines()[10:20]
+    values_list1 = [float(line.rstrip().split(':')[1]) for line in lines]
+    with open(path, "r") as output_file:
+        dz_lines = output_file.readlines()[24:-5]
+    values_list = []
+    for dz_line in dz_lines:
+        vals = dz_line.strip().split()
+        with suppress(ValueError):
+            vals = [float(i) for i in vals]
+        values_list.append(vals)
+    return values_list1, np.vstack(values_list)
+
+
+def make_files(directory):
+    rng = np.random.default_rng(1)
+    paths = []
+    for i in range(n_files):
+        dz = rng.random((n_dz_rows, 17)) * 1000
+        path = os.path.join(directory, f"Grid_Runs_out_run{i}.txt")
+        with open(path, 'w') as output_file:
+            output_file.write(format_output(rng.random(13), rng.random(3) * 30, dz))
+        paths.append(path)
+    return paths
+
+
+def throughput(func, paths):
+    start = timer()
+    for path in paths:
+        func(path)
+    return len(paths) / (timer() - start)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_files(directory)
+        # warm the page cache so both readers see the same I/O
+        throughput(legacy_read, paths)
+
+        results = [
+            ('summary row, legacy read()', throughput(legacy_read, paths)),
+            ('summary row, read_row()', throughput(read_row, paths)),
+            ('full profile, legacy plot readers', throughput(legacy_plot_read, paths)),
+            ('full profile, parse_file()', throughput(parse_file, paths)),
+        ]
+
+    print(f"{n_files} files, {n_dz_rows} dz rows each")
+    for label, files_per_second in results:
+        print(f"{label:<36}{files_per_second:>10.0f} files/s")
+
+
+if __name__ == '__main__':
+    main()
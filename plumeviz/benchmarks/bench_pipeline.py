@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+End-to-end benchmark of the wrapper with the mock Plumeria executable (mock_plumeria.py).
+
+For every scale (number of runs) the stages of a sweep are timed on a synthetic d x w x T x u grid:
+    inputs       render and write the input decks (batch_plumeria_input_bulk_MAIN.render_inp_file)
+    launch       run mock_plumeria.py on the decks through batch_executor.iter_batch, at most
+                 launch_limit runs per scale since every launch starts a Python interpreter
+    extraction   parse the output files (parallel_extract.extract_rows), the outputs of the runs that
+                 were not launched are written in-process with the same mock model
+    derived      derived columns and dry plume heights (derived_quantities)
+    ri_borders   Ri border detection (ri_module.data_processing.ri_borders_grouped)
+    plotting     3x3 grid figure (plotting/batch_plot_GRID.py), saved to a png
+
+Results are written to report_path as JSON (seconds per stage and runs per second) so that runs of
+different releases can be compared.
+
+Usage:
+    python bench_pipeline.py               # scales 1k, 10k, 100k
+    python bench_pipeline.py 1000 10000    # selected scales
+"""
+
+import os
+import sys
+import json
+import time
+import itertools
+import platform
+import subprocess
+import tempfile
+import numpy as np
+import pandas as pd
+from timeit import default_timer as timer
+
+import matplotlib
+matplotlib.use('Agg')
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(here, '..', 'plumeria_wrappers'))
+sys.path.append(os.path.join(here, '..', 'plotting'))
+sys.path.append(os.path.join(here, '..', '..', 'ri_module'))
+from plumeria_parser import ROW_COLUMNS, format_output
+from batch_executor import iter_batch
+from parallel_extract import extract_rows
+from derived_quantities import (dry_density, vent_equivalent, mer_eq, mass_flux, delta_z, richardson,
+                                reduced_gravity, reference_join)
+from batch_plumeria_input_bulk_MAIN import render_inp_file
+from data_processing import ri_borders_grouped
+from batch_plot_GRID import plot_plumeria_results
+from mock_plumeria import read_deck, deck_params, mock_output
+
+scales = [1000, 10000, 100000]
+launch_limit = 2000
+dz_rows = 50            # dz rows per mock output, keeps 100k outputs at a few hundred MB
+n_workers = os.cpu_count()
+report_path = os.path.join(here, 'bench_pipeline.json')
+mock_loc = os.path.join(here, 'mock_plumeria.py')
+
+velocities = [75, 100, 125]
+temperatures = [700, 900, 1100]
+water_fractions = [w / 100 for w in range(21)]
+
+
+def sweep(n_runs):
+    """First n_runs points of a d x w x T x u grid, the number of diameters grows with n_runs."""
+    n_d = -(-n_runs // (len(velocities) * len(temperatures) * len(water_fractions)))
+    diameters = np.round(2.0**np.linspace(0, 15, n_d), 4)
+    grid = itertools.product(velocities, temperatures, water_fractions, diameters)
+    return list(itertools.islice(grid, n_runs))
+
+
+def stage_inputs(points, inp_dir, out_dir):
+    names = []
+    for i, (u, T, w, d) in enumerate(points):
+        name = f"run{i}"
+        with open(os.path.join(inp_dir, f"Grid_Runs_in_{name}.txt"), 'w') as deck:
+            deck.write(render_inp_file(name, T, 0.03, d, u, w, 0, out_dir))
+        names.append(name)
+    return names
+
+
+def stage_launch(names, inp_dir):
+    jobs = [(name, os.path.join(inp_dir, f"Grid_Runs_in_{name}.txt")) for name in names]
+    env = {'MOCK_PLUMERIA_ROWS': str(dz_rows)}
+    os.environ.update(env)
+    failed = [r.name for r in iter_batch(jobs, mock_loc, 'thread', n_workers, timeout=30) if r.returncode != 0]
+    if failed:
+        raise RuntimeError(f"{len(failed)} mock runs failed, e.g. {failed[0]}")
+
+
+def write_mock_outputs(names, inp_dir):
+    """Outputs of the runs that were not launched, same model as the executable without the process start."""
+    for name in names:
+        params = deck_params(read_deck(os.path.join(inp_dir, f"Grid_Runs_in_{name}.txt")))
+        header, heights, dz = mock_output(params, dz_rows)
+        with open(params['out_path'], 'w') as output_file:
+            output_file.write(format_output(header, heights, dz))
+
+
+def stage_extraction(names, out_dir):
+    paths = [os.path.join(out_dir, f"Grid_Runs_out_{name}.txt") for name in names]
+    rows, _ = extract_rows(paths, len(ROW_COLUMNS), n_workers)
+    df = pd.DataFrame(rows, columns=ROW_COLUMNS)
+    df['run'] = names
+    return df
+
+
+def stage_derived(df):
+    w, rho, vent, vel = 'mass fraction water added', 'mixture density (kg/m3)', 'vent diameter (m)', 'initial velocity (m/s)'
+    rho_dry = dry_density(df[w], df[rho])
+    df['vent equivalent init (m)'] = vent_equivalent(df[vent], df[rho], df[w], rho_dry)
+    df['mer eq'] = mer_eq(df['vent equivalent init (m)'], df[vel])
+    df['mass flux (kg/s)'] = mass_flux(df['mass flux total (kg/s)'], df[w])
+    keys = [vel, 'magma temperature (c)', 'vent equivalent init (m)']
+    df['dry plume height (km)'] = reference_join(df, keys, 'calculated heigth (km)', df[w] == 0)
+    df['delta z (km)'] = delta_z(df['calculated heigth (km)'], df['dry plume height (km)'])
+    df['Ri'] = richardson(df[rho], df['vent equivalent init (m)'], df[vel])
+    df['g prime'] = reduced_gravity(df[rho])
+    return df
+
+
+def stage_ri_borders(df):
+    # ri_module spells the plume height column 'calculated height (km)'
+    df = df.rename(columns={'calculated heigth (km)': 'calculated height (km)'})
+    return ri_borders_grouped(df, velocities, temperatures, water_fractions)
+
+
+def stage_plotting(df, directory):
+    csv_path = os.path.join(directory, 'results.csv')
+    df.to_csv(csv_path, index=False)
+    cwd = os.getcwd()
+    os.chdir(directory)  # batch_plot_GRID saves to the working directory
+    try:
+        plot_plumeria_results(csv_path, save_plots='yes')
+    finally:
+        os.chdir(cwd)
+
+
+def run_scale(n_runs):
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        inp_dir, out_dir = os.path.join(directory, 'inp'), os.path.join(directory, 'out')
+        os.makedirs(inp_dir)
+        os.makedirs(out_dir)
+        points = sweep(n_runs)
+
+        def timed(stage, func, *args):
+            start = timer()
+            result = func(*args)
+            timings[stage] = timer() - start
+            print(f"  {stage:<12}{timings[stage]:>10.3f} s")
+            return result
+
+        names = timed('inputs', stage_inputs, points, inp_dir, out_dir)
+        n_launched = min(n_runs, launch_limit)
+        timed('launch', stage_launch, names[:n_launched], inp_dir)
+        write_mock_outputs(names[n_launched:], inp_dir)
+        df = timed('extraction', stage_extraction, names, out_dir)
+        df = timed('derived', stage_derived, df)
+        borders = timed('ri_borders', stage_ri_borders, df)
+        timed('plotting', stage_plotting, df, directory)
+
+    return {
+        'runs': n_runs,
+        'launched_runs': n_launched,
+        'ri_borders_found': len(borders),
+        'seconds': timings,
+        'runs_per_second': {stage: (n_launched if stage == 'launch' else n_runs) / seconds
+                            for stage, seconds in timings.items() if seconds > 0},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=here, capture_output=True,
+                              text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(scales):
+    report = {
+        'revision': git_revision(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'n_workers': n_workers,
+        'results': [],
+    }
+    for n_runs in scales:
+        print(f"{n_runs} runs")
+        report['results'].append(run_scale(n_runs))
+
+    with open(report_path, 'w') as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"Report saved at {report_path}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or scales)
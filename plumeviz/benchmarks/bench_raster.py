@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Time and PNG size of the 3x3 grid figure (plotting/batch_plot_GRID.py) drawn as scatter plots and as
+rasters (density_raster.py) for growing numbers of runs. The runs are random (log mass flux, w) points
+with a smooth height, written to a CSV; the CSV read time is reported on its own.
+
+    python bench_raster.py [n_rows ...]
+"""
+
+import os
+import sys
+import tempfile
+import warnings
+import numpy as np
+import pandas as pd
+from timeit import default_timer as timer
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(here, '..', 'plumeria_wrappers'))
+sys.path.append(os.path.join(here, '..', 'plotting'))
+from plume_dataset import PlumeDataset
+from batch_plot_GRID import plot_plumeria_results
+
+row_counts = [10_000, 100_000, 1_000_000]
+scatter_limit = 100_000     # scatter plots above this take minutes, they are skipped
+
+
+def write_runs(csv_path, n_rows):
+    rng = np.random.default_rng(0)
+    log_mer = rng.uniform(3, 12, n_rows)
+    w = rng.uniform(0, 0.3, n_rows)
+    pd.DataFrame({
+        'initial velocity (m/s)': rng.choice([75, 100, 125], n_rows),
+        'magma temperature (c)': rng.choice([700, 900, 1100], n_rows),
+        'mass fraction water added': w,
+        'mass flux (kg/s)': 10**log_mer,
+        'calculated heigth (km)': 0.25 * 10**(log_mer / 4) * (1 - np.tanh(20 * (w - 0.02 * log_mer))) / 2,
+    }).to_csv(csv_path, index=False)
+
+
+def render(csv_path, mode):
+    start = timer()
+    plot_plumeria_results(csv_path, save_plots='yes', render=mode)
+    elapsed = timer() - start
+    plt.close('all')
+    return elapsed, os.path.getsize('mass_flux_gradient_sample.png') / 1e6
+
+
+def main():
+    warnings.filterwarnings('ignore', message='This figure includes Axes that are not compatible with tight_layout')
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)   # batch_plot_GRID saves to the working directory
+        print(f"{'runs':>10}{'csv read (s)':>14}{'scatter (s)':>14}{'raster (s)':>14}{'scatter MB':>12}{'raster MB':>12}")
+        for n_rows in row_counts:
+            csv_path = os.path.join(directory, f"runs_{n_rows}.csv")
+            write_runs(csv_path, n_rows)
+            start = timer()
+            PlumeDataset(csv_path, cache_size=0).read()
+            read_time = timer() - start
+
+            scatter_time = scatter_size = np.nan
+            if n_rows <= scatter_limit:
+                scatter_time, scatter_size = render(csv_path, 'scatter')
+            raster_time, raster_size = render(csv_path, 'raster')
+            print(f"{n_rows:>10}{read_time:>14.2f}{scatter_time:>14.2f}{raster_time:>14.2f}{scatter_size:>12.2f}{raster_size:>12.2f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        row_counts = [int(n) for n in sys.argv[1:]]
+    main()
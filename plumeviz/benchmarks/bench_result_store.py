@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Load time and size of a synthetic extracted result (n_rows runs, the 33 extracted columns plus
+derived columns and the run name) as CSV with pd.read_csv against the result store of result_store.py:
+open, full load, and one (u, T) panel of four columns.
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from timeit import default_timer as timer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from plumeria_parser import ROW_COLUMNS
+from result_store import ResultStore, convert_csv
+
+n_rows = 1_000_000
+
+panel_columns = ['mass flux (kg/s)', 'mass fraction water added', 'calculated heigth (km)', 'Ri']
+panel_filters = {'initial velocity (m/s)': 100, 'magma temperature (c)': 900}
+
+
+def make_frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((n_rows, len(ROW_COLUMNS))) * 1000, columns=ROW_COLUMNS)
+    df['vent diameter (m)'] = rng.choice(2.0**np.arange(0, 16, 0.05), n_rows)
+    df['mass fraction water added'] = rng.choice(np.arange(61) / 100, n_rows)
+    df['magma temperature (c)'] = rng.choice([700., 900., 1100.], n_rows)
+    df['initial velocity (m/s)'] = rng.choice([75., 100., 125.], n_rows)
+    df['Relative humidity, %'] = 0.
+    for column in ['mass flux (kg/s)', 'vent equivalent init (m)', 'dry plume height (km)', 'delta z (km)',
+                   'Ri', 'Thermal Ri', 'g prime']:
+        df[column] = rng.random(n_rows)
+    df['run'] = [f"Grid_Runs_out_{i:024x}.txt" for i in range(n_rows)]
+    return df
+
+
+def timed(func):
+    start = timer()
+    result = func()
+    return result, timer() - start
+
+
+def directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'results.csv')
+        make_frame().to_csv(csv_path, index=False)
+        store_dir, convert_time = timed(lambda: convert_csv(csv_path))
+
+        df, csv_time = timed(lambda: pd.read_csv(csv_path))
+        csv_memory = df.memory_usage(deep=True).sum()
+        del df
+        csv_panel = timed(lambda: pd.read_csv(csv_path, usecols=panel_columns + list(panel_filters)))[1]
+
+        store, open_time = timed(lambda: ResultStore(store_dir))
+        df, store_time = timed(store.to_frame)
+        store_memory = df.memory_usage(deep=True).sum()
+        del df
+        store_panel = timed(lambda: ResultStore(store_dir).read(panel_columns, panel_filters))[1]
+
+        print(f"{n_rows} rows, {len(store.columns)} columns, converted in {convert_time:.1f} s")
+        print(f"{'':<28}{'CSV':>12}{'store':>12}")
+        print(f"{'size on disk (MB)':<28}{os.path.getsize(csv_path) / 1e6:>12.0f}{directory_size(store_dir) / 1e6:>12.0f}")
+        print(f"{'open (s)':<28}{'':>12}{open_time:>12.4f}")
+        print(f"{'full load (s)':<28}{csv_time:>12.2f}{store_time:>12.2f}")
+        print(f"{'full load memory (MB)':<28}{csv_memory / 1e6:>12.0f}{store_memory / 1e6:>12.0f}")
+        print(f"{'(u, T) panel, 4 columns (s)':<28}{csv_panel:>12.2f}{store_panel:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Per-run file I/O of a sweep with the run file layouts of run_paths.py: write an input deck and an
+output file per run, list the outputs, read them back and delete them, in a flat directory, with one
+shard level and in scratch (/dev/shm). Run it with the directory of the shared filesystem as argument
+to see the metadata cost there:
+
+    python bench_run_io.py /path/on/shared/filesystem [n_runs]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from timeit import default_timer as timer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from run_paths import input_path, output_path, make_shards, scan_files, scratch_dir
+
+n_runs = 100_000
+deck = 'x' * 1500       # size of an input deck
+output = 'x' * 30000    # size of an output file with a few hundred dz rows
+
+
+def run_io(root, levels):
+    dir_loc, out_loc = os.path.join(root, 'inp'), os.path.join(root, 'out')
+    timings = {}
+    start = timer()
+    make_shards(dir_loc, levels)
+    make_shards(out_loc, levels)
+    for i in range(n_runs):
+        name = f"run{i}"
+        with open(input_path(dir_loc, name, levels), 'w') as f:
+            f.write(deck)
+        with open(output_path(out_loc, name, levels), 'w') as f:
+            f.write(output)
+    timings['write'] = timer() - start
+
+    start = timer()
+    paths = [entry.path for _, entry in scan_files(out_loc)]
+    timings['list'] = timer() - start
+
+    start = timer()
+    for path in paths:
+        with open(path, 'rb') as f:
+            f.read()
+    timings['read'] = timer() - start
+
+    start = timer()
+    shutil.rmtree(root)
+    timings['delete'] = timer() - start
+    return timings
+
+
+def main(directory):
+    layouts = [('flat', directory, 0), ('1 shard level', directory, 1),
+               ('scratch, 1 shard level', scratch_dir(os.path.join(directory, 'bench')), 1)]
+    print(f"{n_runs} runs, us per run")
+    print(f"{'':<26}{'write':>10}{'list':>10}{'read':>10}{'delete':>10}")
+    for label, parent, levels in layouts:
+        os.makedirs(parent, exist_ok=True)
+        timings = run_io(tempfile.mkdtemp(dir=parent), levels)
+        print(f"{label:<26}" + ''.join(f"{timings[k] / n_runs * 1e6:>10.1f}" for k in ['write', 'list', 'read', 'delete']))
+    shutil.rmtree(layouts[-1][1], ignore_errors=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        n_runs = int(sys.argv[2])
+    main(sys.argv[1] if len(sys.argv) > 1 else tempfile.gettempdir())
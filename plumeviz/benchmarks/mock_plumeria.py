@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Stand-in for the Plumeria v2.3.1 executable, for profiling the wrapper without the Fortran binary.
+
+Reads an input deck written by make_inp_file() (batch_plumeria_input_bulk_MAIN.py) and writes an
+output file with the same layout as Plumeria (header, dz table, footer heights, see
+plumeria_parser.format_output) to the output path given in the deck. The numbers come from simple
+closed-form estimates (mixture density, Mastin et al. 2009 height, a Richardson number collapse
+criterion), they are deterministic but are not Plumeria results.
+
+Usage, set plumeria_loc in input_parameters.py to this file or call it directly:
+    ./mock_plumeria.py inp_TEST/Grid_Runs_in_run1.txt
+
+Environment variables:
+    MOCK_PLUMERIA_DELAY   seconds to sleep before writing the output (default 0)
+    MOCK_PLUMERIA_ROWS    maximum number of dz rows (default 300)
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from plumeria_parser import format_output
+
+RHO_0 = 1.292       # air density at the vent, kg/m^3
+R_VAPOR = 461.5     # gas constant of water vapor, J/kg K
+
+
+def read_deck(path):
+    """Values of an input deck in order, comment lines and trailing comments removed."""
+    values = []
+    with open(path) as deck:
+        for line in deck:
+            value = line.split('#', 1)[0].strip()
+            if value:
+                values.append(value)
+    return values
+
+
+def deck_params(values):
+    """Run parameters from the deck values (order of render_inp_file, no sounding file)."""
+    return {
+        'out_path': values[0],
+        'air_temp': float(values[2]), 'humid': float(values[3]), 'vent_elev': float(values[8]),
+        'vent_diam': float(values[9]), 'vent_vel': float(values[10]), 'water_wt': float(values[11]),
+        'magma_temp': float(values[12]), 'gas_frac': float(values[13]),
+        'specific_heat': float(values[14]), 'magma_density': float(values[15]),
+    }
+
+
+def mock_output(params, max_rows=300):
+    """Header, heights and dz table of one mock run."""
+    d, u, w = params['vent_diam'], params['vent_vel'], params['water_wt']
+    T_mix = (params['magma_temp'] + 273.15) * (1 - w) + 373.15 * w
+    n = params['gas_frac'] * (1 - w) + w                               # mass fraction of volatiles
+    rho_gas = 101325 / (R_VAPOR * T_mix)
+    rho_mix = 1 / (n / rho_gas + (1 - n) / params['magma_density'])
+    mass_flux = rho_mix * np.pi * (d / 2)**2 * u
+
+    # Mastin et al. (2009) height from the DRE volume flux, columns with Ri > 1 collapse
+    mastin = 2.0 * (mass_flux * (1 - w) / params['magma_density'])**0.241
+    ri = 9.81 * (rho_mix - RHO_0) / RHO_0 * d / u**2
+    height = mastin * (1 - 0.3 * w) if ri < 1 else 0.1 * mastin
+    sparks = 0.9 * mastin
+
+    header = [params['humid'], params['air_temp'], 1.0, d, params['vent_elev'], u, params['magma_temp'],
+              params['gas_frac'], params['specific_heat'], params['magma_density'], rho_mix, w, mass_flux]
+
+    n_rows = int(np.clip(height * 10, 5, max_rows))
+    z = np.linspace(0, height * 1000, n_rows)
+    decay = np.exp(-z / max(height * 1000, 1))
+    m_a = 1 - decay
+    dz = np.column_stack([
+        np.arange(n_rows), z, (1 - n) * decay, m_a, n * decay, 0.5 * w * decay, np.zeros(n_rows),
+        u * decay, d / 2 * (1 + z / 100), 273.15 + (T_mix - 273.15) * decay, 273.15 - 0.0065 * z,
+        rho_mix * decay + RHO_0 * m_a, RHO_0 * np.exp(-z / 8000), z / max(u, 1), np.exp(-z / 8000),
+        0.5 * w * decay, np.zeros(n_rows),
+    ])
+    return header, [height, sparks, mastin], dz
+
+
+def main(deck_path):
+    params = deck_params(read_deck(deck_path))
+    time.sleep(float(os.environ.get('MOCK_PLUMERIA_DELAY', 0)))
+    header, heights, dz = mock_output(params, int(os.environ.get('MOCK_PLUMERIA_ROWS', 300)))
+    with open(params['out_path'], 'w') as output_file:
+        output_file.write(format_output(header, heights, dz))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        raise SystemExit('usage: mock_plumeria.py input_deck.txt')
+    main(sys.argv[1])
@@ -3,7 +3,7 @@
 
 # Author       : Edgar Carrillo
 # Created      : 2023-04-21
-# Last Modified: 2024-06-22
+# Last Modified: 2026-10-17
 # Affiliation  : Fisk University, Vanderbilt University
 
 
@@ -11,23 +11,37 @@
 This script generates DZ plots for Plumeria simulation results, depicting variables such as upward velocity, plume bulk temperature, plume bulk density, 
 and mass fractions of vapor, air, liquid, and ice as functions of plume height. These plots are intended for single run results. 
 If you need to plot multiple runs, consider adding a sorting method to manage the plotted results effectively.
+
+With incremental = True a manifest of the rendered plots (plot_manifest.csv in plot_dir: output file size, mtime,
+sha256 and plot style) is kept, and a re-run only renders the plots whose output file or style changed, or whose
+PNG is missing. Bump plot_style_version after changing DzFigure, changes of params, plot_size or line_color are
+picked up on their own.
 """
 
 import os
+import sys
+import hashlib
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.ticker import LogLocator
 from joblib import Parallel, delayed
 from timeit import default_timer as timer
-from contextlib import suppress
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from plumeria_parser import parse_file
 
 # Global Variables and Paths
 n_cores = os.cpu_count()
 #path_plots = '/Volumes/ed_ext/'
 output_dir = 'output_TEST/'
 plot_dir = 'Plots_TEST/'
+incremental = True       # only render new or changed runs, see plot_manifest.csv in plot_dir
+confirm_above = 10       # ask before rendering more plots than this from a terminal, None never asks
+manifest_every = 1000    # plots rendered between manifest saves
 
 data_labels = [
     'inum', 'z', 'm_m', 'm_a', 'm_v', 'm_l', 'm_i', 'u', 'r', 'T_mix', 
@@ -48,49 +62,35 @@ plt.rcParams.update(params)
 plot_size = [15, 7]
 colors = ['black', 'navy', 'blueviolet', 'royalblue', 'teal', 'lightseagreen', 'green', 'yellowgreen']
 line_color = mcolors.CSS4_COLORS[colors[3]]
+plot_style_version = 1   # bump when the figure layout changes, plots of an older style are rendered again
 
-def get_data(line):
-    vals = line.strip().split()
-    with suppress(ValueError):
-        vals = [float(i) for i in vals]
-    return vals
-
-def split_into_columns(row_of_data):
-    row_of_data = row_of_data.rstrip()
-    values = float(row_of_data.split(':')[1])
-    return values
-
-def read_mer_and_w(run):
-    with open(os.path.join(output_dir, run), "r") as output_file:
-        lines = output_file.readlines()[10:20]
-    values_list1 = [split_into_columns(line) for line in lines]
-    vent_diameter = values_list1[-10]
-    external_water_wt = values_list1[-2]
-    mass_eruption_rate = "{:.2e}".format(values_list1[-1])
-    return external_water_wt, mass_eruption_rate, vent_diameter
-
-def read_txt(run):
-    with open(os.path.join(output_dir, run), "r") as output_file:
-        dz_lines = output_file.readlines()[24:-5]
-    values_list = [get_data(dz_line) for dz_line in dz_lines]
-    return values_list
+MANIFEST_COLUMNS = ['run', 'size', 'mtime_ns', 'source_hash', 'style']
 
-def make_plots(run_name):
-    w, mer, v = read_mer_and_w(run_name)
-    plot_output_name = run_name.replace('.txt', '.png')
-    try:
-        extracted_data = read_txt(run_name)
-        extracted_data_stack = np.vstack(extracted_data)
+def read_run(run):
+    """ Read an output file once, returns w, MER, vent diameter and the dz table. """
+    parsed = parse_file(os.path.join(output_dir, run))
+    vent_diameter = parsed.header[3]
+    external_water_wt = parsed.header[11]
+    mass_eruption_rate = "{:.2e}".format(parsed.header[12])
+    return external_water_wt, mass_eruption_rate, vent_diameter, parsed.dz
 
-        df = pd.DataFrame(extracted_data_stack, columns=data_labels)
+x_labels = [
+    r'$u \, \left( \frac{m}{s}\right)$', r'$T_{mix} (°C)$', r'$ \rho \, \left(\frac{kg}{m^3}\right) $',
+    'mass fraction, vapor & air', 'mass fraction, liquid & ice'
+]
 
-        x_labels = [
-            r'$u \, \left( \frac{m}{s}\right)$', r'$T_{mix} (°C)$', r'$ \rho \, \left(\frac{kg}{m^3}\right) $',
-            'mass fraction, vapor & air', 'mass fraction, liquid & ice'
-        ]
-        f, axs = plt.subplots(1, 5, figsize=plot_size, sharey=True)
+class DzFigure:
+    """
+    The 1x5 dz figure, built once per worker. Each run only replaces the line data and the title,
+    then the figure is laid out again and written through its Agg canvas, which gives the same PNG
+    as building a new pyplot figure for every run.
+    """
+
+    def __init__(self):
+        self.figure = Figure(figsize=plot_size)
+        FigureCanvasAgg(self.figure)
+        axs = self.figure.subplots(1, 5, sharey=True)
 
-        state = 0
         for i in range(5):
             axs[i].grid(True, linestyle='--', linewidth=0.5, color='grey')
             axs[i].grid(which='minor', color='lightgrey', linestyle=':', linewidth=0.5)
@@ -99,29 +99,21 @@ def make_plots(run_name):
             axs[i].tick_params(axis="y", direction="in")
             axs[i].tick_params(which='minor', axis="x", direction="in")
             axs[i].tick_params(which='minor', axis="y", direction="in")
-            axs[i].set_xlabel(x_labels[state])
-            state += 1
+            axs[i].set_xlabel(x_labels[i])
 
         axs[0].set_ylabel('z above vent (km)')
 
-        U = df['u']
-        Z = df['z'] / 1000
-        T = df['T_mix'] - 273
-        m_A = df['m_a']
-        m_V = df['m_v']
-        m_L = df['m_l']
-        m_I = df['m_i']
-        Rho = df['rho_mix']
-        Rho_a = df['rho_air']
-
-        axs[0].plot(U, Z, linewidth=2, color=line_color)
-        axs[1].plot(T, Z, linewidth=2, color=line_color)
-        axs[2].plot(Rho, Z, linewidth=2, color=line_color, label=r'$\rho_m$')
-        axs[2].plot(Rho_a, Z, linewidth=2, color='black', label=r'$\rho_a$')
-        axs[3].semilogx(m_V, Z, linewidth=2, color=line_color, label=r'm$_{v}$')
-        axs[3].semilogx(m_A, Z, linewidth=2, color='black', label=r'm$_{a}$')
-        axs[4].semilogx(m_L, Z, linewidth=2, color=line_color, label=r'm$_{l}$')
-        axs[4].semilogx(m_I, Z, linewidth=2, color='black', label=r'm$_{i}$')
+        # one line per plotted variable, in the order of the columns returned by _profiles()
+        self.lines = [
+            axs[0].plot([], [], linewidth=2, color=line_color)[0],
+            axs[1].plot([], [], linewidth=2, color=line_color)[0],
+            axs[2].plot([], [], linewidth=2, color=line_color, label=r'$\rho_m$')[0],
+            axs[2].plot([], [], linewidth=2, color='black', label=r'$\rho_a$')[0],
+            axs[3].semilogx([], [], linewidth=2, color=line_color, label=r'm$_{v}$')[0],
+            axs[3].semilogx([], [], linewidth=2, color='black', label=r'm$_{a}$')[0],
+            axs[4].semilogx([], [], linewidth=2, color=line_color, label=r'm$_{l}$')[0],
+            axs[4].semilogx([], [], linewidth=2, color='black', label=r'm$_{i}$')[0],
+        ]
 
         for i in [2, 3, 4]:
             axs[i].legend(loc=0, fancybox=True, shadow=True)
@@ -131,13 +123,99 @@ def make_plots(run_name):
             axs[i].tick_params(which='minor', labelbottom=False)
             axs[i].set_xlim(left=0.0000001, right=1.1)
 
-        plt.suptitle('MER = ' + str(mer) +'kg/s' +', d = ' + str(v)+ 'm')
-        plt.tight_layout()
-        plt.savefig(os.path.join(plot_dir, plot_output_name))
-        plt.close('all')
+        self.axs = axs
+        self.title = self.figure.suptitle('')
+        # tight_layout() starts from the current subplot parameters, every run starts from those of a new figure
+        params = self.figure.subplotpars
+        self.subplot_params = {k: getattr(params, k) for k in ['left', 'right', 'bottom', 'top', 'wspace', 'hspace']}
+
+    def render(self, dz, title, path):
+        """ Plot a dz table (plumeria_parser.DZ_COLUMNS) and save it to path. """
+        z = dz[:, data_labels.index('z')] / 1000
+        for line, x in zip(self.lines, _profiles(dz)):
+            line.set_data(x, z)
+        for ax in self.axs:
+            ax.relim()
+            ax.autoscale_view()
+        self.title.set_text(title)
+        self.figure.subplots_adjust(**self.subplot_params)
+        self.figure.tight_layout()
+        self.figure.canvas.print_png(path)
+
+def _profiles(dz):
+    """ u, T (°C), rho_mix, rho_air, m_v, m_a, m_l, m_i columns of a dz table. """
+    column = {label: dz[:, i] for i, label in enumerate(data_labels)}
+    return [column['u'], column['T_mix'] - 273, column['rho_mix'], column['rho_air'],
+            column['m_v'], column['m_a'], column['m_l'], column['m_i']]
+
+_figure = None
+
+def make_plots(run_name):
+    """ Plot one run, the DzFigure of the worker process is created at its first plot. Returns True on success. """
+    global _figure
+    plot_output_name = run_name.replace('.txt', '.png')
+    try:
+        w, mer, v, dz = read_run(run_name)
+        if _figure is None:
+            _figure = DzFigure()
+        _figure.render(dz, 'MER = ' + str(mer) +'kg/s' +', d = ' + str(v)+ 'm', os.path.join(plot_dir, plot_output_name))
+        return True
 
     except Exception as e:
         print(f'Failed run {run_name}: {e}')
+        return False
+
+def plot_style():
+    """ Hash of everything that changes how a plot looks. """
+    style = repr((plot_style_version, sorted(params.items()), plot_size, line_color))
+    return hashlib.md5(style.encode()).hexdigest()[:12]
+
+def file_sha256(path, chunk_size=1 << 20):
+    """ sha256 of an output file, not memoised: every file is hashed at most once per run. """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_plot_manifest(manifest_path):
+    """ Rendered plots as {run: (size, mtime_ns, source_hash, style)}, empty if there is no manifest yet. """
+    if not os.path.exists(manifest_path):
+        return {}
+    manifest = pd.read_csv(manifest_path, dtype={'run': str, 'size': np.int64, 'mtime_ns': np.int64,
+                                                 'source_hash': str, 'style': str})
+    return {row[0]: tuple(row[1:]) for row in manifest.itertuples(index=False)}
+
+def save_plot_manifest(manifest_path, manifest):
+    """ Write the manifest through a temporary file so an interrupted write never leaves it half written. """
+    df = pd.DataFrame([(run, *entry) for run, entry in manifest.items()], columns=MANIFEST_COLUMNS)
+    tmp_path = manifest_path + '.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, manifest_path)
+
+def plots_to_render(runs, manifest, style):
+    """
+    Compare the output files against the manifest.
+
+    The sha256 of a file is only computed when its size or mtime differ from the manifest, a file that was
+    rewritten with the same content keeps its plot.
+
+    Returns:
+        tuple: (runs to render, {run: manifest entry} of every run, with the current size, mtime and hash)
+    """
+    stale, current = [], {}
+    for run in runs:
+        stat = os.stat(os.path.join(output_dir, run))
+        entry = manifest.get(run)
+        if entry is not None and (entry[0], entry[1]) == (stat.st_size, stat.st_mtime_ns):
+            source_hash = entry[2]
+        else:
+            source_hash = file_sha256(os.path.join(output_dir, run))
+        current[run] = (stat.st_size, stat.st_mtime_ns, source_hash, style)
+        png = os.path.join(plot_dir, run.replace('.txt', '.png'))
+        if entry is None or entry[2:] != (source_hash, style) or not os.path.exists(png):
+            stale.append(run)
+    return stale, current
 
 def get_user_confirmation():
     response = input("Do you want to continue? (yes/no): ").strip().lower()
@@ -147,16 +225,33 @@ def get_user_confirmation():
 
 def main():
     start = timer()
+    os.makedirs(plot_dir, exist_ok=True)
     plumeria_output_list = [p_file for p_file in os.listdir(output_dir) if p_file.endswith('.txt')]
-    
-    # warning if the number of plots exceeds 10
-    if len(plumeria_output_list) > 10:
-        print(f"Warning: You are about to generate {len(plumeria_output_list)} plots. This may take a significant amount of time.")
+
+    to_render, manifest = plumeria_output_list, {}
+    manifest_path = os.path.join(plot_dir, 'plot_manifest.csv')
+    if incremental:
+        manifest = load_plot_manifest(manifest_path)
+        to_render, current = plots_to_render(plumeria_output_list, manifest, plot_style())
+        print(f"{len(plumeria_output_list) - len(to_render)} plots up to date, {len(to_render)} to render")
+        # keep only the runs still in output_dir, with their current size and mtime
+        stale = set(to_render)
+        manifest = {run: current[run] for run in plumeria_output_list if run in manifest and run not in stale}
+
+    # warning if the number of plots exceeds confirm_above, only asked from a terminal so batch jobs never block
+    if confirm_above is not None and len(to_render) > confirm_above and sys.stdin.isatty():
+        print(f"Warning: You are about to generate {len(to_render)} plots. This may take a significant amount of time.")
         get_user_confirmation()
-    
-    Parallel(n_jobs=n_cores)(delayed(make_plots)(plumeria_output) for plumeria_output in plumeria_output_list)
+
+    with Parallel(n_jobs=n_cores) as parallel:
+        for i in range(0, len(to_render), manifest_every):
+            batch = to_render[i:i + manifest_every]
+            succeeded = parallel(delayed(make_plots)(plumeria_output) for plumeria_output in batch)
+            if incremental:
+                manifest.update({run: current[run] for run, ok in zip(batch, succeeded) if ok})
+                save_plot_manifest(manifest_path, manifest)
     end = timer()
-    print(f'Time taken: {end - start} seconds')
+    print(f'Time taken: {end - start} seconds, {len(to_render) / (end - start):.1f} plots/s')
     print('Done')
 
 if __name__ == '__main__':
@@ -3,15 +3,22 @@
 
 # Author       : Edgar Carrillo
 # Created      : 2023-09-19
-# Last Modified: 2024-06-22
+# Last Modified: 2026-10-17
 # Affiliation  : Vanderbilt University
 
 """
 This script plots the Plumeria results, focusing on 3x3 grid of mass flux vs. external water content vs. maximum plume height. 
 Each panel in the geid will display mer vs external water vs max plume height at a constant initial velocity and initial magma temperature value. 
 Ensure your data is filtered to display target parameters with other variables held constant for accurate interpretation.
+
+With render='raster' (or 'auto' above density_raster.raster_above runs) each panel is drawn as a pixel grid of the
+per-pixel mean, min or max height (reduce), or of the runs per pixel (reduce='count'), see density_raster.py.
+With n_workers != 1 the data of the nine panels is drawn on worker processes and composited into the figure,
+see panel_render.py.
 """
 
+import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -19,11 +26,13 @@ import seaborn as sns
 import matplotlib.colors as mcolors
 #import colormaps as cmaps 
 
-def plot_plumeria_results(csv_path, save_plots='no'):
-    # Load and filter the data
-    df = pd.read_csv(csv_path)
-    #df = df.loc[(df['initial velocity (m/s)'] == 100) & (df['magma temperature (c)'] == 900)]
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from result_cube import ResultCube
+from plume_dataset import PlumeDataset
+from density_raster import use_raster, aggregate, draw_raster, count_norm
+from panel_render import scatter_layer, render_panels, composite
 
+def plot_plumeria_results(csv_path, save_plots='no', cube_path=None, render='auto', reduce='mean', n_workers=1):
     # Define variables
     x = 'mass flux total (kg/s)'
     mer = 'mass flux (kg/s)'
@@ -34,14 +43,29 @@ def plot_plumeria_results(csv_path, save_plots='no'):
     vel_list = [75, 100, 125]   # Initial velocity masks
     mag_temp = [700, 900, 1100] # Initial magma temperature masks
 
-    # Create conditions and sub-dataframes
-    conditions = [
-        (df['initial velocity (m/s)'] == vel) & (df['magma temperature (c)'] == temp)
-        for vel in vel_list
-        for temp in mag_temp
-    ]
+    # Load and filter the data, only the plotted columns and conditions are read (see plume_dataset.py),
+    # with a result cube (see result_cube.py) the panels are index lookups instead of masks
+    cube = ResultCube.load(cube_path) if cube_path else None
+    if cube is None:
+        df = PlumeDataset(csv_path).read(['initial velocity (m/s)', 'magma temperature (c)', y, mer, z],
+                                         u=vel_list, T=mag_temp)
 
-    data_frames = [df[condition] for condition in conditions]
+    # Create conditions and sub-dataframes
+    if cube is not None:
+        # only the nine plotted (u, T) slices and columns of the cube are converted to frames
+        data_frames = [cube.sel(u=vel, T=temp).to_frame(variables=[mer, z])
+                       if vel in cube.coords['initial velocity (m/s)'] and temp in cube.coords['magma temperature (c)']
+                       else pd.DataFrame(columns=[y, mer, z], dtype=float)
+                       for vel in vel_list
+                       for temp in mag_temp]
+        df = pd.concat(data_frames, ignore_index=True)
+    else:
+        conditions = [
+            (df['initial velocity (m/s)'] == vel) & (df['magma temperature (c)'] == temp)
+            for vel in vel_list
+            for temp in mag_temp
+        ]
+        data_frames = [df[condition] for condition in conditions]
 
     ## define the colorpalette for the plots
     #theme = cmaps.lajolla
@@ -71,6 +95,18 @@ def plot_plumeria_results(csv_path, save_plots='no'):
     # Set the third variable and normalization for hue
     third_variable = 'calculated heigth (km)'
     norm = mcolors.Normalize(vmin=df[z].min(), vmax=df[z].max())
+    cbar_label = r'$z$ [km]'
+    xlim = [1e3, 2e12]
+
+    # raster panels share one pixel grid over the x limits and the w range of all panels
+    raster_mode = use_raster(len(df), render)
+    if raster_mode:
+        y_range = (df[y].min(), df[y].max()) if not df.empty else None
+        rasters = [aggregate(df_sub[mer], df_sub[y], df_sub[third_variable], reduce, x_range=xlim, y_range=y_range)
+                   if not df_sub.empty else None for df_sub in data_frames]
+        if reduce == 'count':
+            norm = count_norm([raster for raster in rasters if raster is not None])
+            cbar_label = 'runs per pixel'
 
     # create 3x3 subplots
     num_rows = 3
@@ -78,13 +114,27 @@ def plot_plumeria_results(csv_path, save_plots='no'):
     fig, axs = plt.subplots(num_rows, num_cols, figsize=(15, 10), sharey=True, sharex=True, 
                             gridspec_kw={'width_ratios': [0.8, 0.8, 0.8], 'wspace': 0.001, 'hspace': 0.001})
 
+    parallel = n_workers != 1
+    tasks = []
     for i, df_sub in enumerate(data_frames):
         row = i // num_cols
         col = i % num_cols
         ax = axs[row, col]
 
         # Ensure hue variable exists and is assigned correctly
-        if not df_sub.empty:
+        if parallel:
+            # the data layer is drawn by a worker once the layout is set, see below
+            if df_sub.empty:
+                tasks.append(None)
+            elif raster_mode:
+                tasks.append((draw_raster, (rasters[i], theme, norm)))
+            else:
+                tasks.append((scatter_layer, (df_sub[mer].to_numpy(), df_sub[y].to_numpy(),
+                                              df_sub[third_variable].to_numpy(), theme, norm)))
+        elif raster_mode:
+            if rasters[i] is not None:
+                draw_raster(ax, rasters[i], theme, norm)
+        elif not df_sub.empty:
             sns.scatterplot(data=df_sub, y=y, x=mer, palette=theme, hue=third_variable, hue_norm=norm, s=5, ax=ax)
             ax.get_legend().remove()
         else:
@@ -92,7 +142,7 @@ def plot_plumeria_results(csv_path, save_plots='no'):
 
         ax.set(xlabel=None, ylabel=None, xscale='log')
         ax.minorticks_on()
-        ax.set_xlim([1e3, 2e12])
+        ax.set_xlim(xlim)
 
         ax.annotate(r'$\bf({})$'.format(chr(97 + i)), xy=(0.02, 0.92), xycoords='axes fraction', color='black', fontsize=12)
 
@@ -105,7 +155,7 @@ def plot_plumeria_results(csv_path, save_plots='no'):
 
     # Create colorbar
     cbar_ax = fig.add_axes([0.92, 0.15, 0.02, 0.7])
-    cbar = plt.colorbar(plt.cm.ScalarMappable(cmap=theme, norm=norm), cax=cbar_ax, label=r'$z$ [km]')
+    cbar = plt.colorbar(plt.cm.ScalarMappable(cmap=theme, norm=norm), cax=cbar_ax, label=cbar_label)
     cbar.ax.yaxis.set_ticks_position('right')
 
     # Adjust the layout
@@ -113,6 +163,20 @@ def plot_plumeria_results(csv_path, save_plots='no'):
     fig.supylabel('Mass fraction of external water, ' + r'$w$')
     fig.subplots_adjust(bottom=0.08, left=0.08, right=0.9, top=0.9)
 
+    if parallel:
+        # shared y limits, the pixel edges of the rasters or the data range with the default 5% margins
+        if raster_mode:
+            y_edges = next((raster.y_edges for raster in rasters if raster is not None), [0, 1])
+            ylim = (y_edges[0], y_edges[-1])
+        else:
+            margin = 0.05 * (df[y].max() - df[y].min())
+            ylim = (df[y].min() - margin, df[y].max() + margin)
+        dpi = 300 if save_plots == 'yes' else fig.dpi
+        images = render_panels(tasks, fig, axs.flat, xlim, ylim, dpi, n_workers)
+        for ax, image in zip(axs.flat, images):
+            if image is not None:
+                composite(ax, image, xlim, ylim)
+
     # Save or show plot
     if save_plots == 'yes':
         plt.savefig('mass_flux_gradient_sample.png', dpi=300, bbox_inches="tight")
@@ -121,4 +185,7 @@ def plot_plumeria_results(csv_path, save_plots='no'):
 
 if __name__ == "__main__":
     csv_path = 'plumeria_data/plume_values_main_u_w_t_d_var_11072023_nan_adj_.csv'  # Set the file path for the data
-    plot_plumeria_results(csv_path, save_plots='no')
+    cube_path = None  # e.g. 'plumeria_data/plume_values_main_u_w_t_d_var_11072023_nan_adj_cube.npz', written by the extractors
+    render = 'auto'   # 'scatter', 'raster' or 'auto' (raster for large datasets), see density_raster.py
+    n_workers = 1     # processes drawing the panels, None for every core, see panel_render.py
+    plot_plumeria_results(csv_path, save_plots='no', cube_path=cube_path, render=render, n_workers=n_workers)
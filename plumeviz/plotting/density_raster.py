@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Raster rendering of the coloured mass flux vs w scatter plots (batch_plot_GRID.py, batch_plume_plots.py).
+
+A scatter plot draws one marker per run, which takes minutes and writes huge vector files with millions
+of runs. aggregate() bins the runs into a (log x, y) pixel grid with NumPy and reduces the coloured
+variable (height, delta z) per pixel: 'mean', 'min', 'max' or 'count' (runs per pixel). draw_raster() draws
+the grid with pcolormesh, rasterized, with the colour map and norm of the scatter plot, so the time no
+longer depends on the number of runs.
+
+Usage:
+    raster = aggregate(df['mass flux (kg/s)'], df['mass fraction water added'], df['calculated heigth (km)'])
+    draw_raster(ax, raster, 'viridis_r', norm)
+"""
+
+import numpy as np
+import matplotlib.colors as mcolors
+from collections import namedtuple
+
+Raster = namedtuple('Raster', ['values', 'x_edges', 'y_edges'])
+
+REDUCTIONS = ('mean', 'min', 'max', 'count')
+raster_bins = (400, 250)      # pixels along x and y
+raster_above = 100_000        # render='auto' draws a raster above this number of runs
+
+
+def use_raster(n_rows, render='auto'):
+    """ True if a plot of n_rows runs is drawn as a raster, render is 'scatter', 'raster' or 'auto'. """
+    if render not in ('auto', 'scatter', 'raster'):
+        raise ValueError(f"Unknown render mode '{render}', expected 'auto', 'scatter' or 'raster'")
+    return render == 'raster' or (render == 'auto' and n_rows > raster_above)
+
+
+def pixel_index(x, y, bins=raster_bins, x_range=None, y_range=None, log_x=True):
+    """
+    Pixel of every run on a (log x, y) grid.
+
+    Args:
+        x, y (array-like): Coordinates of the runs, x is binned in log10 if log_x.
+        bins (tuple): Number of pixels along x and y.
+        x_range, y_range (tuple, optional): Extent of the grid, defaults to the range of the data.
+
+    Returns:
+        tuple: (index, x_edges, y_edges), index is the flat pixel y * nx + x of every run, -1 for runs
+        outside of the grid or with invalid coordinates.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if log_x:
+        valid &= x > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.log10(x)
+        x_range = np.log10(x_range) if x_range is not None else None
+
+    nx, ny = bins
+    edges, indices = [], []
+    for coord, n, value_range in [(x, nx, x_range), (y, ny, y_range)]:
+        if value_range is not None:
+            lo, hi = value_range
+        else:
+            lo, hi = (coord[valid].min(), coord[valid].max()) if valid.any() else (0., 1.)
+        if hi <= lo:
+            lo, hi = lo - 0.5, hi + 0.5
+        edges.append(np.linspace(lo, hi, n + 1))
+        index = np.zeros(len(coord), dtype=np.int64)
+        index[valid] = np.floor((coord[valid] - lo) / (hi - lo) * n)
+        index[valid & (coord == hi)] = n - 1          # the upper edge belongs to the last pixel
+        valid &= (index >= 0) & (index < n)
+        indices.append(index)
+    xi, yi = indices
+
+    x_edges = 10**edges[0] if log_x else edges[0]
+    return np.where(valid, yi * nx + xi, -1), x_edges, edges[1]
+
+
+def aggregate(x, y, values=None, reduce='mean', bins=raster_bins, x_range=None, y_range=None, log_x=True):
+    """
+    Bin runs into a pixel grid and reduce values per pixel.
+
+    Args:
+        x, y (array-like): Coordinates of the runs, see pixel_index() for the grid arguments.
+        values (array-like, optional): Coloured variable, not needed for reduce='count'.
+        reduce (str): 'mean', 'min', 'max' or 'count'.
+
+    Returns:
+        Raster: values (ny, nx), NaN in empty pixels, and the pixel edges along x and y.
+    """
+    if reduce not in REDUCTIONS:
+        raise ValueError(f"Unknown reduction '{reduce}', expected one of {REDUCTIONS}")
+    index, x_edges, y_edges = pixel_index(x, y, bins, x_range, y_range, log_x)
+    keep = index >= 0
+    if reduce != 'count':
+        values = np.asarray(values, dtype=float)
+        keep &= np.isfinite(values)
+        values = values[keep]
+    flat = index[keep]
+
+    nx, ny = bins
+    count = np.bincount(flat, minlength=nx * ny).astype(float)
+    if reduce == 'count':
+        grid = count
+    elif reduce == 'mean':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grid = np.bincount(flat, weights=values, minlength=nx * ny) / count
+    else:
+        ufunc = np.minimum if reduce == 'min' else np.maximum
+        grid = np.full(nx * ny, np.inf if reduce == 'min' else -np.inf)
+        ufunc.at(grid, flat, values)
+    grid[count == 0] = np.nan
+    return Raster(grid.reshape(ny, nx), x_edges, y_edges)
+
+
+def draw_raster(ax, raster, cmap, norm):
+    """ Draw a Raster on ax with pcolormesh, empty pixels are left blank. Returns the QuadMesh. """
+    return ax.pcolormesh(raster.x_edges, raster.y_edges, np.ma.masked_invalid(raster.values),
+                         cmap=cmap, norm=norm, shading='flat', rasterized=True)
+
+
+def count_norm(rasters):
+    """ Log colour norm of the runs per pixel, shared by every raster of a figure (reduce='count'). """
+    counts = [np.nanmax(raster.values) for raster in rasters if np.isfinite(raster.values).any()]
+    return mcolors.LogNorm(vmin=1, vmax=max(counts + [1]))
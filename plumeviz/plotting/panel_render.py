@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Rendering of figure panels and whole figures on worker processes (joblib).
+
+Panels: render_panels() draws the data layer of every panel (scatter points or raster) in its own worker,
+on a transparent Agg canvas of the size of the panel at the output dpi, with the axes limits and scale of
+the final figure. composite() places the returned images in the axes of the figure built by the main
+process, which keeps the axes, ticks, annotations and colorbar as vectors. The columns of each panel are
+passed as NumPy arrays, which joblib memory-maps to the workers instead of copying them.
+
+Figures: save_in_workers() builds and saves independent figures (e.g. the three of batch_plume_plots.py)
+in parallel, one file per figure. They are not combined into a multi-page PDF: matplotlib cannot add
+pages drawn by another process.
+
+Usage:
+    tasks = [(scatter_layer, (x, y, hue, 'viridis_r', norm)), ...]
+    images = render_panels(tasks, fig, axs.flat, xlim, ylim, dpi=300, n_workers=9)
+    for ax, image in zip(axs.flat, images):
+        composite(ax, image, xlim, ylim)
+"""
+
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from joblib import Parallel, delayed
+
+
+def scatter_layer(ax, x, y, hue, palette, norm, s=5):
+    """ Coloured scatter points of a panel, the sns.scatterplot call of the plotting scripts without a legend. """
+    sns.scatterplot(x=x, y=y, hue=hue, palette=palette, hue_norm=norm, s=s, ax=ax, legend=False)
+
+
+def panel_size(fig, ax, dpi):
+    """ Size in pixels of an axes of fig saved at dpi. """
+    bbox = ax.get_position()
+    width, height = fig.get_size_inches()
+    return max(1, round(bbox.width * width * dpi)), max(1, round(bbox.height * height * dpi))
+
+
+def render_panel(draw, args, xlim, ylim, size, dpi, xscale='log'):
+    """
+    Draw one panel layer on a transparent canvas.
+
+    Args:
+        draw (callable): draw(ax, *args), a module level function so that it can be sent to a worker.
+        xlim, ylim (tuple): Axes limits of the panel in the final figure.
+        size (tuple): Width and height in pixels.
+
+    Returns:
+        ndarray: RGBA image (height, width, 4), uint8.
+    """
+    fig = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    fig.patch.set_alpha(0)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.set_xscale(xscale)
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    draw(ax, *args)
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def render_panels(tasks, fig, axes, xlim, ylim, dpi, n_workers=None, xscale='log'):
+    """
+    Render the layer of every panel in parallel.
+
+    Args:
+        tasks (list): (draw, args) per axes, None for an empty panel.
+        fig, axes: Final figure and its panel axes, the panels are rendered at their size.
+
+    Returns:
+        list: RGBA image per axes, None for the empty panels.
+    """
+    jobs = [(i, task) for i, task in enumerate(tasks) if task is not None]
+    sizes = [panel_size(fig, ax, dpi) for ax in axes]
+    images = Parallel(n_jobs=n_workers or os.cpu_count())(
+        delayed(render_panel)(draw, args, xlim, ylim, sizes[i], dpi, xscale) for i, (draw, args) in jobs)
+    result = [None] * len(tasks)
+    for (i, _), image in zip(jobs, images):
+        result[i] = image
+    return result
+
+
+def composite(ax, image, xlim, ylim):
+    """ Place a rendered panel layer over the whole axes, below the ticks and spines. """
+    ax.imshow(image, extent=(0, 1, 0, 1), transform=ax.transAxes, aspect='auto', interpolation='none')
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+
+
+def _build_and_save(build, args, path, rc_params):
+    plt.rcParams.update(rc_params)
+    fig = build(*args)
+    fig.savefig(path, bbox_inches="tight")
+    plt.close(fig)
+    return path
+
+
+def save_in_workers(jobs, rc_params=None, n_workers=None):
+    """
+    Build and save figures in parallel, jobs are (build, args, path) with build(*args) returning a figure.
+
+    The rcParams of the calling script are not set in the workers, pass them as rc_params.
+    """
+    return Parallel(n_jobs=n_workers or os.cpu_count())(
+        delayed(_build_and_save)(build, args, path, rc_params or {}) for build, args, path in jobs)
@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+"""
+Multi-resolution tile pyramid of a sweep, and a local viewer to explore it.
+
+build_pyramid() bins the runs of every (u, T) condition into a (log mass flux, w) grid of
+tile_size * 2**max_level pixels per side (density_raster.pixel_index), then halves the grid level by
+level down to a single tile. Counts, sums, minima and maxima of 2x2 pixels are combined, so every level
+is the exact mean, min or max of its runs (reduce; 'count' is not offered since the runs per pixel
+change with the level). The coloured tiles are written once:
+    pyramid_dir/meta.json                           ranges, levels, colour norm and conditions
+    pyramid_dir/colorbar.png
+    pyramid_dir/<condition>/<level>/<tx>_<ty>.png   tile_size x tile_size, ty = 0 at the top, empty tiles are skipped
+    pyramid_dir/<condition>/runs.npz                grid coordinates and hover columns of the runs
+
+serve() starts a local HTTP viewer: drag to pan, wheel to zoom, the browser only loads the visible tiles of
+the level that matches the zoom. Hovering the map looks up the nearest run of the condition (scipy cKDTree)
+and shows its hover columns.
+
+Build and serve from the command line:
+    python tile_pyramid.py build plumeria_data/plume_values.csv pyramid_TEST [--value 'delta z (km)'] [--reduce max]
+    python tile_pyramid.py serve pyramid_TEST [--port 8000]
+"""
+
+import os
+import shutil
+import sys
+import json
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from timeit import default_timer as timer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeria_wrappers'))
+from plume_dataset import PlumeDataset
+from density_raster import pixel_index
+
+try:
+    from scipy.spatial import cKDTree  # only needed for the hover lookup of the viewer
+except ImportError:
+    cKDTree = None
+
+x = 'mass flux (kg/s)'
+y = 'mass fraction water added'
+z = 'calculated heigth (km)'
+conditions = ['initial velocity (m/s)', 'magma temperature (c)']
+hover_columns = ['run', 'vent diameter (m)', 'mass flux (kg/s)', 'mass fraction water added',
+                 'calculated heigth (km)', 'delta z (km)']
+
+tile_size = 256
+max_level = 3       # finest level, 2**max_level tiles per side
+theme = 'viridis_r'
+
+
+def _finest_grids(index, values, n, reduce):
+    """ Count and reduction state (sum, min or max) of every pixel of the finest level, as (n, n) arrays. """
+    count = np.bincount(index, minlength=n * n).reshape(n, n)
+    if reduce == 'mean':
+        state = np.bincount(index, weights=values, minlength=n * n)
+    else:
+        state = np.full(n * n, np.inf if reduce == 'min' else -np.inf)
+        (np.minimum if reduce == 'min' else np.maximum).at(state, index, values)
+    return count, state.reshape(n, n)
+
+
+def _halve(count, state, reduce):
+    """ Combine 2x2 pixels, the next coarser level. """
+    n = count.shape[0] // 2
+    count = count.reshape(n, 2, n, 2).sum(axis=(1, 3))
+    blocks = state.reshape(n, 2, n, 2)
+    state = {'mean': blocks.sum, 'min': blocks.min, 'max': blocks.max}[reduce](axis=(1, 3))
+    return count, state
+
+
+def _write_tiles(count, state, reduce, level, directory, cmap, norm):
+    """ Colour one level and write its non-empty tiles, returns the number of tiles written. """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = state / count if reduce == 'mean' else state
+    values = np.ma.masked_where(count == 0, values)[::-1]   # row 0 of an image is the top, highest w
+    os.makedirs(os.path.join(directory, str(level)), exist_ok=True)
+    n_written = 0
+    for ty in range(2**level):
+        for tx in range(2**level):
+            block = values[ty * tile_size:(ty + 1) * tile_size, tx * tile_size:(tx + 1) * tile_size]
+            if block.mask.all():
+                continue
+            plt.imsave(os.path.join(directory, str(level), f"{tx}_{ty}.png"), cmap(norm(block)))
+            n_written += 1
+    return n_written
+
+
+def _clear_pyramid(pyramid_dir):
+    """ Remove the condition directories of a previous build, conditions that are gone included. """
+    meta_path = os.path.join(pyramid_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return
+    with open(meta_path) as meta_file:
+        old_conditions = json.load(meta_file).get('conditions', [])
+    for condition in old_conditions:
+        name = os.path.basename(str(condition.get('name', '')))
+        if name:
+            shutil.rmtree(os.path.join(pyramid_dir, name), ignore_errors=True)
+    os.remove(meta_path)
+
+
+def build_pyramid(path, pyramid_dir, value=z, reduce='mean', cmap=theme, vmin=None, vmax=None):
+    """
+    Build the tile pyramid of a result file (any format of plume_dataset.PlumeDataset).
+
+    Args:
+        path (str): Results, one pyramid per (u, T) condition.
+        pyramid_dir (str): Output directory.
+        value (str): Coloured column.
+        reduce (str): 'mean', 'min' or 'max' of value per pixel.
+        vmin, vmax (float, optional): Colour norm, defaults to the range of value.
+    """
+    if reduce not in ('mean', 'min', 'max'):
+        raise ValueError(f"Unknown reduction '{reduce}', expected 'mean', 'min' or 'max'")
+    start = timer()
+    dataset = PlumeDataset(path)
+    extra = [c for c in hover_columns if c in dataset.columns and c not in conditions + [x, y, value]]
+    df = dataset.read(conditions + [x, y, value] + extra)
+    df = df[np.isfinite(df[value]) & (df[x] > 0)]
+
+    # every condition shares the grid and the colour norm, switching condition keeps the view
+    x_range = (float(df[x].min()), float(df[x].max()))
+    y_range = (float(df[y].min()), float(df[y].max()))
+    norm = mcolors.Normalize(vmin=df[value].min() if vmin is None else vmin,
+                             vmax=df[value].max() if vmax is None else vmax)
+    colormap = plt.get_cmap(cmap)
+    n = tile_size * 2**max_level
+
+    meta = {'x': x, 'y': y, 'value': value, 'reduce': reduce, 'cmap': cmap, 'vmin': float(norm.vmin),
+            'vmax': float(norm.vmax), 'x_range': x_range, 'y_range': y_range, 'tile_size': tile_size,
+            'max_level': max_level, 'hover_columns': [x, y, value] + extra, 'conditions': []}
+    _clear_pyramid(pyramid_dir)
+    n_tiles = 0
+    for (u, T), df_sub in df.groupby(conditions, sort=True):
+        name = f"u{u:g}_T{T:g}"
+        directory = os.path.join(pyramid_dir, name)
+        shutil.rmtree(directory, ignore_errors=True)   # empty tiles are not written, old ones must not remain
+        index, _, _ = pixel_index(df_sub[x], df_sub[y], (n, n), x_range, y_range)
+        keep = index >= 0
+        count, state = _finest_grids(index[keep], df_sub[value].to_numpy(float)[keep], n, reduce)
+        for level in range(max_level, -1, -1):
+            n_tiles += _write_tiles(count, state, reduce, level, directory, colormap, norm)
+            if level:
+                count, state = _halve(count, state, reduce)
+
+        # grid coordinates (0-1 along log x and y) of the runs for the hover lookup
+        grid_x = (np.log10(df_sub[x].to_numpy(float)) - np.log10(x_range[0])) / np.log10(x_range[1] / x_range[0])
+        grid_y = (df_sub[y].to_numpy(float) - y_range[0]) / ((y_range[1] - y_range[0]) or 1.)
+        np.savez(os.path.join(directory, 'runs.npz'), grid_x=grid_x, grid_y=grid_y,
+                 **{f"column_{i}": np.asarray(df_sub[c]).astype(str if c == 'run' else float)
+                    for i, c in enumerate(meta['hover_columns'])})
+        meta['conditions'].append({'name': name, 'u': float(u), 'T': float(T), 'runs': int(len(df_sub))})
+
+    plt.imsave(os.path.join(pyramid_dir, 'colorbar.png'), colormap(np.linspace(0, 1, 256))[None, :].repeat(12, 0))
+    with open(os.path.join(pyramid_dir, 'meta.json'), 'w') as meta_file:
+        json.dump(meta, meta_file, indent=1)
+    print(f"{len(df)} runs, {len(meta['conditions'])} conditions, {n_tiles} tiles written to {pyramid_dir} "
+          f"in {timer() - start:.1f} s")
+    return meta
+
+
+class _Lookup:
+    """ Nearest run of a condition, the cKDTree of each condition is built at its first lookup. """
+
+    def __init__(self, pyramid_dir, meta):
+        if cKDTree is None:
+            raise ImportError("scipy is needed for the hover lookup of the viewer")
+        self.pyramid_dir = pyramid_dir
+        self.meta = meta
+        self._conditions = {condition['name'] for condition in meta['conditions']}
+        self._runs = {}
+
+    def nearest(self, condition, grid_x, grid_y, radius):
+        if condition not in self._conditions:
+            raise KeyError(f"Unknown condition {condition!r}")   # only names of meta.json reach the file system
+        if condition not in self._runs:
+            runs = np.load(os.path.join(self.pyramid_dir, condition, 'runs.npz'))
+            columns = [runs[f"column_{i}"] for i in range(len(self.meta['hover_columns']))]
+            self._runs[condition] = (cKDTree(np.column_stack([runs['grid_x'], runs['grid_y']])), columns)
+        tree, columns = self._runs[condition]
+        distance, i = tree.query([grid_x, grid_y], distance_upper_bound=radius)
+        if not np.isfinite(distance):
+            return {}
+        return {name: column[i].item() for name, column in zip(self.meta['hover_columns'], columns)}
+
+
+def serve(pyramid_dir, port=8000):
+    """ Serve the viewer of a pyramid on http://localhost:port until interrupted. """
+    root = os.path.abspath(pyramid_dir)
+    with open(os.path.join(root, 'meta.json')) as meta_file:
+        meta = json.load(meta_file)
+    lookup = _Lookup(root, meta)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, body, content_type, status=200):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/':
+                return self._send(VIEWER_HTML.encode(), 'text/html; charset=utf-8')
+            if url.path == '/lookup':
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                try:
+                    run = lookup.nearest(query['condition'], float(query['x']), float(query['y']), float(query['radius']))
+                except (KeyError, ValueError, OSError):
+                    return self._send(b'{}', 'application/json', 400)
+                return self._send(json.dumps(run).encode(), 'application/json')
+
+            # static files, only .png and .json inside the pyramid
+            path = os.path.abspath(os.path.join(root, url.path.lstrip('/')))
+            if not path.startswith(root + os.sep) or not path.endswith(('.png', '.json')) or not os.path.isfile(path):
+                return self._send(b'', 'text/plain', 404)
+            with open(path, 'rb') as static_file:
+                body = static_file.read()
+            self._send(body, 'image/png' if path.endswith('.png') else 'application/json')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    print(f"Serving {pyramid_dir} on http://localhost:{port}, Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>PlumeViz sweep viewer</title>
+<style>
+body { font-family: serif; margin: 12px; }
+#map { border: 1px solid black; cursor: grab; }
+#side { display: inline-block; vertical-align: top; margin-left: 12px; font-size: 14px; }
+td { padding: 1px 6px; }
+</style></head>
+<body>
+<div><select id="condition"></select> <span id="cursor"></span></div>
+<canvas id="map" width="900" height="650"></canvas>
+<div id="side">
+  <div id="value"></div><img id="colorbar" src="colorbar.png" width="256" height="12"><div id="range"></div>
+  <h4>Nearest run</h4><table id="run"></table>
+</div>
+<script>
+const canvas = document.getElementById('map'), ctx = canvas.getContext('2d');
+let meta, condition, tiles = {}, view = {x: 0, y: 0, scale: 650}, pending = false;
+
+fetch('meta.json').then(r => r.json()).then(m => {
+  meta = m;
+  const select = document.getElementById('condition');
+  for (const c of meta.conditions) select.add(new Option(`u = ${c.u} m/s, T = ${c.T} °C (${c.runs} runs)`, c.name));
+  select.onchange = () => { condition = select.value; draw(); };
+  condition = select.value;
+  document.getElementById('value').textContent = `${meta.value} (${meta.reduce})`;
+  document.getElementById('range').textContent = `${meta.vmin.toPrecision(3)} — ${meta.vmax.toPrecision(3)}`;
+  draw();
+});
+
+function tile(level, tx, ty) {
+  const key = `${condition}/${level}/${tx}_${ty}`;
+  if (!(key in tiles)) {
+    const image = new Image();
+    image.onload = draw;
+    image.onerror = () => { image.failed = true; };
+    image.src = `${key}.png`;
+    tiles[key] = image;
+  }
+  return tiles[key];
+}
+
+function draw() {
+  if (!meta) return;
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  const level = Math.max(0, Math.min(meta.max_level, Math.ceil(Math.log2(view.scale / meta.tile_size))));
+  const n = 2 ** level, size = view.scale / n;
+  ctx.imageSmoothingEnabled = false;
+  for (let ty = Math.max(0, Math.floor(view.y * n)); ty < Math.min(n, Math.ceil((view.y + canvas.height / view.scale) * n)); ty++)
+    for (let tx = Math.max(0, Math.floor(view.x * n)); tx < Math.min(n, Math.ceil((view.x + canvas.width / view.scale) * n)); tx++) {
+      const image = tile(level, tx, ty);
+      if (image.complete && !image.failed && image.naturalWidth)
+        ctx.drawImage(image, (tx / n - view.x) * view.scale, (ty / n - view.y) * view.scale, size + 0.5, size + 0.5);
+    }
+  ctx.strokeRect(-view.x * view.scale, -view.y * view.scale, view.scale, view.scale);
+}
+
+function grid(event) {   // grid coordinates (0-1, y up) of the mouse
+  const rect = canvas.getBoundingClientRect();
+  return [view.x + (event.clientX - rect.left) / view.scale, 1 - (view.y + (event.clientY - rect.top) / view.scale)];
+}
+
+let drag = null;
+canvas.onmousedown = e => { drag = [e.clientX, e.clientY]; canvas.style.cursor = 'grabbing'; };
+window.onmouseup = () => { drag = null; canvas.style.cursor = 'grab'; };
+canvas.onmousemove = e => {
+  if (drag) {
+    view.x -= (e.clientX - drag[0]) / view.scale; view.y -= (e.clientY - drag[1]) / view.scale;
+    drag = [e.clientX, e.clientY]; draw(); return;
+  }
+  const [gx, gy] = grid(e), [x0, x1] = meta.x_range, [y0, y1] = meta.y_range;
+  document.getElementById('cursor').textContent =
+    `${meta.x} = ${(x0 * (x1 / x0) ** gx).toExponential(2)}, ${meta.y} = ${(y0 + gy * (y1 - y0)).toFixed(3)}`;
+  if (pending) return;
+  pending = true;
+  fetch(`lookup?condition=${condition}&x=${gx}&y=${gy}&radius=${8 / view.scale}`).then(r => r.json()).then(run => {
+    pending = false;
+    document.getElementById('run').innerHTML =
+      Object.entries(run).map(([k, v]) => `<tr><td>${k}</td><td>${typeof v === 'number' ? v.toPrecision(4) : v}</td></tr>`).join('');
+  }).catch(() => { pending = false; });
+};
+canvas.onwheel = e => {
+  e.preventDefault();
+  const rect = canvas.getBoundingClientRect(), mx = e.clientX - rect.left, my = e.clientY - rect.top;
+  const factor = e.deltaY < 0 ? 1.25 : 0.8;
+  view.x += mx / view.scale * (1 - 1 / factor); view.y += my / view.scale * (1 - 1 / factor);
+  view.scale *= factor; draw();
+};
+</script></body></html>
+"""
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = {}
+    for option in ['--value', '--reduce', '--port']:
+        if option in sys.argv:
+            options[option] = sys.argv[sys.argv.index(option) + 1]
+            args.remove(options[option])
+    if len(args) == 3 and args[0] == 'build':
+        build_pyramid(args[1], args[2], value=options.get('--value', z), reduce=options.get('--reduce', 'mean'))
+    elif len(args) == 2 and args[0] == 'serve':
+        serve(args[1], port=int(options.get('--port', 8000)))
+    else:
+        raise SystemExit("usage: python tile_pyramid.py build results.csv pyramid_dir [--value column] [--reduce mean]\n"
+                         "       python tile_pyramid.py serve pyramid_dir [--port 8000]")
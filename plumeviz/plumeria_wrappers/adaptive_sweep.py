@@ -0,0 +1,144 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Adaptive boundary search for collapse transitions.
+
+Instead of a dense vent diameter x water fraction grid, the sweep starts from a coarse grid and
+refines by quadtree subdivision only the cells where the calculated plume height jumps by more
+than jump_km between corners (or where some corners failed and others did not). Those are the
+cells that contain the collapse boundary picked up by ri_borders() in ri_module, so the boundary
+is resolved at the finest level with a small fraction of the Plumeria calls of a dense grid.
+
+Cells are laid out in (log2 vent diameter, w). At fixed velocity and temperature the mass flux
+is proportional to rho_mix * d^2, so for each w log mass flux is a linear function of log2 d and
+the quadtree in (log2 d, w) is a sheared quadtree in (log mass flux, w) that uses the inputs
+Plumeria actually takes.
+'''
+
+import os
+import numpy as np
+import pandas as pd
+from batch_executor import iter_batch
+from result_cache import file_hash, run_key, output_path, is_cached
+from plumeria_parser import read_calculated_height
+
+
+def plumeria_evaluator(render_inp_file, plumeria_loc, dir_loc, out_loc, magma_temp, vent_vel, humid, gas_frac,
+                       backend='thread', n_workers=None, timeout=0.5):
+    """
+    Build an evaluate(points) function that runs PLUMERIA on a batch of (vent diameter, w) points.
+
+    Runs are named by their result cache key (see result_cache.py), so points already computed by an
+    earlier sweep, adaptive or not, are read back from out_loc instead of being executed again.
+
+    Args:
+        render_inp_file (callable): Input deck renderer, see batch_plumeria_input_bulk_MAIN.render_inp_file.
+
+    Returns:
+        callable: evaluate(points) -> array of calculated heights (km), NaN for failed runs.
+    """
+    os.makedirs(dir_loc, exist_ok=True)
+    os.makedirs(out_loc, exist_ok=True)
+    binary_hash = file_hash(plumeria_loc)
+
+    def evaluate(points):
+        names, jobs = [], []
+        for vent_diam, water_wt in points:
+            deck = render_inp_file('adaptive', magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc)
+            name = run_key(deck, binary_hash)
+            names.append(name)
+            if not is_cached(out_loc, name):
+                input_path = f"{dir_loc}/Grid_Runs_in_{name}.txt"
+                with open(input_path, 'w') as file:
+                    file.write(render_inp_file(name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc))
+                jobs.append((name, input_path))
+
+        for _ in iter_batch(jobs, plumeria_loc, backend, n_workers, timeout=timeout):
+            pass
+        return np.array([read_calculated_height(output_path(out_loc, name)) for name in names])
+
+    return evaluate
+
+
+def _is_sharp(corner_heights, jump_km):
+    """A cell is refined if its corner heights differ by more than jump_km or only some corners failed."""
+    finite = corner_heights[np.isfinite(corner_heights)]
+    if len(finite) == 0:
+        return False
+    if len(finite) < len(corner_heights):
+        return True
+    return finite.max() - finite.min() > jump_km
+
+
+def adaptive_sweep(evaluate, vent_diameter_range, water_range, coarse_shape=(16, 6), max_depth=4, jump_km=2.0):
+    """
+    Locate the plume height jumps in (vent diameter, w) by recursive quadtree refinement.
+
+    Args:
+        evaluate (callable): evaluate(points) -> heights, points is a list of (vent diameter, w).
+        vent_diameter_range (tuple): (min, max) vent diameter in m, sampled in log2.
+        water_range (tuple): (min, max) mass fraction of added water.
+        coarse_shape (tuple): Number of coarse grid nodes along log2 d and w.
+        max_depth (int): Number of refinement levels, the finest spacing is the coarse spacing / 2**max_depth.
+        jump_km (float): Height difference between corners that triggers refinement.
+
+    Returns:
+        tuple: (runs, boundary) DataFrames, every evaluated point with its height and refinement level,
+        and the centres of the finest cells that still contain a jump.
+    """
+    nx, ny = coarse_shape
+    scale = 2**max_depth
+    x_lo, x_hi = np.log2(vent_diameter_range[0]), np.log2(vent_diameter_range[1])
+    w_lo, w_hi = water_range
+
+    # nodes are integer (i, j) positions on the finest lattice so that shared corners are only run once
+    def to_params(i, j):
+        vent_diam = round(float(2**(x_lo + (x_hi - x_lo) * i / ((nx - 1) * scale))), 4)
+        water_wt = round(w_lo + (w_hi - w_lo) * j / ((ny - 1) * scale), 4)
+        return vent_diam, water_wt
+
+    heights = {}
+    levels = {}
+
+    def run_nodes(nodes, level):
+        nodes = [node for node in dict.fromkeys(nodes) if node not in heights]
+        if nodes:
+            for node, height in zip(nodes, evaluate([to_params(*node) for node in nodes])):
+                heights[node] = height
+                levels[node] = level
+
+    cells = [(i * scale, j * scale, scale) for i in range(nx - 1) for j in range(ny - 1)]
+    run_nodes([(i * scale, j * scale) for i in range(nx) for j in range(ny)], 0)
+
+    def corners(cell):
+        i, j, size = cell
+        return [(i, j), (i + size, j), (i, j + size), (i + size, j + size)]
+
+    def sharp_cells(cells):
+        return [c for c in cells if _is_sharp(np.array([heights[node] for node in corners(c)]), jump_km)]
+
+    flagged = sharp_cells(cells)
+    for level in range(1, max_depth + 1):
+        if not flagged:
+            break
+        cells = []
+        for i, j, size in flagged:
+            half = size // 2
+            cells += [(i, j, half), (i + half, j, half), (i, j + half, half), (i + half, j + half, half)]
+        run_nodes([node for cell in cells for node in corners(cell)], level)
+        flagged = sharp_cells(cells)
+        print(f"level {level}: {len(cells)} cells, {len(flagged)} with a jump, {len(heights)} runs in total")
+
+    runs = pd.DataFrame(
+        [(*to_params(*node), height, levels[node]) for node, height in heights.items()],
+        columns=['vent diameter (m)', 'mass fraction water added', 'calculated heigth (km)', 'level'])
+    boundary = pd.DataFrame(
+        [to_params(i + size / 2, j + size / 2) for i, j, size in flagged],
+        columns=['vent diameter (m)', 'mass fraction water added'])
+    return runs.sort_values(['mass fraction water added', 'vent diameter (m)']).reset_index(drop=True), boundary
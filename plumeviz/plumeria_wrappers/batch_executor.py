@@ -0,0 +1,146 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Pluggable executors for batch Plumeria runs.
+
+Runs can be dispatched serially, on a thread pool, on a process pool or launched directly with
+posix_spawn from a single event loop ('spawn', see process_launcher.py). Submissions are bounded
+(max_in_flight) so that a sweep of a million runs keeps a flat memory footprint, and every run
+returns a RunResult (exit code, wall time, timed-out flag) instead of only printing errors.
+
+Usage:
+    jobs = [('run1', 'inp_TEST/Grid_Runs_in_run1.txt'), ...]
+    results = run_batch(jobs, plumeria_loc, backend='thread', n_workers=8)
+'''
+
+import os
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from timeit import default_timer as timer
+
+## cpu_time is the CPU time of the Plumeria process, only measured by the 'spawn' backend
+RunResult = namedtuple('RunResult', ['name', 'returncode', 'wall_time', 'timed_out', 'error', 'cpu_time'],
+                       defaults=[None])
+
+## executor backends, 'serial' runs in the calling process and 'spawn' launches the runs without an
+## executor (process_launcher.py). Any callable taking max_workers and returning a concurrent.futures
+## style executor can be added with register_backend()
+BACKENDS = {
+    'serial': None,
+    'spawn': None,
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def register_backend(name, executor_factory):
+    """Register an executor factory, executor_factory(max_workers=n) must return an object with submit() and shutdown()."""
+    BACKENDS[name] = executor_factory
+
+
+def run_single(name, plumeria_loc, input_path, timeout=0.5):
+    """
+    Run PLUMERIA on a single input file.
+
+    Returns:
+        RunResult: exit code (None if the run did not finish), wall time in seconds, timeout flag and error message.
+    """
+    start = timer()
+    returncode, timed_out, error = None, False, None
+    try:
+        returncode = subprocess.run([plumeria_loc, input_path], timeout=timeout).returncode
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        error = f"Execution of '{name}' timed out."
+    except Exception as e:
+        error = f"Error executing '{name}': {e}"
+    return RunResult(name, returncode, timer() - start, timed_out, error)
+
+
+def iter_batch(jobs, plumeria_loc, backend='thread', n_workers=None, max_in_flight=None, timeout=0.5):
+    """
+    Run a batch of PLUMERIA jobs and yield a RunResult as each run finishes.
+
+    Args:
+        jobs (iterable): (name, input_path) pairs, may be a generator.
+        plumeria_loc (str): Path to the Plumeria executable.
+        backend (str): Name of a registered backend ('serial', 'thread', 'process', 'spawn').
+        n_workers (int, optional): Number of workers (running children for 'spawn'). Defaults to os.cpu_count().
+        max_in_flight (int, optional): Maximum number of submitted but unfinished runs. Defaults to 2 * n_workers,
+            unused by 'spawn' which reads a job only when a child slot is free.
+        timeout (float): Timeout per run in seconds.
+
+    Yields:
+        RunResult: Results in completion order.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {sorted(BACKENDS)}")
+
+    if backend == 'spawn':
+        from process_launcher import iter_spawn  # imported here, it uses RunResult from this module
+        yield from iter_spawn(jobs, plumeria_loc, n_workers, timeout)
+        return
+
+    if BACKENDS[backend] is None:
+        for name, input_path in jobs:
+            yield run_single(name, plumeria_loc, input_path, timeout)
+        return
+
+    n_workers = n_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * n_workers
+
+    executor = BACKENDS[backend](max_workers=n_workers)
+    in_flight = set()
+    try:
+        for name, input_path in jobs:
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            in_flight.add(executor.submit(run_single, name, plumeria_loc, input_path, timeout))
+
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def run_batch(jobs, plumeria_loc, backend='thread', n_workers=None, max_in_flight=None, timeout=0.5, verbose=True):
+    """
+    Run a batch of PLUMERIA jobs, see iter_batch() for the arguments.
+
+    Returns:
+        list: RunResult for every run, in completion order.
+    """
+    results = []
+    for result in iter_batch(jobs, plumeria_loc, backend, n_workers, max_in_flight, timeout):
+        if verbose and result.error:
+            print(result.error)
+        results.append(result)
+    return results
+
+
+def summarize(results):
+    """Print a short summary of a batch and return the names of runs that did not finish cleanly."""
+    failed = [r.name for r in results if r.returncode != 0]
+    timed_out = sum(r.timed_out for r in results)
+    wall = sum(r.wall_time for r in results)
+    print(f"{len(results)} runs, {len(failed)} failed ({timed_out} timed out), total run time {wall:.1f} s")
+    measured = [r for r in results if r.cpu_time is not None and not r.timed_out]
+    if measured:
+        # wall - (user + sys): I/O waits and scheduling as well as spawn, exec and reaping
+        off_cpu = sum(r.wall_time - r.cpu_time for r in measured)
+        print(f"time not on CPU {off_cpu / len(measured) * 1e3:.2f} ms per run, "
+              f"{off_cpu / max(sum(r.wall_time for r in measured), 1e-12):.0%} of the run time")
+    return failed
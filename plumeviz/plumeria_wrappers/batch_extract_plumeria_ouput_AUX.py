@@ -3,103 +3,48 @@
 
 # Author       : Edgar Carrillo
 # Created      : 2023-07-01
-# Last Modified: 2024-09-08
+# Last Modified: 2026-10-17
 # Affilation   : Fisk University, Vanderbilt University
 
 import pandas as pd
 import numpy as np
-import re
 import os
+from plumeria_parser import parse_file, summary_row, read_row, read_row_and_profile
+from profile_store import ProfileStoreWriter
+from result_cube import save_cube
+from result_store import ResultStoreWriter
+from derived_quantities import (dry_density, vent_equivalent, mer_eq, mass_flux, delta_z, richardson,
+                                reduced_gravity, reference_join)
 
 
 output_dir  = 'out_u_w_t_d_var_11_07_2023_nan_adj' ## ran on 3/27/24 
 output_file_path   = 'plumeria_data/plume_values_main_u_w_t_d_var_11072023_nan_adj.csv'  # dir where data is stored- 3/27/24
+profile_store_dir  = os.path.splitext(output_file_path)[0] + '_profiles'  # full dz profiles of every run, see profile_store.py
+cube_path          = os.path.splitext(output_file_path)[0] + '_cube.npz'   # N-d cube over the sweep parameters, see result_cube.py
+store_dir          = os.path.splitext(output_file_path)[0] + '.plume'      # binary result store, see result_store.py
 
 ### use for atmospheric profile runs
 def read_if_sounding(run):
-    # read plumeria output file, read in 3 sections to simplify data extraction
-    values_list = []
-    with open(os.path.join(output_dir,run), "r") as output_file:
-        lines = output_file.readlines()[5:15]
-        end_lines = output_file.readlines()[-4:-1]
-        dz_0_line = output_file.readlines()[24]
-    
-    for line in lines:
-        values = float(line.rstrip().split(':')[1])
-        values_list.append(values)
-    
-    for line in end_lines:
-        s = re.sub("km", "", line.rstrip())
-        values = float(s.split('=')[1])
-        values_list.append(values)
-    
-    def get_data(line):
-        vals = list(line.strip().split())
-        return [float(i) for i in vals]
-    
-    dz_0 = get_data(dz_0_line)
-    values_list.extend(dz_0)
-    
-    return values_list   
+    # read plumeria output file once, header values, heights and first dz row
+    return summary_row(parse_file(os.path.join(output_dir, run), sounding=True, profile=False))
   
 
-def read(run, expected_length):
+def read(run, expected_length, profile_writer=None):
     """
     Read and parse specific data from a file, filling missing or unreadable data with NaN.
 
     Args:
         run (str): The filename to read from.
         expected_length (int): The expected number of data points to extract.
+        profile_writer (ProfileStoreWriter, optional): If given, the full dz profile of the run is added to it.
     
     Returns:
         list: A list of extracted values, with NaN for any missing or unreadable data.
     """
-    file_path = os.path.join(output_dir, run)
-    values_list = [np.nan] * expected_length
-
-    try:
-        with open(file_path, "r") as output_file:
-            lines = output_file.readlines()
-
-        # Extract lines for the top part of the file
-        main_lines = lines[7:20]
-        # Extract lines for the bottom part of the file
-        end_lines = lines[-4:-1]
-        # Extract the dz_0_line if it exists
-        if len(lines) > 24:
-            dz_0_line = lines[24]
-        else:
-            dz_0_line = "0"
-
-        # Process main lines
-        for i, line in enumerate(main_lines):
-            try:
-                values_list[i] = float(line.split(':')[1].strip())
-            except ValueError:
-                print(f"Error converting string to float in main_lines: '{line.strip()}'")
-                continue  # If there's a parsing error, leave the corresponding NaN in place
-
-        # Adjust start index for end lines to continue the list
-        start_index = len(main_lines)
-        for i, line in enumerate(end_lines):
-            try:
-                values_list[start_index + i] = float(re.sub("km", "", line).strip().split('=')[1])
-            except ValueError:
-                print(f"Error converting string to float in end_lines: '{line.strip()}'")
-                continue  # Leave NaN in place
-
-        # Process dz_0 line to extract multiple float values
-        try:
-            dz_values = [float(value) for value in dz_0_line.strip().split()]
-            values_list[start_index + len(end_lines):start_index + len(end_lines) + len(dz_values)] = dz_values
-        except ValueError:
-            print(f"Error converting string to float in dz_0_line: '{dz_0_line.strip()}'")
-
-    except FileNotFoundError:
-        print(f"File not found: {file_path}")
-    except Exception as e:
-        print(f"An error occurred while reading or parsing the file {run}: {e}")
-
+    if profile_writer is None:
+        return read_row(os.path.join(output_dir, run), expected_length)
+    values_list, dz = read_row_and_profile(os.path.join(output_dir, run), expected_length)
+    profile_writer.add(run, dz)
     return values_list
 
 
@@ -120,9 +65,9 @@ def data_list(data, expected_length):
 
 expected_length = 33
 # create the list of all extracted data, writes 0 if file has incomplete data
-def data_list(data):
+def data_list(data, profile_writer=None):
     try: 
-        data_to_append = read(data, expected_length)
+        data_to_append = read(data, expected_length, profile_writer)
         if data_to_append is None or len(data_to_append) != expected_length:
             raise ValueError("Invalid data encountered.")
     except:
@@ -133,7 +78,9 @@ def data_list(data):
     return data_to_append
 
 
-ls = [data_list(l) for l in plumeria_output_list]
+# the profiles are written in the same order as the rows of the csv
+with ProfileStoreWriter(profile_store_dir) as profile_writer:
+    ls = [data_list(l, profile_writer) for l in plumeria_output_list]
 
 '''create dataframe of values with labels'''
 def mer_grid(vent_list):
@@ -173,79 +120,38 @@ humid   = 'Relative humidity, %'           ## relative humidity in the atmospher
 vent_eq = 'vent equivalent init (m)'
 
 
-rho_0  = 1.292      # ambient air density at the vent, kg/m^3
-g      = 9.81       # earth gravity constant, m/s^2
-T_0    = 273.15     # reference temperature, 
-beta   = 1/T_0      # thermal expansin coefficient of air at STP
-
-
-condition = df[ext_w] == 0 # mask to find the dry eruption mixture density
-
-# Find the index of the first occurrence that satisfies the condition
-first_index = condition.idxmax()
-
-# Use the index to select the corresponding value from column_A
-rho_dry = float(df.loc[first_index, rho_mix])
+## the constants (rho_0, g, T_0, beta) and formulas are in derived_quantities.py,
+## each column is computed in one vectorized call
 
-def vent_init(vent, rho_mix, w):
-    return round(vent *np.sqrt((rho_mix*(1-w))/rho_dry), 1) ## add rounding function?
+# dry eruption mixture density, from the first run without external water
+rho_dry = dry_density(df[ext_w], df[rho_mix])
 
-def mer_eq(r,vel):                ## wont work since i currently cant get exact mer values due plumeria rounding issue
-    return np.pi*r**2*5.62*vel
-
-
-df[vent_eq] = df.apply(lambda a: vent_init( a[vent], a[rho_mix], a[ext_w]),  axis=1)      
-df['mer eq']        = df.apply(lambda a: mer_eq(a[vent_eq], a[vel]), axis=1) 
+df[vent_eq]  = vent_equivalent(df[vent], df[rho_mix], df[ext_w], rho_dry)
+df['mer eq'] = mer_eq(df[vent_eq], df[vel])   ## wont work since i currently cant get exact mer values due plumeria rounding issue
 
 
 df['run'] = plumeria_output_list                                   # append file name to each row
 
 
-df['mass flux (kg/s)'] = df.apply(lambda a: a[m_cal]*(1-a[ext_w]), axis=1)      # M_0 = (1-w)M_calculated
-
-
+df['mass flux (kg/s)'] = mass_flux(df[m_cal], df[ext_w])      # M_0 = (1-w)M_calculated
 
-df_vent   = df[vent_eq].drop_duplicates(keep = 'first')     # get vent values, no duplicates included
-vent_init_list = [float(value) for value in df_vent.astype(str).sort_values(ascending=True)]
 
 
-
-## use vent list from vent_init_list, for the vent equivalent values and not the ven adjusted values 
+## the dry plume height of a run is the height of the run with the same velocity, temperature and
+## vent equivalent diameter and no external water, attached with one grouped pass and hash join
 temp_list = [700, 900, 1100]  # magma temperatures in Celsius
 velocity_list = [75, 100, 125]  # initial velocities in m/s
+dry_keys = [vel, 'magma temperature (c)', vent_eq]
 
-# Convert vent_init_list to a set for faster membership testing
-vent_set = set(vent_init_list)
-
-#filter the DataFrame only once for the mass flux condition, since it's constant across all iterations
-df_filtered = df[df['mass flux (kg/s)'] < 1.5e10]
-
-# iterate over the unique combiinations of temperature and velocity in the filtered df
-for temp, velocity in df_filtered[['magma temperature (c)', 'initial velocity (m/s)']].drop_duplicates().itertuples(index=False):
-    if temp in temp_list and velocity in velocity_list:
-        # Further filter df_filtered for the current temperature and velocity
-        df_temp_vel = df_filtered[(df_filtered['magma temperature (c)'] == temp) & 
-                                  (df_filtered['initial velocity (m/s)'] == velocity)]
-        # Process only the rows with diameters sin vent_init_list
-        for diameter in df_temp_vel['vent equivalent init (m)'].unique():
-            if diameter in vent_set:
-                # Get dry plume heights for the current diameter with no external water
-                df_dry_z = df_temp_vel[(df_temp_vel['vent equivalent init (m)'] == diameter) & 
-                                       (df_temp_vel[ext_w] == 0)]
-                if not df_dry_z.empty:
-                    dry_z = df_dry_z.iloc[0]['calculated heigth (km)']
-                    # Update the 'dry plume height (km)' in the original df for the current conditions
-                    df.loc[(df['initial velocity (m/s)'] == velocity) & 
-                           (df['magma temperature (c)'] == temp) & 
-                           (df['vent equivalent init (m)'] == diameter), 
-                           'dry plume height (km)'] = dry_z
+# reference (dry) runs: no external water, mass flux below 1.5e10 kg/s, temperature and velocity in the lists
+dry_runs = ((df[ext_w] == 0) & (df['mass flux (kg/s)'] < 1.5e10) &
+            df['magma temperature (c)'].isin(temp_list) & df[vel].isin(velocity_list))
 
+df[z_dry] = reference_join(df, dry_keys, plume_z, dry_runs)
 
-def delta_z(height, dry_height):
-    return height - dry_height
 
-
-df['delta z (km)' ]     = df.apply(lambda a: delta_z(a[plume_z],a[z_dry]), axis=1)     # diffrence in wet plume height relative to dry plume height
+df['delta z (km)' ]     = delta_z(df[plume_z], df[z_dry])     # diffrence in wet plume height relative to dry plume height
+df[delta_s]             = delta_z(df[plume_z], reference_join(df, dry_keys, sparks, dry_runs))  # relative to the dry sparks height
 
 
 for u in [75,100, 125]:
@@ -274,33 +180,21 @@ for u in [75,100, 125]:
 
 
 
-def richardson(rho_mix, vent, vel):
-    rho    = rho_mix 
-    v_d    = vent      # vent diamter, m
-    u_0    = vel       # vent exit velocity, m/s
-    red_g = (g*(rho-rho_0))/rho_0
-    return (red_g * v_d) / (u_0**2)
-
-
-def richardson_temp(vent, vel, Temp):
-    return (g*beta*vent*(T-T_0)) / vel**2
-
-def reduced_gravity(rho_mix):
-    return (9.81 *rho_mix - rho_0)/rho_0
-
-
 deltaz_min = df[del_z].min()
 deltaz_max = df[del_z].max()
 
 
-df['Ri']            = df.apply(lambda a: richardson(a[rho_mix],a[vent_eq],a[vel]), axis=1)
-df['Thermal Ri']    = df.apply(lambda a: richardson(a[vent_eq],a[vel],a[Temp]), axis=1) 
-df['g prime']       = df.apply(lambda a: reduced_gravity(a[rho_mix]), axis=1) 
+df['Ri']            = richardson(df[rho_mix], df[vent_eq], df[vel])
+df['Thermal Ri']    = richardson(df[vent_eq], df[vel], df[Temp])   # same arguments as the published data, not richardson_temp()
+df['g prime']       = reduced_gravity(df[rho_mix])
 
 ###################
 ### output      ###
 ###################
 df.to_csv(output_file_path, index=False)
+save_cube(df, cube_path)
+with ResultStoreWriter(store_dir) as store_writer:
+    store_writer.append(df)
 print(f"Done! CSV file saved at {output_file_path}")
 
 
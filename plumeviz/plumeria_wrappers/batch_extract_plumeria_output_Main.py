@@ -3,46 +3,38 @@
 
 # Author       : Edgar Carrillo
 # Created      : 2023-01-19
-# Last Modified: 2024-06-18
+# Last Modified: 2026-10-17
 # Affiliation  : Fisk University, Vanderbilt University
 
 import numpy as np
 import pandas as pd
 import os
-import re
-
-# Set the output directory and CSV path
+from plumeria_parser import read_row
+from profile_store import ProfileStoreWriter
+from derived_quantities import adjust_vent, dry_density, mass_flux
+from result_cube import save_cube as save_result_cube, update_cube
+from result_store import ResultStoreWriter, convert_csv
+from parallel_extract import extract_rows, load_manifest, save_manifest, scan_changes
+from run_archive import RunArchive, is_archive
+
+# Set the output directory (or an archive of it, see run_archive.py) and CSV path
 output_dir = 'out_u_w_t_d_varied_11_07_2023_t1100max_u125max'
 csv_path = 'plumeria_data/plume_values_main_u_w_t_d_var_11072023_nan.csv'
+save_profiles = True  # also keep the full dz profile of every run, see profile_store.py
+profile_store_dir = os.path.splitext(csv_path)[0] + '_profiles'
+extract_mode = 'incremental'  # 'full' rebuilds the CSV, 'incremental' only parses new or changed output files
+n_workers = os.cpu_count()    # parsing processes, 1 parses in this process
+manifest_path = os.path.splitext(csv_path)[0] + '_manifest.csv'  # size and mtime of every extracted file
+save_cube = True  # also save the results as an N-d cube over the sweep parameters, see result_cube.py
+cube_path = os.path.splitext(csv_path)[0] + '_cube.npz'
+save_store = True  # also save the results in the binary result store format (csv_path with .plume), see result_store.py
 
 def read(run, expected_length):
     """
     Reads and parses specific data from a Plumeria output file.
     Fills missing or unreadable data with NaN.
     """
-    values_list = [np.nan] * expected_length
-    
-    try:
-        with open(os.path.join(output_dir, run), "r") as output_file:
-            lines = output_file.readlines()[7:20]
-            output_file.seek(0)
-            end_lines = output_file.readlines()[-4:-1]
-            
-            for i, line in enumerate(lines):
-                try:
-                    values_list[i] = float(line.split(':')[1].strip())
-                except ValueError:
-                    continue
-
-            for i, line in enumerate(end_lines, start=len(lines)):
-                try:
-                    values_list[i] = float(re.sub("km", "", line).split('=')[1].strip())
-                except ValueError:
-                    continue
-    except Exception as e:
-        print(f"Error reading or parsing file {run}: {e}")
-    
-    return values_list
+    return read_row(os.path.join(output_dir, run), expected_length)
 
 def read_sounding(run, path, expected_length):
     """
@@ -53,28 +45,7 @@ def read_sounding(run, path, expected_length):
     :param expected_length: The expected number of data points to extract.
     :return: A list of extracted values.
     """
-    values_list = [np.nan] * expected_length
-    
-    try:
-        with open(os.path.join(path, f"{run}.txt"), "r") as output_file:
-            lines = output_file.readlines()[5:15]
-            for i, line in enumerate(lines):
-                try:
-                    values_list[i] = float(line.split(':')[1].strip())
-                except ValueError:
-                    continue
-
-            end_lines = output_file.readlines()[-4:-1]
-            for i, line in enumerate(end_lines, start=len(lines)):
-                try:
-                    s = re.sub("km", "", line)
-                    values_list[i] = float(s.split('=')[1].strip())
-                except ValueError:
-                    continue
-    except Exception as e:
-        print(f"Error reading or parsing file {run}: {e}")
-
-    return values_list
+    return read_row(os.path.join(path, f"{run}.txt"), expected_length, sounding=True)
 
 def data_list(data, expected_length, read_func):
     try:
@@ -110,32 +81,83 @@ def mer_grid(ls):
     df = pd.DataFrame(data_list)
     return df
 
-def adjust_vent(vent, rho_wet, w, rho_dry):
+def extract(plumeria_output_list, expected_length, append_profiles=False):
     """
-    Adjusts the vent diameter based on mixture density.
+    Parses the output files in parallel chunks (see parallel_extract.py) into a DataFrame with a 'run' column.
     """
-    return np.sqrt(rho_dry / (rho_wet * (1 - w))) * vent
+    if is_archive(output_dir):
+        ls, dzs = RunArchive(output_dir).extract_rows(plumeria_output_list, expected_length, n_workers, profiles=save_profiles)
+    else:
+        paths = [os.path.join(output_dir, run) for run in plumeria_output_list]
+        ls, dzs = extract_rows(paths, expected_length, n_workers, profiles=save_profiles)
+    if save_profiles:
+        with ProfileStoreWriter(profile_store_dir, append=append_profiles) as profile_writer:
+            for run, dz in zip(plumeria_output_list, dzs):
+                profile_writer.add(os.path.basename(run), dz)
 
-if __name__ == "__main__":
-    expected_length = 16
-    plumeria_output_list = [p_file for p_file in os.listdir(output_dir) if p_file.endswith('.txt')]
-    ls = [data_list(l, expected_length, read) for l in plumeria_output_list]
-    
     df = mer_grid(ls)
+    df['run'] = [os.path.basename(run) for run in plumeria_output_list]  # file name, without the shard directory
+    return df
+
+def main():
+    expected_length = 16
 
     x = 'mass flux total (kg/s)'
     y = 'mass fraction water added'
     rho_mix = 'mixture density (kg/m3)'
     vent = 'vent diameter (m)'
 
+    # the incremental mode needs the 'run' column, CSVs written before it existed are rebuilt once
+    incremental = (extract_mode == 'incremental' and os.path.exists(csv_path)
+                   and 'run' in pd.read_csv(csv_path, nrows=0).columns)
+    manifest = load_manifest(manifest_path) if incremental else {}
+    new, changed, current = scan_changes(output_dir, manifest)
+    plumeria_output_list = new + changed
+    print(f'{len(new)} new and {len(changed)} changed output files, {len(current) - len(plumeria_output_list)} unchanged')
+    if not plumeria_output_list:
+        # a no-op is not an error for cron or batch jobs, nothing else is rewritten
+        print('Nothing to extract, ' + csv_path + ' is up to date')
+        return
+
+    df = extract(plumeria_output_list, expected_length, append_profiles=incremental)
     df = df.loc[df[vent].notna()]
 
-    condition = df[y] == 0
-    first_index = condition.idxmax()
-    rho_dry = float(df.loc[first_index, rho_mix])
-
-    df['vent adjusted (m)'] = df.apply(lambda a: adjust_vent(a[vent], a[rho_mix], a[y], rho_dry), axis=1)
-    df['mass flux (kg/s)'] = df.apply(lambda a: a[x] * (1 - a[y]), axis=1)
-
-    df.to_csv(csv_path, index=False)
+    # rho_dry comes from the first dry run, rows already in the CSV come first
+    dry = df[[y, rho_mix]]
+    if incremental:
+        dry = pd.concat([pd.read_csv(csv_path, usecols=[vent, y, rho_mix]).dropna(subset=[vent])[[y, rho_mix]], dry],
+                        ignore_index=True)
+    rho_dry = dry_density(dry[y], dry[rho_mix])
+
+    df['vent adjusted (m)'] = adjust_vent(df[vent], df[rho_mix], df[y], rho_dry)
+    df['mass flux (kg/s)'] = mass_flux(df[x], df[y])
+
+    if not incremental:
+        df.to_csv(csv_path, index=False)
+    elif changed:
+        existing = pd.read_csv(csv_path)
+        existing = existing.loc[~existing['run'].isin([os.path.basename(run) for run in changed])]
+        pd.concat([existing, df[existing.columns]], ignore_index=True).to_csv(csv_path, index=False)
+    else:
+        # only new runs, append without reading the existing rows
+        df[pd.read_csv(csv_path, nrows=0).columns].to_csv(csv_path, mode='a', header=False, index=False)
+
+    manifest.update(current)
+    save_manifest(manifest_path, manifest)
+
+    # incremental runs only add the extracted rows to the cube and the store, see update_cube() and ResultStoreWriter
+    if save_cube and incremental:
+        update_cube(df, cube_path)
+    elif save_cube:
+        save_result_cube(df, cube_path)
+    if save_store:
+        store_dir = os.path.splitext(csv_path)[0] + '.plume'
+        if incremental and not changed and os.path.exists(os.path.join(store_dir, 'meta.json')):
+            with ResultStoreWriter(store_dir, append=True) as store_writer:
+                store_writer.append(df[[column['name'] for column in store_writer.columns]])
+        else:
+            convert_csv(csv_path, store_dir)
     print('Done, successful extraction! ' + csv_path)
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,17 @@
 
 # Author       : Edgar Carrillo
 # Created      : 2023-10-31
-# Last Modified: 2023-03-28
+# Last Modified: 2026-10-17
 # Affiliation: Vanderbilt University
 
 import numpy as np
 import pandas as pd
 import os
-import subprocess
 import random
 import math
 import itertools
+from batch_executor import run_single
+from sweep_journal import SweepJournal, run_with_journal
 
 
 plumeria_loc = '/Users/carrile/documents/masters_work/plume_fort_v2.3.1/plumeria'  ## location where your version of PLUMERIA is stored
@@ -25,6 +26,14 @@ csv_path   = 'plumeria_data/plume_values_main_u_w_t_d_var_11072023_nan.csv'  # d
 gas_frac = .03
 humid    = 0  
 
+## executor settings, see batch_executor.py. Keep 'thread', 'spawn' or 'serial' here: this script has no
+## __main__ guard, so a 'process' backend would re-run the sweep when the workers import it
+executor_backend = 'thread'
+n_workers        = os.cpu_count()
+
+## run states are kept in this journal, re-running the script only executes the unfinished runs
+journal_path     = os.path.join(dir_loc, 'sweep_journal.sqlite')  # next to the inputs, like the Main script
+
 os.makedirs(dir_loc, exist_ok=True)
 os.makedirs(out_loc, exist_ok=True)
 
@@ -73,28 +82,28 @@ def make_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_
 
 
 def single_run(file_name):
-    try:
-        # remove leading and trailing whitespace from the file name
-        file_name = file_name.strip()
-        subprocess.run([plumeria_loc, f"{dir_loc}/Grid_Runs_in_{file_name}.txt"], timeout=.5)
-    except subprocess.TimeoutExpired:
-        print(f"Execution of '{file_name}' timed out.")
-    except Exception as e:
-        print(f"Error executing '{file_name}': {e}")
-
-
-def multiple_runs(file_list):
-    skipped_files = []
-    for output_file in file_list:
-        try:
-            single_run(output_file)
-        except:
-            skipped_files.append(output_file)
+    # remove leading and trailing whitespace from the file name
+    file_name = file_name.strip()
+    result = run_single(file_name, plumeria_loc, f"{dir_loc}/Grid_Runs_in_{file_name}.txt", timeout=.5)
+    if result.error:
+        print(result.error)
+    return result
+
+
+def multiple_runs(file_list, params_list=None):
+    params_list = params_list or [{}] * len(file_list)
+    with SweepJournal(journal_path) as journal:
+        journal.add_runs(((name.strip(), params, f"{dir_loc}/Grid_Runs_in_{name.strip()}.txt",
+                           f"{out_loc}/Grid_Runs_out_{name.strip()}.txt", .5)
+                          for name, params in zip(file_list, params_list)), retire_missing=True)
+        run_with_journal(journal, plumeria_loc, backend=executor_backend, n_workers=n_workers)
+        skipped_files = [name for name, *_ in journal.runs('failed') + journal.runs('timeout')]
     
     if skipped_files:
         print("Skipped files:")
         for skipped_file in skipped_files:
             print(skipped_file)
+    return skipped_files
 
 
 
@@ -129,13 +138,15 @@ for config in parameter_combinations:
     # os.makedirs(out_loc, exist_ok=True)
     
     input_name_list = []
+    run_params      = []
     for water_wt, vent_diam in tuple_list: 
         run_count = run_count + 1
         output_name = "run" + str(run_count)
         make_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc)
         input_name_list.append(output_name)
+        run_params.append({'vent_diam': vent_diam, 'water_wt': water_wt, 'magma_temp': magma_temp, 'vent_vel': vent_vel})
 
     # execute plumeria runs for this configuration
-    multiple_runs(input_name_list)
+    multiple_runs(input_name_list, run_params)
 
 print('All configurations completed!')
\ No newline at end of file
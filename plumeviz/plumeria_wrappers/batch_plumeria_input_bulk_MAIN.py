@@ -3,7 +3,7 @@
 
 # Author       : Edgar Carrillo
 # Created      : 2023-10-23
-# Last Modified: 2024-06-21
+# Last Modified: 2026-10-17
 # Affiliation  : Vanderbilt University
 
 
@@ -20,18 +20,28 @@ and relative humidity, but note that the more varying parameters allowed the hig
 '''
 
 
+import os
+import shutil
 import numpy as np
-import subprocess
+import pandas as pd
 import itertools
 from input_parameters import *
-
-def make_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc):
+from batch_executor import RunResult, run_single, iter_batch, summarize
+from result_cache import file_hash, run_key, is_cached, is_complete_output, completed_runs
+from run_paths import input_path, output_path, make_shards, scratch_dir
+from sweep_journal import SweepJournal, run_with_journal
+from adaptive_sweep import adaptive_sweep, plumeria_evaluator
+from streaming_pipeline import StreamingExtractor
+from plume_engine import ENGINE_VERSION, iter_engine
+
+def render_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc, shard_levels=0):
+    """ Return the text of the PLUMERIA input deck for a single run, shard_levels places the output in a hashed subdirectory of out_loc. """
     lines = [
         "#  Input file for the Fortran version of Plumeria.",                                         
         "#  Lines that begin with a '#' are comment lines.",                                          
         "",                                                                                           
         "#  Output file name",
-        f"{out_loc}/Grid_Runs_out_{output_name}.txt",
+        output_path(out_loc, output_name, shard_levels),
         "",
         "#  Information on whether to read met. input file.",
         "#  The first line should supply a yes or no. If that line is yes, the next line",
@@ -62,9 +72,12 @@ def make_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_
         "1000.                #magma specific heat, J/kg K",
         "2500.                #magma density (DRE), kg/m3"
     ]
+    return "\n".join(lines)
+
 
-    with open(f"{dir_loc}/Grid_Runs_in_{output_name}.txt", "w") as file:
-        file.write("\n".join(lines))
+def make_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc, dir_loc=dir_loc, shard_levels=0):
+    with open(input_path(dir_loc, output_name, shard_levels), "w") as file:
+        file.write(render_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc, shard_levels))
 
 
 def create_input_parameters_combinations():
@@ -74,27 +87,162 @@ def create_input_parameters_combinations():
 
 def run_plumeria(input_file):
     """ Run PLUMERIA with the specified input file. """
-    try:
-        subprocess.run([plumeria_loc, f"{dir_loc}/Grid_Runs_in_{input_file}.txt"], timeout=0.5)
-    except Exception as e:
-        print(f"Error running {input_file}: {str(e)}")
-        #skipped_files.append(input_file)
-
-def main():
-    input_name_list = []
-    #skipped_files   = []
-    combinations = create_input_parameters_combinations()
+    result = run_single(input_file, plumeria_loc, f"{dir_loc}/Grid_Runs_in_{input_file}.txt", timeout=run_timeout)
+    if result.error:
+        print(f"Error running {input_file}: {result.error}")
+    return result
+
+def generate_inputs(combinations, dir_loc=dir_loc, out_loc=out_loc, completed=(), on_cached=None, keys=None):
+    """
+    Write the input file of every combination (executable engine), yields (run name, parameters) for each run to execute.
+
+    With the result cache on, runs are named by their content hash and runs already extracted (completed) or
+    with a complete output in out_loc are skipped. on_cached, if given, is called with the name of every run
+    skipped for its output only (e.g. to stream outputs a crashed sweep left before they reached the CSV),
+    keys collects the name of every run of the grid.
+    """
+    binary_hash = None
+    if use_result_cache:
+        binary_hash = ENGINE_VERSION if engine == 'python' else file_hash(plumeria_loc)
+    n_cached = n_new = 0
 
     for index, (vent_diam, water_wt, magma_temp, vent_vel, humid) in enumerate(combinations, start=1):
         output_name = f"run{index}"
-        make_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc)
-        input_name_list.append(output_name)
-
-    # run PLUMERIA with the generated input files
-    for input_file in input_name_list:
-        run_plumeria(input_file)
+        if use_result_cache:
+            output_name = run_key(render_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc), binary_hash)
+            if keys is not None:
+                keys.add(output_name)
+            if output_name in completed:
+                n_cached += 1
+                continue
+            if is_cached(out_loc, output_name, shard_levels):
+                n_cached += 1
+                if on_cached is not None:
+                    on_cached(output_name)
+                continue
+        elif keys is not None:
+            keys.add(output_name)
+        if engine != 'python':   # the in-process engine takes the parameters, it never reads an input file
+            make_inp_file(output_name, magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, out_loc, dir_loc, shard_levels)
+        n_new += 1
+        yield output_name, {'vent_diam': float(vent_diam), 'water_wt': float(water_wt), 'magma_temp': float(magma_temp),
+                            'vent_vel': float(vent_vel), 'humid': float(humid), 'gas_frac': float(gas_frac)}
+
+    if use_result_cache:
+        print(f"{n_cached} runs found in the result store, {n_new} new runs to execute")
+
+def adaptive_main():
+    """ Adaptive vent diameter x w sweep for every magma temperature, velocity and humidity combination. """
+    frames = []
+    for magma_temp, vent_vel, humid in itertools.product(magma_temp_list, vent_vel_list, humid_list):
+        evaluate = plumeria_evaluator(render_inp_file, plumeria_loc, dir_loc, out_loc, magma_temp, vent_vel, humid, gas_frac,
+                                      backend=executor_backend, n_workers=n_workers, timeout=run_timeout)
+        runs, boundary = adaptive_sweep(evaluate, (min_vent_diameter, max_vent_diameter),
+                                        (min(mass_frac_add_water_list), max(mass_frac_add_water_list)),
+                                        adaptive_coarse_shape, adaptive_max_depth, adaptive_jump_km)
+        print(f"T = {magma_temp}, u = {vent_vel}, humidity = {humid}: {len(runs)} runs, {len(boundary)} boundary cells")
+        runs['magma temperature (c)'] = magma_temp
+        runs['initial velocity (m/s)'] = vent_vel
+        runs['Relative humidity, %'] = humid
+        frames.append(runs)
+
+    df = pd.concat(frames, ignore_index=True)
+    os.makedirs(os.path.dirname(adaptive_csv_path) or '.', exist_ok=True)
+    df.to_csv(adaptive_csv_path, index=False)
+    print(f'Done, adaptive sweep saved at {adaptive_csv_path}')
+    return df
+
+def main(resume=resume):
+    os.makedirs(dir_loc, exist_ok=True)
+    os.makedirs(out_loc, exist_ok=True)
+
+    if sweep_mode == 'adaptive':
+        return adaptive_main()
+
+    # in scratch mode the run files are staged in RAM (see run_paths.py) and only the streamed results are persistent
+    run_dir_loc, run_out_loc = dir_loc, out_loc
+    if scratch_mode:
+        scratch = scratch_dir(out_loc, scratch_root)
+        run_dir_loc, run_out_loc = os.path.join(scratch, 'inp'), os.path.join(scratch, 'out')
+        print(f"Staging run files in {scratch}")
+    make_shards(run_dir_loc, shard_levels)
+    make_shards(run_out_loc, shard_levels)
+
+    # with streaming on, every finished run is parsed into csv_path while the sweep is running
+    delete_raw = delete_raw_outputs or scratch_mode
+    extractor = StreamingExtractor(csv_path, run_out_loc, run_dir_loc, delete_raw=delete_raw,
+                                   profile_store_dir=profile_store_dir,
+                                   shard_levels=shard_levels) if stream_results or scratch_mode else None
+    # runs already streamed are found in the CSV (their raw files may be deleted), outputs left in run_out_loc
+    # that never reached the CSV (a crashed streaming or scratch sweep) are streamed instead of counted as done
+    completed = completed_runs(csv_path) if use_result_cache and extractor is not None else set()
+    stream_cached = (lambda name: extractor(RunResult(name, 0, 0., False, None))) if extractor is not None else None
+    grid_keys = set()
+
+    def inputs():
+        return generate_inputs(create_input_parameters_combinations(), run_dir_loc, run_out_loc, completed,
+                               on_cached=stream_cached, keys=grid_keys)
 
-    print('Done, successful run!')
+    try:
+        # the journal tracks executable runs, in-process runs are resumed through the result cache
+        if journal_path is None or engine == 'python':
+            if engine == 'python':
+                runs = iter_engine(inputs(), run_out_loc, chunk_size=engine_chunk_size, shard_levels=shard_levels)
+            else:
+                input_name_list = [name for name, _ in inputs()]
+
+                # run PLUMERIA with the generated input files
+                jobs = ((name, input_path(run_dir_loc, name, shard_levels)) for name in input_name_list)
+                runs = iter_batch(jobs, plumeria_loc, backend=executor_backend, n_workers=n_workers,
+                                  max_in_flight=max_in_flight, timeout=run_timeout)
+            results = []
+            for result in runs:
+                if result.error:
+                    print(result.error)
+                if extractor is not None:
+                    extractor(result)
+                results.append(result)
+            skipped_files = summarize(results)
+        else:
+            # runs are registered in the journal as their input files are written, resume skips this step
+            # and only executes the runs the journal has not finished
+            with SweepJournal(journal_path) as journal:
+                if not resume:
+                    journal.add_runs(((name, params, input_path(run_dir_loc, name, shard_levels),
+                                       output_path(run_out_loc, name, shard_levels), run_timeout) for name, params in inputs()),
+                                     retire_missing=True)
+                if extractor is not None:
+                    # runs marked done before a crash whose rows never reached the CSV are streamed again from
+                    # their outputs, or run again if the output is gone
+                    streamed = completed_runs(csv_path)
+                    gone = []
+                    for name, _, _, _, _, path in journal.runs('done'):
+                        if name in streamed:
+                            continue
+                        if is_complete_output(path):
+                            extractor(RunResult(name, 0, 0., False, None))
+                        else:
+                            gone.append(name)
+                    journal.reset(gone)
+                run_with_journal(journal, plumeria_loc, backend=executor_backend, n_workers=n_workers, max_in_flight=max_in_flight,
+                                 max_attempts=max_attempts, timeout_factor=timeout_factor, on_result=extractor)
+                skipped_files = [name for name, *_ in journal.runs('failed') + journal.runs('timeout')]
+                grid_keys.update(name for name, *_ in journal.runs())
+    finally:
+        if extractor is not None:
+            extractor.close()
+
+    # scratch files are only removed once every run of the grid is in the CSV, an incomplete sweep can be resumed
+    missing = grid_keys - completed_runs(csv_path) if scratch_mode and not skipped_files else set()
+    if skipped_files:
+        print(f'Done, {len(skipped_files)} skipped runs.')
+    elif missing:
+        print(f'Done, {len(missing)} runs are not in {csv_path}, scratch files kept in {scratch}.')
+    else:
+        print('Done, successful run!')
+        if scratch_mode:
+            shutil.rmtree(scratch, ignore_errors=True)
+    return skipped_files + sorted(missing)
 
 if __name__ == '__main__':
     main()
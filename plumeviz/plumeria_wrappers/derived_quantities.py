@@ -0,0 +1,104 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Derived quantities of the extracted Plumeria data, computed over whole columns.
+
+Every function takes scalars, NumPy arrays or pandas Series and broadcasts, so a column is
+computed with one call instead of a row-wise df.apply(lambda ..., axis=1):
+    df['Ri'] = richardson(df['mixture density (kg/m3)'], df['vent equivalent init (m)'], df['initial velocity (m/s)'])
+
+The formulas are the ones the extract scripts used before (same constants, same rounding), so the
+extracted CSVs do not change. See bench_derived.py in plumeviz/benchmarks for the speedup.
+
+reference_join() attaches the value of a reference run (e.g. the dry plume height) to every row
+with one grouped pass and a hash join instead of a filter per diameter.
+'''
+
+import numpy as np
+import pandas as pd
+
+RHO_0 = 1.292       # ambient air density at the vent, kg/m^3
+G     = 9.81        # earth gravity constant, m/s^2
+T_0   = 273.15      # reference temperature, K
+BETA  = 1/T_0       # thermal expansion coefficient of air at STP
+
+
+def dry_density(w, rho_mix):
+    """Mixture density of the first run without external water (the first run if there is none)."""
+    w, rho_mix = np.asarray(w), np.asarray(rho_mix)
+    return float(rho_mix[np.argmax(w == 0)])
+
+
+def adjust_vent(vent, rho_wet, w, rho_dry):
+    """Vent diameter adjusted for the mixture density of the wet eruption column."""
+    return np.sqrt(rho_dry / (rho_wet * (1 - w))) * vent
+
+
+def vent_equivalent(vent, rho_mix, w, rho_dry):
+    """Equivalent initial vent diameter (m) of the dry mixture, rounded to 0.1 m."""
+    return np.round(vent * np.sqrt((rho_mix * (1 - w)) / rho_dry), 1)
+
+
+def mer_eq(r, vel):
+    """Mass eruption rate from vent size and velocity with a fixed 5.62 kg/m3 mixture density."""
+    return np.pi * r**2 * 5.62 * vel
+
+
+def mass_flux(m_cal, w):
+    """Magma mass flux M_0 = (1-w)M_calculated (kg/s)."""
+    return m_cal * (1 - w)
+
+
+def delta_z(height, dry_height):
+    """Change in plume height relative to the dry plume height (km)."""
+    return height - dry_height
+
+
+def richardson(rho_mix, vent, vel):
+    """Richardson number from the reduced gravity of the mixture, vent diameter and exit velocity."""
+    red_g = (G * (rho_mix - RHO_0)) / RHO_0
+    return (red_g * vent) / (vel**2)
+
+
+def richardson_temp(vent, vel, temp):
+    """Thermal Richardson number g beta d (T - T_0) / u^2, temp in K."""
+    return (G * BETA * vent * (temp - T_0)) / vel**2
+
+
+def reduced_gravity(rho_mix):
+    """'g prime' column of the extracted data, (9.81 rho_mix - rho_0) / rho_0."""
+    return (G * rho_mix - RHO_0) / RHO_0
+
+
+def relative_humidity(temp, dew):
+    """Relative humidity (%) from temperature and dew point (C), Magnus formula."""
+    beta = 17.625
+    lambd = 243.04
+    return np.exp((beta * dew) / (lambd + dew)) / np.exp((beta * temp) / (lambd + temp)) * 100
+
+
+def reference_join(df, keys, value, reference):
+    """
+    Value of each row's reference run, e.g. the dry (w = 0) plume height of the same u, T and vent diameter.
+
+    The reference rows are reduced to the first one (in frame order) per key in one grouped pass and
+    attached to every row with a single hash join, rows without a reference get NaN.
+
+    Args:
+        df (DataFrame): Extracted data.
+        keys (list): Columns that identify the reference run of a row.
+        value (str): Column of the reference run to attach.
+        reference (Series): Boolean mask of the rows that can be a reference, e.g. df[w] == 0.
+
+    Returns:
+        Series: aligned with df.
+    """
+    baseline = df.loc[reference, keys + [value]].dropna(subset=keys).drop_duplicates(subset=keys, keep='first')
+    joined = df[keys].merge(baseline, on=keys, how='left')
+    return pd.Series(joined[value].to_numpy(), index=df.index, name=value)
@@ -1,4 +1,4 @@
-### Last modified: 3/6/2024
+### Last modified: 10/17/2026
 
 """
 Use for bulk runs, i.e., batch_plumeria_input_bulk.py
@@ -7,34 +7,79 @@ Use for bulk runs, i.e., batch_plumeria_input_bulk.py
 import os
 from batch_vent_functions import binary_log_input
 
-def main():
-    # Parameters
-    mass_frac_add_water_list = [float(a / 100) for a in range(0, 21)]  # 0 - 21 wt%
-    magma_temp_list = [900]
-    vent_vel_list = [100]  # Ran 2.1.2024
-    humid_list = [0]  # Enter percent, last ran 3.20.24
+# Parameters
+mass_frac_add_water_list = [float(a / 100) for a in range(0, 21)]  # 0 - 21 wt%
+magma_temp_list = [900]
+vent_vel_list = [100]  # Ran 2.1.2024
+humid_list = [0]  # Enter percent, last ran 3.20.24
+
+# Parameters for vent diameter radius
+min_vent_diameter = 1
+max_vent_diameter = 44000  # Use 32800 for u=150
+interval_size = 6  # Must be >1
+
+vent_diameter_list = binary_log_input(min_vent_diameter, max_vent_diameter, interval_size)
+
+# adjust individual vent properties here
+gas_frac = 0.03  #
+
+# sounding data file and location
+line11 = 'test.txt'  # "Data_sounding_READY/2012_7_17_00_85996072_profile.txt"
 
-    # Parameters for vent diameter radius
-    min_vent_diameter = 1
-    max_vent_diameter = 44000  # Use 32800 for u=150
-    interval_size = 6  # Must be >1
+# directory locations
+dir_loc = 'inp_TEST'  # Ran 3/07/2024
+out_loc = 'out_TEST'  # Ran 3/07/2024
+csv_path = 'plumeria_data/00plumeria_TEST.csv'  # Directory where original data is to be saved, ran 3/7/2024
 
-    vent_diameter_list = binary_log_input(min_vent_diameter, max_vent_diameter, interval_size)
+# Plumeria location
+plumeria_loc = '/Users/carrile/documents/masters_work/plume_fort_v2.3.1/plumeria'
 
-    # adjust individual vent properties here
-    gas_frac = 0.03  #
+# Run file layout (see run_paths.py), shard_levels > 0 spreads the input and output files over 256**shard_levels
+# hashed subdirectories of dir_loc and out_loc. scratch_mode stages them in a directory of scratch_root (RAM backed),
+# streams every run into csv_path and deletes its files, so only the compacted results are written to out_loc's filesystem
+shard_levels = 0
+scratch_mode = False
+scratch_root = '/dev/shm'
 
-    # sounding data file and location
-    line11 = 'test.txt'  # "Data_sounding_READY/2012_7_17_00_85996072_profile.txt"
+# Run engine, 'plumeria' executes plumeria_loc once per run, 'python' integrates the runs in process in chunks of
+# engine_chunk_size with the vectorized plume model of plume_engine.py (see validate_plume_engine.py for its
+# agreement with Plumeria), the output files are written to out_loc in the Plumeria format
+engine = 'plumeria'
+engine_chunk_size = 2000
 
-    # directory locations
-    dir_loc = 'inp_TEST'  # Ran 3/07/2024
-    out_loc = 'out_TEST'  # Ran 3/07/2024
-    csv_path = 'plumeria_data/00plumeria_TEST.csv'  # Directory where original data is to be saved, ran 3/7/2024
+# Sweep mode, 'grid' runs every combination above, 'adaptive' starts from a coarse vent diameter x w grid
+# and only refines where the plume height jumps (see adaptive_sweep.py)
+sweep_mode = 'grid'
+adaptive_coarse_shape = (16, 6)   # coarse grid nodes along log2(vent diameter) and w
+adaptive_max_depth = 4            # refinement levels
+adaptive_jump_km = 2.0            # height change between neighbours that triggers refinement
+adaptive_csv_path = 'plumeria_data/00plumeria_TEST_adaptive.csv'
 
-    # Plumeria location
-    plumeria_loc = '/Users/carrile/documents/masters_work/plume_fort_v2.3.1/plumeria'
+# Executor settings (see batch_executor.py)
+# 'spawn' starts the runs with posix_spawn from one event loop (see process_launcher.py), the cheapest launch per run
+executor_backend = 'thread'  # 'serial', 'thread', 'process' or 'spawn'; threads are enough since each run is its own process
+n_workers = os.cpu_count()   # number of Plumeria runs executed at the same time
+max_in_flight = None         # max submitted runs waiting in the queue, defaults to 2 * n_workers
+run_timeout = 0.5            # seconds allowed per Plumeria run
 
+# Result cache (see result_cache.py), opt-in: runs are named by a hash of their input deck and the Plumeria binary
+# instead of run1, run2, ..., and runs whose output already sits in out_loc are not executed again
+use_result_cache = False
+
+# Sweep journal (see sweep_journal.py), records the state of every run so an interrupted sweep can be resumed,
+# set journal_path = None to run without a journal
+journal_path = os.path.join(dir_loc, 'sweep_journal.sqlite')
+resume = False          # True: do not regenerate inputs, only run what the journal has not finished
+max_attempts = 3        # attempts per run, timed-out runs are retried with a longer timeout
+timeout_factor = 2.0    # timeout multiplier applied after each timeout
+
+# Streaming extraction (see streaming_pipeline.py), parse each output into csv_path as soon as its run finishes
+stream_results = False
+delete_raw_outputs = False  # delete input and output text files once their rows are flushed, resume through the journal
+# full dz profiles of streamed runs are appended to this profile store (see profile_store.py), None to skip them
+profile_store_dir = os.path.splitext(csv_path)[0] + '_profiles'
+
+def main():
     # create directories if they do not exist
     os.makedirs(dir_loc, exist_ok=True)
     os.makedirs(out_loc, exist_ok=True)
@@ -0,0 +1,114 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Parallel and incremental extraction of Plumeria output files.
+
+extract_rows() parses output files on a process pool in chunks of chunk_size files, so that each
+task amortises the inter-process overhead over thousands of files. Rows come back in the order of
+the input paths.
+
+The incremental mode keeps a manifest (run, size, mtime_ns) of every file already extracted next to
+the CSV. A re-extraction only stats the directory, parses the files that are new or whose size or
+mtime changed and appends their rows to the existing CSV; the CSV is only rewritten when an already
+extracted file changed. Files removed from the directory keep their rows.
+
+Usage:
+    manifest = load_manifest(manifest_path)
+    new, changed, current = scan_changes(output_dir, manifest)
+    rows, _ = extract_rows([os.path.join(output_dir, run) for run in new + changed], expected_length=16)
+'''
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from plumeria_parser import read_row, read_row_and_profile
+from run_paths import scan_files
+from run_archive import RunArchive, is_archive
+
+MANIFEST_COLUMNS = ['run', 'size', 'mtime_ns']
+
+
+def _extract_chunk(paths, expected_length, sounding, profiles):
+    if not profiles:
+        return [read_row(path, expected_length, sounding) for path in paths], None
+    rows, dzs = [], []
+    for path in paths:
+        values_list, dz = read_row_and_profile(path, expected_length, sounding)
+        rows.append(values_list)
+        dzs.append(dz.astype(np.float32))
+    return rows, dzs
+
+
+def extract_rows(paths, expected_length=33, n_workers=None, chunk_size=2000, sounding=False, profiles=False):
+    """
+    Parse output files into extracted CSV rows, on a process pool if n_workers > 1.
+
+    Args:
+        paths (list): Output files.
+        expected_length (int): Values per row, see plumeria_parser.read_row().
+        n_workers (int): Worker processes, None for os.cpu_count(), 1 to parse in the calling process.
+        chunk_size (int): Files per task.
+        sounding (bool): True for runs that used a sounding file.
+        profiles (bool): Also return the full dz profile of every file.
+
+    Returns:
+        tuple: (rows, dzs), one row per path and the list of dz arrays (None if profiles is False).
+    """
+    n_workers = n_workers or os.cpu_count()
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    if n_workers == 1 or len(chunks) <= 1:
+        results = [_extract_chunk(chunk, expected_length, sounding, profiles) for chunk in chunks]
+    else:
+        n = len(chunks)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_extract_chunk, chunks, [expected_length] * n, [sounding] * n, [profiles] * n))
+
+    rows = [row for chunk_rows, _ in results for row in chunk_rows]
+    dzs = [dz for _, chunk_dzs in results for dz in chunk_dzs] if profiles else None
+    return rows, dzs
+
+
+def load_manifest(manifest_path):
+    """Manifest of already extracted files as {run: (size, mtime_ns)}, empty if there is none yet."""
+    if not os.path.exists(manifest_path):
+        return {}
+    manifest = pd.read_csv(manifest_path, dtype={'run': str, 'size': np.int64, 'mtime_ns': np.int64})
+    return dict(zip(manifest['run'], zip(manifest['size'], manifest['mtime_ns'])))
+
+
+def save_manifest(manifest_path, manifest):
+    """Write the manifest through a temporary file so an interrupted write never leaves it half written."""
+    df = pd.DataFrame([(run, size, mtime) for run, (size, mtime) in manifest.items()], columns=MANIFEST_COLUMNS)
+    tmp_path = manifest_path + '.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, manifest_path)
+
+
+def scan_changes(output_dir, manifest, suffix='.txt'):
+    """
+    Compare the output directory (flat or sharded, see run_paths.py, or an archive, see run_archive.py)
+    against a manifest.
+
+    Returns:
+        tuple: (new, changed, current), lists of new and changed file paths relative to output_dir
+        and the {run: (size, mtime_ns)} of every file now in the directory ({run: (size, offset)} for archives).
+    """
+    current = {}
+    if is_archive(output_dir):
+        current = {run: key for run, key in RunArchive(output_dir).manifest().items()
+                   if run.startswith('Grid_Runs_out_') and run.endswith(suffix)}
+    else:
+        for run, entry in scan_files(output_dir, suffix):
+            stat = entry.stat()
+            current[run] = (stat.st_size, stat.st_mtime_ns)
+
+    new = [run for run in current if run not in manifest]
+    changed = [run for run, key in current.items() if run in manifest and tuple(manifest[run]) != key]
+    return new, changed, current
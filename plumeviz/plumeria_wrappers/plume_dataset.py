@@ -0,0 +1,218 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Lazy access to extracted Plumeria results.
+
+PlumeDataset opens a result file without loading it. read() loads only the requested columns and
+only the rows that pass the filters, and the filters are applied by the storage layer:
+    .csv         the file is streamed in chunks with usecols, each chunk is filtered before the next
+                 one is read, so peak memory follows the selection and not the sweep
+    .plume       result store (see result_store.py), chunks are skipped by their min/max and the
+                 columns are memory-mapped
+    .parquet     filters are passed to pyarrow (row group statistics), requires pyarrow
+    _cube.npz    equality filters on the sweep dimensions are index lookups on the ResultCube
+
+Filters are given by column name (filters dict) or by the short names of result_cube.DIM_ALIASES:
+    value        column == value
+    [a, b, ...]  column in the list
+    (lo, hi)     lo <= column < hi, None for an open end
+
+By default floats are returned as float32 and strings as categories; the sweep dimensions and
+filtered columns keep float64 so that equality masks such as df[w] == 0.07 still work. The last
+cache_size results are kept in an LRU cache.
+
+Usage:
+    dataset = PlumeDataset('plumeria_data/plume_values.csv')
+    df = dataset.read(['mass flux (kg/s)', 'mass fraction water added', 'calculated heigth (km)'],
+                      u=100, T=900, filters={'mass flux (kg/s)': (None, 1.5e10)})
+'''
+
+import os
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from result_cube import DIMS, DIM_ALIASES, ResultCube
+from result_store import ResultStore
+
+try:
+    import pyarrow.parquet as pq  # only needed for .parquet results
+except ImportError:
+    pq = None
+
+
+def _normalise_filters(filters):
+    """Filters as a sorted tuple of (column, op, value), op is '==', 'in' or 'range', hashable for the cache."""
+    normalised = []
+    for column, value in filters.items():
+        column = DIM_ALIASES.get(column, column)
+        if isinstance(value, tuple):
+            normalised.append((column, 'range', value))
+        elif isinstance(value, (list, set, np.ndarray)):
+            normalised.append((column, 'in', tuple(sorted(value))))
+        else:
+            normalised.append((column, '==', value))
+    return tuple(sorted(normalised, key=lambda f: (f[0], f[1])))
+
+
+def _mask(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in filters:
+        values = df[column]
+        if op == '==':
+            mask &= (values == value).to_numpy()
+        elif op == 'in':
+            mask &= values.isin(value).to_numpy()
+        else:
+            lo, hi = value
+            if lo is not None:
+                mask &= (values >= lo).to_numpy()
+            if hi is not None:
+                mask &= (values < hi).to_numpy()
+    return mask
+
+
+class PlumeDataset:
+    """Lazily opened result file (CSV, result store, parquet or result cube)."""
+
+    def __init__(self, path, cache_size=8, chunk_rows=500_000):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        self.path = path
+        self.cache_size = cache_size
+        self.chunk_rows = chunk_rows
+        self._cache = OrderedDict()
+        self._columns = None
+        self._cube = None
+        self._store = None
+
+    @property
+    def format(self):
+        if os.path.isdir(self.path):
+            return 'store'
+        if self.path.endswith('.npz'):
+            return 'cube'
+        if self.path.endswith('.parquet'):
+            return 'parquet'
+        return 'csv'
+
+    @property
+    def columns(self):
+        """Column names, read from the header only."""
+        if self._columns is None:
+            if self.format == 'parquet' and pq is None:
+                raise ImportError("pyarrow is needed to read parquet results")
+            if self.format == 'store':
+                self._columns = self._load_store().columns
+            elif self.format == 'cube':
+                cube = self._load_cube()
+                self._columns = cube.dims + list(cube.data)
+            elif self.format == 'parquet':
+                self._columns = list(pq.read_schema(self.path).names)
+            else:
+                self._columns = list(pd.read_csv(self.path, nrows=0).columns)
+        return self._columns
+
+    def _load_store(self):
+        if self._store is None:
+            self._store = ResultStore(self.path)
+        return self._store
+
+    def _load_cube(self):
+        if self._cube is None:
+            self._cube = ResultCube.load(self.path)
+        return self._cube
+
+    def read(self, columns=None, filters=None, compact=True, **aliases):
+        """
+        Load the selected columns of the rows that pass every filter.
+
+        Args:
+            columns (list): Columns to return, None for all.
+            filters (dict): {column: value, [values] or (lo, hi)}, see the module docstring.
+            compact (bool): float32 and category dtypes for the columns that are not sweep dimensions or filtered.
+            **aliases: Filters by short name, e.g. u=100, T=900, w=(0, 0.3).
+
+        Returns:
+            DataFrame: A copy, the cached result is not modified by the caller.
+        """
+        filters = _normalise_filters({**(filters or {}), **aliases})
+        key = (tuple(columns) if columns is not None else None, filters, compact)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key].copy()
+
+        df = self._read(columns, filters)
+        if compact:
+            keep = set(DIMS) | {column for column, _, _ in filters}
+            df = _compact(df, keep)
+
+        self._cache[key] = df
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return df.copy()
+
+    def _read(self, columns, filters):
+        filter_columns = [column for column, _, _ in filters]
+        missing = [c for c in (columns or []) + filter_columns if c not in self.columns]
+        if missing:
+            raise KeyError(f"Columns not in {self.path}: {missing}")
+        needed = None if columns is None else list(dict.fromkeys(columns + filter_columns))
+
+        if self.format == 'store':
+            df = self._load_store().read(needed, filters)
+        elif self.format == 'cube':
+            cube = self._load_cube()
+            selection = {column: value for column, op, value in filters if op == '==' and column in cube.dims}
+            names = needed if needed is not None else self.columns
+            if any(value not in cube.coords[column] for column, value in selection.items()):
+                df = pd.DataFrame({name: np.empty(0, (cube.coords[name] if name in cube.coords
+                                                      else cube.data[name]).dtype) for name in names})
+            else:
+                cube = cube.sel(selection)
+                # convert only the needed variables, but drop the cells without a run like to_frame() does
+                has_run = ~np.logical_and.reduce([np.isnan(values).ravel() for values in cube.data.values()])
+                df = cube.to_frame(dropna=False, variables=[name for name in names if name in cube.data])
+                df = df.loc[has_run, names]
+            df = df.loc[_mask(df, filters)]
+        elif self.format == 'parquet':
+            pushed = []
+            for column, op, value in filters:
+                if op == 'range':
+                    pushed += [(column, '>=', value[0])] if value[0] is not None else []
+                    pushed += [(column, '<', value[1])] if value[1] is not None else []
+                else:
+                    pushed.append((column, op, list(value) if op == 'in' else value))
+            df = pd.read_parquet(self.path, columns=needed, filters=pushed or None)
+        else:
+            chunks = [chunk.loc[_mask(chunk, filters)] for chunk in
+                      pd.read_csv(self.path, usecols=needed, chunksize=self.chunk_rows)]
+            df = pd.concat(chunks) if chunks else pd.DataFrame(columns=needed or self.columns)
+
+        if columns is not None:
+            df = df[columns]
+        return df.reset_index(drop=True)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+
+def _compact(df, keep):
+    """float32 floats, smallest integers and categories, except for the columns in keep."""
+    df = df.copy()
+    for column in df.columns:
+        if column in keep:
+            continue
+        dtype = df[column].dtype
+        if dtype == np.float64:
+            df[column] = df[column].astype(np.float32)
+        elif dtype == np.int64:
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+        elif dtype == object:
+            df[column] = df[column].astype('category')
+    return df
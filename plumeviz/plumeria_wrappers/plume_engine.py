@@ -0,0 +1,324 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+In-process 1-D plume model, integrates a whole batch of runs at once.
+
+Each Plumeria run costs a process start, an input and an output text file and the run timeout,
+which dominates dense sensitivity studies. This engine integrates the same steady, top-hat plume
+equations as Plumeria v2.3.1 (Mastin 2007) for every member of a batch as NumPy arrays:
+    mass        d(M)/dz = 2 pi r rho_air alpha u, entrained moist air split into dry air and water
+    momentum    d(M u)/dz = g pi r^2 (rho_air - rho_mix)
+    energy      d(M (h + g z + u^2/2))/dz = h_air + g z per unit entrained mass
+with water in thermodynamic equilibrium: vapor condenses to liquid, and liquid turns into ice between
+0 and -40 C. The entrainment coefficient alpha = 0.09 gets the Ricou & Spalding (1961) density
+correction in the jet region (rho_mix > rho_air), as in Woods (1988). Atmosphere: the tropospheric
+profile of the input deck (no sounding file). External water enters as liquid at the air temperature.
+
+All members take one step per iteration with their own step size (a fraction of the plume radius)
+and drop out of the batch when their velocity reaches zero, i.e. at the plume top or when the jet
+collapses. The results have the layout of parsed output files (plumeria_parser.ParsedOutput: header,
+heights, dz table), so summary_row(), the extractors and the profile store work unchanged, and
+write_outputs() writes them as Plumeria output files.
+
+This is not the Fortran code, validate_plume_engine.py compares both on existing output files.
+
+Usage:
+    outputs = simulate(magma_temp=900, gas_frac=0.03, vent_diam=[10, 100, 1000], vent_vel=100, water_wt=0.1, humid=0)
+    outputs[0].heights   # calculated, Sparks et al. (1997) and Mastin et al. (2009) heights (km)
+'''
+
+import numpy as np
+from timeit import default_timer as timer
+from batch_executor import RunResult
+from plumeria_parser import ParsedOutput, format_output
+from run_paths import output_path
+
+ENGINE_VERSION = 'plume_engine 1'   # part of the result cache key of runs made with this engine
+
+G = 9.81                # m/s^2
+P_0 = 101325.           # sea level pressure, Pa
+R_AIR = 287.05          # gas constant of dry air, J/kg K
+R_VAPOR = 461.5         # gas constant of water vapor, J/kg K
+EPSILON = R_AIR / R_VAPOR
+C_AIR = 1004.           # specific heats, J/kg K
+C_VAPOR = 1850.
+C_LIQUID = 4190.
+C_ICE = 2100.
+L_VAPOR = 2.501e6       # latent heats at 0 C, J/kg
+L_FUSION = 3.337e5
+RHO_LIQUID = 1000.      # kg/m^3
+RHO_ICE = 917.
+T_FREEZE = 273.15       # K
+FREEZE_RANGE = 40.      # condensed water is all ice 40 K below freezing
+ALPHA = 0.09            # entrainment coefficient
+
+## enthalpies relative to liquid water, h_liquid = C_LIQUID T
+H0_VAPOR = L_VAPOR - (C_VAPOR - C_LIQUID) * T_FREEZE
+H0_ICE = (C_LIQUID - C_ICE) * T_FREEZE - L_FUSION
+
+T_MIN, T_MAX = 150., 2500.      # bracket of the temperature solve, K
+N_BISECT = 24
+
+
+def ice_fraction(T):
+    """Fraction of the condensed water that is ice at temperature T (K)."""
+    return np.clip((T_FREEZE - T) / FREEZE_RANGE, 0, 1)
+
+
+def saturation_pressure(T):
+    """Saturation vapor pressure (Pa) over liquid water and ice (Magnus form), weighted by ice_fraction()."""
+    f = ice_fraction(T)
+    liquid = 611.2 * np.exp(17.67 * (T - T_FREEZE) / (T - 29.65))
+    ice = 611.2 * np.exp(22.46 * (T - T_FREEZE) / (T - 0.53))
+    return (1 - f) * liquid + f * ice
+
+
+def _vapor_fraction(T, x_a, x_w, p):
+    """Vapor mass fraction in equilibrium, all water is vapor when the saturation pressure exceeds p."""
+    e = saturation_pressure(T)
+    below = e < p
+    saturated = x_a * EPSILON * e / np.where(below, p - e, 1.)
+    return np.where(below, np.minimum(x_w, saturated), x_w)
+
+
+def _condensed_enthalpy(T):
+    f = ice_fraction(T)
+    return (1 - f) * C_LIQUID * T + f * (C_ICE * T + H0_ICE)
+
+
+def _enthalpy(T, x_s, x_a, x_w, p, c_s):
+    """Specific enthalpy (J/kg) of the mixture with its water in equilibrium at T."""
+    h_c = _condensed_enthalpy(T)
+    x_v = _vapor_fraction(T, x_a, x_w, p)
+    return (x_s * c_s + x_a * C_AIR) * T + x_w * h_c + x_v * (C_VAPOR * T + H0_VAPOR - h_c)
+
+
+def equilibrium(h, x_s, x_a, x_w, p, c_s, guess=None, width=100.):
+    """
+    Temperature and water phases of a mixture from its specific enthalpy.
+
+    h is monotonic in T, it is solved by bisection in lockstep for all members, starting from
+    guess +- width where the guess brackets the solution. The vapor fraction is then taken from
+    the energy balance, so boiling and condensation (where h jumps at constant T) close exactly.
+
+    Returns:
+        tuple: T (K), vapor, liquid and ice mass fractions.
+    """
+    lo, hi = np.full_like(h, T_MIN), np.full_like(h, T_MAX)
+    if guess is not None:
+        g_lo, g_hi = np.maximum(guess - width, T_MIN), np.minimum(guess + width, T_MAX)
+        ok = (_enthalpy(g_lo, x_s, x_a, x_w, p, c_s) <= h) & (_enthalpy(g_hi, x_s, x_a, x_w, p, c_s) >= h)
+        lo, hi = np.where(ok, g_lo, lo), np.where(ok, g_hi, hi)
+    for _ in range(N_BISECT + (0 if guess is not None else 8)):
+        mid = 0.5 * (lo + hi)
+        above = _enthalpy(mid, x_s, x_a, x_w, p, c_s) > h
+        lo, hi = np.where(above, lo, mid), np.where(above, mid, hi)
+    T = 0.5 * (lo + hi)
+
+    h_c = _condensed_enthalpy(T)
+    h_condensed = (x_s * c_s + x_a * C_AIR) * T + x_w * h_c
+    x_v = np.clip((h - h_condensed) / (C_VAPOR * T + H0_VAPOR - h_c), 0, x_w)
+    f = ice_fraction(T)
+    return T, x_v, (1 - f) * (x_w - x_v), f * (x_w - x_v)
+
+
+def _atmosphere(z, c):
+    """Temperature (K), pressure (Pa), density (kg/m^3) and vapor mass fraction of the air at z m above the vent."""
+    h = c['vent_elev'] + z
+    with np.errstate(invalid='ignore'):  # every layer is evaluated at every height, np.select picks the valid one
+        T_trop = c['T_sea'] + c['lapse_rate'] * h
+        p_trop = P_0 * (T_trop / c['T_sea'])**(-G / (R_AIR * c['lapse_rate']))
+        p_iso = c['p_trop'] * np.exp(-G * (h - c['tropopause']) / (R_AIR * c['T_trop']))
+        T_strat = c['T_trop'] + c['strat_lapse_rate'] * (h - c['strat_base'])
+        p_strat = c['p_strat'] * (T_strat / c['T_trop'])**(-G / (R_AIR * c['strat_lapse_rate']))
+
+    layers = [h < c['tropopause'], h < c['strat_base']]
+    T = np.select(layers, [T_trop, c['T_trop']], T_strat)
+    p = np.select(layers, [p_trop, p_iso], p_strat)
+    e = c['humid'] / 100 * saturation_pressure(T)
+    q = EPSILON * e / (p - (1 - EPSILON) * e)
+    rho = p / (T * (R_AIR * (1 - q) + R_VAPOR * q))
+    return T, p, rho, q
+
+
+def _init_atmosphere(c):
+    """Layer boundary temperatures and pressures of every member (lapse rates must not be 0)."""
+    c['T_sea'] = c['air_temp'] + T_FREEZE - c['lapse_rate'] * c['vent_elev']
+    c['T_trop'] = c['T_sea'] + c['lapse_rate'] * c['tropopause']
+    c['p_trop'] = P_0 * (c['T_trop'] / c['T_sea'])**(-G / (R_AIR * c['lapse_rate']))
+    c['strat_base'] = c['tropopause'] + c['tropopause_thickness']
+    c['p_strat'] = c['p_trop'] * np.exp(-G * c['tropopause_thickness'] / (R_AIR * c['T_trop']))
+
+
+def _evaluate(z, y, c, T_guess, alpha):
+    """Derivatives of the fluxes y = (M_air, M_water, M u, energy) and the plume properties at z."""
+    M_a, M_w, P, E = y
+    M = c['M_s'] + M_a + M_w
+    u = P / M
+    h = E / M - G * z - 0.5 * u**2
+    x_s, x_a, x_w = c['M_s'] / M, M_a / M, M_w / M
+    T_air, p, rho_air, q = _atmosphere(z, c)
+    T, x_v, x_l, x_i = equilibrium(h, x_s, x_a, x_w, p, c['specific_heat'], T_guess)
+    rho = 1 / (x_s / c['magma_density'] + x_l / RHO_LIQUID + x_i / RHO_ICE + (x_a * R_AIR + x_v * R_VAPOR) * T / p)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = np.sqrt(M / (np.pi * rho * u))
+
+    entrainment = alpha * np.where(rho > rho_air, np.sqrt(rho / rho_air), 1.)
+    dM = 2 * np.pi * r * rho_air * entrainment * u
+    h_air = (1 - q) * C_AIR * T_air + q * (C_VAPOR * T_air + H0_VAPOR)
+    dy = np.array([dM * (1 - q), dM * q, G * np.pi * r**2 * (rho_air - rho), dM * (h_air + G * z)])
+    props = np.array([x_s, x_a, x_v, x_l, x_i, u, r, T, T_air, rho, rho_air, p])
+    return dy, props
+
+
+def _broadcast(n, **params):
+    return {key: np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy() for key, value in params.items()}
+
+
+def simulate(magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, air_temp=0., lapse_rate=-0.0065,
+             tropopause=11000., tropopause_thickness=9000., strat_lapse_rate=0.0016, vent_elev=0.,
+             specific_heat=1000., magma_density=2500., profiles=True, alpha=ALPHA, step_fraction=0.1,
+             min_step=0.01, max_step=100., z_max=100000., max_steps=50000):
+    """
+    Integrate a batch of runs in lockstep.
+
+    The run parameters take the arguments of make_inp_file() and the other values of the input
+    deck, as scalars or arrays (broadcast against each other).
+
+    Args:
+        magma_temp (float): Magma temperature (C).
+        gas_frac (float): Mass fraction gas (water vapor) in the magma.
+        vent_diam (float): Vent diameter (m).
+        vent_vel (float): Exit velocity (m/s).
+        water_wt (float): Mass fraction of added external water.
+        humid (float): Air relative humidity (%).
+        profiles (bool): Keep the full dz table, if False only the vent row is kept.
+        alpha (float): Entrainment coefficient.
+        step_fraction (float): Height step as a fraction of the plume radius, clipped to [min_step, max_step] m.
+        z_max (float): Runs still rising at z_max m above the vent stop there with a NaN height.
+
+    Returns:
+        list: ParsedOutput of every run, in input order.
+    """
+    n = max(np.size(v) for v in (magma_temp, gas_frac, vent_diam, vent_vel, water_wt, humid, air_temp))
+    c = _broadcast(n, magma_temp=magma_temp, gas_frac=gas_frac, vent_diam=vent_diam, vent_vel=vent_vel,
+                   water_wt=water_wt, humid=humid, air_temp=air_temp, lapse_rate=lapse_rate, tropopause=tropopause,
+                   tropopause_thickness=tropopause_thickness, strat_lapse_rate=strat_lapse_rate,
+                   vent_elev=vent_elev, specific_heat=specific_heat, magma_density=magma_density)
+    _init_atmosphere(c)
+    w, gas = c['water_wt'], c['gas_frac']
+
+    # vent: magma and its gas at magma_temp mixed with liquid water at the air temperature
+    T_magma = c['magma_temp'] + T_FREEZE
+    T_water = np.maximum(c['air_temp'] + T_FREEZE, T_FREEZE)
+    h_0 = ((1 - w) * ((1 - gas) * c['specific_heat'] * T_magma + gas * (C_VAPOR * T_magma + H0_VAPOR))
+           + w * C_LIQUID * T_water)
+    x_s, x_w = (1 - w) * (1 - gas), (1 - w) * gas + w
+    T_air, p_vent, _, _ = _atmosphere(np.zeros(n), c)
+    T, x_v, x_l, x_i = equilibrium(h_0, x_s, np.zeros(n), x_w, p_vent, c['specific_heat'])
+    rho_0 = 1 / (x_s / c['magma_density'] + x_l / RHO_LIQUID + x_i / RHO_ICE + x_v * R_VAPOR * T / p_vent)
+    mass_flux = rho_0 * np.pi * (c['vent_diam'] / 2)**2 * c['vent_vel']
+    c['M_s'] = x_s * mass_flux
+
+    y = np.array([np.zeros(n), x_w * mass_flux, mass_flux * c['vent_vel'], mass_flux * (h_0 + 0.5 * c['vent_vel']**2)])
+    z, t = np.zeros(n), np.zeros(n)
+    ids = np.arange(n)
+    height = np.full(n, np.nan)
+    rows, row_ids = [], []
+
+    for step in range(max_steps):
+        dy, props = _evaluate(z, y, c, T, alpha)
+        if profiles or step == 0:
+            rows.append(np.column_stack([np.full(len(ids), step), z, props[:7].T, props[7:11].T, t, props[11],
+                                         props[3] * props[9], props[4] * props[9]]))
+            row_ids.append(ids)
+
+        T = props[7]
+        dz = np.clip(step_fraction * props[6], min_step, max_step)
+        dz = np.where(np.isfinite(dz), dz, min_step)
+        y_mid = y + 0.5 * dz * dy
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dy_mid, props_mid = _evaluate(z + 0.5 * dz, y_mid, c, T, alpha)
+            y_new = y + dz * dy_mid
+
+        # the plume top (or collapse) is where the momentum flux reaches 0, interpolated within the step
+        P_euler = y[2] + dz * dy[2]
+        done = (P_euler <= 0) | (y_new[2] <= 0) | ~np.isfinite(y_new).all(axis=0) | (y_mid[2] <= 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            top = z + np.clip(np.where(dy[2] < 0, y[2] / -dy[2], dz), 0, dz)
+        height[ids[done]] = top[done]
+        over = ~done & (z + dz >= z_max)
+
+        keep = ~(done | over)
+        if not keep.any():
+            break
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = t + dz / props_mid[5]
+        z, y, t, T, ids = z[keep] + dz[keep], y_new[:, keep], t[keep], T[keep], ids[keep]
+        c = {key: value[keep] for key, value in c.items()}
+
+    return _assemble(n, rows, row_ids, height, mass_flux, rho_0, p_vent, _broadcast(
+        n, magma_temp=magma_temp, gas_frac=gas_frac, vent_diam=vent_diam, vent_vel=vent_vel, water_wt=water_wt,
+        humid=humid, air_temp=air_temp, vent_elev=vent_elev, specific_heat=specific_heat,
+        magma_density=magma_density))
+
+
+def _assemble(n, rows, row_ids, height, mass_flux, rho_0, p_vent, c):
+    """Split the rows recorded in lockstep into one ParsedOutput per run."""
+    rows, row_ids = np.vstack(rows), np.concatenate(row_ids)
+    order = np.argsort(row_ids, kind='stable')
+    tables = np.split(rows[order], np.cumsum(np.bincount(row_ids, minlength=n))[:-1])
+
+    # Sparks et al. (1997) and Mastin et al. (2009) heights from the DRE volume flux of the magma
+    volume_flux = mass_flux * (1 - c['water_wt']) / c['magma_density']
+    heights = np.column_stack([height / 1000, 1.67 * volume_flux**0.259, 2.00 * volume_flux**0.241])
+    headers = np.column_stack([c['humid'], c['air_temp'], p_vent / P_0, c['vent_diam'], c['vent_elev'],
+                               c['vent_vel'], c['magma_temp'], c['gas_frac'], c['specific_heat'],
+                               c['magma_density'], rho_0, c['water_wt'], mass_flux])
+    return [ParsedOutput(headers[i], heights[i], tables[i]) for i in range(n)]
+
+
+def write_outputs(names, outputs, out_loc, shard_levels=0):
+    """Write runs as Plumeria output files (out_loc/Grid_Runs_out_<name>.txt, in shard subdirectories, see run_paths.py)."""
+    for name, output in zip(names, outputs):
+        with open(output_path(out_loc, name, shard_levels), 'w') as output_file:
+            output_file.write(format_output(*output))
+
+
+def iter_engine(jobs, out_loc, chunk_size=2000, shard_levels=0, **kwargs):
+    """
+    Integrate runs chunk by chunk and write their output files, the in-process counterpart of batch_executor.iter_batch().
+
+    Args:
+        jobs (iterable): (name, params) pairs, params holds the make_inp_file() arguments
+            (vent_diam, water_wt, magma_temp, vent_vel, humid, gas_frac), may be a generator.
+        out_loc (str): Output directory.
+        chunk_size (int): Runs integrated together, bounds the memory of the recorded profiles.
+        shard_levels (int): Hashed subdirectory levels of out_loc.
+        **kwargs: Passed to simulate().
+
+    Yields:
+        RunResult: One per run, wall_time is the chunk time divided among its runs.
+    """
+    jobs = iter(jobs)
+    while True:
+        chunk = [job for _, job in zip(range(chunk_size), jobs)]
+        if not chunk:
+            return
+        start = timer()
+        names = [name for name, _ in chunk]
+        params = {key: [p[key] for _, p in chunk] for key in chunk[0][1]}
+        error = None
+        try:
+            write_outputs(names, simulate(**params, **kwargs), out_loc, shard_levels)
+        except Exception as e:
+            error = f"Error integrating runs {names[0]} to {names[-1]}: {e}"
+        wall_time = (timer() - start) / len(chunk)
+        for name in names:
+            yield RunResult(name, 0 if error is None else 1, wall_time, False, error)
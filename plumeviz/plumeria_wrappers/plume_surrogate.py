@@ -0,0 +1,224 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Surrogate of the plume height, delta z and Ri built from extracted sweep results.
+
+The runs of a sweep are indexed in a KD-tree over (log10 mass flux, w, T, u, humidity), each
+feature scaled by its range in the data. A query takes the k nearest runs and returns their
+inverse-distance weighted mean and weighted standard deviation (the uncertainty) for every target,
+so heights are answered without running Plumeria or filtering the CSV. Queries are arrays, a
+query point costs a few microseconds (a million points in ~5 s on one core, the tree query uses
+all cores).
+
+A prediction is flagged as not reliable when
+    - its nearest run is further than max_distance (default: 3 times the median spacing of the
+      runs), the query is outside of the sweep
+    - its neighbours straddle a jump: their heights spread more than jump_km, or some of them have
+      Ri < 1 and some Ri > 1, i.e. the query sits on the collapse border
+
+Requires scipy (scipy.spatial.cKDTree). Surrogates are saved as .npz, the tree is rebuilt on load.
+
+Build from an extracted CSV, result store or cube:
+    python plume_surrogate.py plumeria_data/plume_values.csv [plumeria_data/plume_values_surrogate.npz]
+
+Usage:
+    surrogate = PlumeSurrogate.load('plumeria_data/plume_values_surrogate.npz')
+    df = surrogate.predict(mass_flux=[1e6, 1e8], w=0.1, T=900, u=100, humidity=0)
+'''
+
+import sys
+import json
+import os
+import numpy as np
+import pandas as pd
+from result_cube import DIM_ALIASES
+from derived_quantities import vent_equivalent, richardson, delta_z, reference_join
+from plume_dataset import PlumeDataset
+
+try:
+    from scipy.spatial import cKDTree  # only needed for the surrogate
+except ImportError:
+    cKDTree = None
+
+FEATURES = ['mass flux total (kg/s)', 'mass fraction water added', 'magma temperature (c)',
+            'initial velocity (m/s)', 'Relative humidity, %']
+LOG_FEATURES = ['mass flux total (kg/s)']
+TARGETS = ['calculated heigth (km)', 'delta z (km)', 'Ri']
+
+## short names accepted by predict()
+ALIASES = {**DIM_ALIASES, 'mass_flux': 'mass flux total (kg/s)'}
+
+BATCH_SIZE = 1_000_000
+
+
+def add_targets(df):
+    """
+    Add 'delta z (km)' and 'Ri' when an extract does not have them (the Main extractor only writes the raw columns).
+
+    Ri uses the vent equivalent diameter like batch_extract_plumeria_ouput_AUX.py (computed against the dry
+    mixture density of the same T, u and humidity if the extract does not have it), delta z is taken against
+    the run without external water of the same vent diameter, T, u and humidity.
+    """
+    df = df.copy()
+    if 'Ri' not in df:
+        vent_eq = df.get('vent equivalent init (m)')
+        if vent_eq is None:
+            rho_mix, w = df['mixture density (kg/m3)'], df['mass fraction water added']
+            keys = ['magma temperature (c)', 'initial velocity (m/s)', 'Relative humidity, %']
+            rho_dry = reference_join(df, keys, 'mixture density (kg/m3)', w == 0)
+            vent_eq = vent_equivalent(df['vent diameter (m)'], rho_mix, w, rho_dry)
+        df['Ri'] = richardson(df['mixture density (kg/m3)'], vent_eq, df['initial velocity (m/s)'])
+    if 'delta z (km)' not in df:
+        keys = ['vent diameter (m)', 'magma temperature (c)', 'initial velocity (m/s)', 'Relative humidity, %']
+        dry = reference_join(df, keys, 'calculated heigth (km)', df['mass fraction water added'] == 0)
+        df['delta z (km)'] = delta_z(df['calculated heigth (km)'], dry)
+    return df
+
+
+class PlumeSurrogate:
+    """k-nearest-neighbour emulator of sweep results."""
+
+    def __init__(self, features, targets, offset, scale, max_distance=None, k=8, jump_km=2.0,
+                 feature_names=FEATURES, target_names=TARGETS):
+        if cKDTree is None:
+            raise ImportError("scipy is needed for the plume surrogate")
+        self.features = np.asarray(features, dtype=np.float64)
+        self.targets = np.asarray(targets, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.feature_names = list(feature_names)
+        self.target_names = list(target_names)
+        self.k = min(k, len(self.features))
+        self.jump_km = jump_km
+        self._tree = cKDTree((self.features - self.offset) / self.scale)
+        if max_distance is None:
+            # 3 x the median distance between a run and its nearest other run
+            spacing = self._tree.query(self._tree.data, k=2)[0][:, 1] if len(self.features) > 1 else [1.]
+            max_distance = 3 * float(np.median(spacing))
+        self.max_distance = max_distance
+
+    def __len__(self):
+        return len(self.features)
+
+    @classmethod
+    def from_frame(cls, df, features=FEATURES, targets=TARGETS, **kwargs):
+        """
+        Build a surrogate from extracted results, runs with a missing feature or target are dropped.
+
+        Args:
+            df (DataFrame): Extracted data, delta z and Ri are added if missing (see add_targets()).
+            features (list): Feature columns, those in LOG_FEATURES are used as log10.
+            targets (list): Columns to predict.
+            **kwargs: k (neighbours), jump_km and max_distance, see the module docstring.
+        """
+        df = add_targets(df)
+        values = df[list(features) + list(targets)].apply(pd.to_numeric, errors='coerce')
+        values = values[np.isfinite(values).all(axis=1)]
+        x = _transform(values[list(features)].to_numpy(dtype=np.float64), features)
+        valid = np.isfinite(x).all(axis=1)
+        x, y = x[valid], values[list(targets)].to_numpy(dtype=np.float64)[valid]
+        if not len(x):
+            raise ValueError("No complete runs to build the surrogate from")
+        offset = x.min(axis=0)
+        scale = x.max(axis=0) - offset
+        scale[scale == 0] = 1.
+        return cls(x, y, offset, scale, feature_names=features, target_names=targets, **kwargs)
+
+    @classmethod
+    def from_path(cls, path, **kwargs):
+        """Build a surrogate from a CSV, result store or cube (read through PlumeDataset)."""
+        dataset = PlumeDataset(path)
+        needed = ['mixture density (kg/m3)', 'vent diameter (m)'] + FEATURES + TARGETS
+        columns = [c for c in dict.fromkeys(needed) if c in dataset.columns]
+        return cls.from_frame(dataset.read(columns, compact=False), **kwargs)
+
+    def predict(self, query=None, k=None, **aliases):
+        """
+        Predict the targets at query points.
+
+        Args:
+            query (DataFrame or dict): Feature columns by name, arrays or scalars (broadcast).
+            k (int, optional): Number of neighbours, defaults to the k of the surrogate.
+            **aliases: Features by short name: mass_flux, w, T, u, humidity.
+
+        Returns:
+            DataFrame: For every target its value and '<target> std', the distance to the nearest run
+                and 'reliable' (see the module docstring).
+        """
+        query = {**dict(query if query is not None else {}), **{ALIASES.get(a, a): v for a, v in aliases.items()}}
+        missing = [f for f in self.feature_names if f not in query]
+        if missing:
+            raise KeyError(f"Missing query features: {missing}")
+        columns = np.broadcast_arrays(*[np.asarray(query[f], dtype=np.float64) for f in self.feature_names])
+        x = _transform(np.column_stack([np.ravel(c) for c in columns]), self.feature_names)
+
+        k = min(k or self.k, len(self))
+        out = {name: np.empty(len(x)) for name in self.target_names}
+        out.update({f"{name} std": np.empty(len(x)) for name in self.target_names})
+        distance, reliable = np.empty(len(x)), np.empty(len(x), dtype=bool)
+        for start in range(0, len(x), BATCH_SIZE):
+            rows = slice(start, start + BATCH_SIZE)
+            d, i = self._tree.query((x[rows] - self.offset) / self.scale, k=k, workers=-1)
+            d, i = d.reshape(len(d), k), i.reshape(len(i), k)
+            weights = 1 / np.maximum(d, 1e-12)
+            weights /= weights.sum(axis=1, keepdims=True)
+            neighbours = self.targets[i]                                  # (n, k, targets)
+            mean = np.einsum('nk,nkt->nt', weights, neighbours)
+            std = np.sqrt(np.einsum('nk,nkt->nt', weights, (neighbours - mean[:, None, :])**2))
+            for j, name in enumerate(self.target_names):
+                out[name][rows], out[f"{name} std"][rows] = mean[:, j], std[:, j]
+            distance[rows] = d[:, 0]
+            reliable[rows] = (d[:, 0] <= self.max_distance) & ~self._straddles_jump(neighbours)
+
+        df = pd.DataFrame(out)
+        df['distance'] = distance
+        df['reliable'] = reliable
+        return df
+
+    def _straddles_jump(self, neighbours):
+        jump = np.zeros(len(neighbours), dtype=bool)
+        if 'calculated heigth (km)' in self.target_names:
+            z = neighbours[:, :, self.target_names.index('calculated heigth (km)')]
+            jump |= z.max(axis=1) - z.min(axis=1) > self.jump_km
+        if 'Ri' in self.target_names:
+            ri = neighbours[:, :, self.target_names.index('Ri')]
+            jump |= (ri < 1).any(axis=1) & (ri > 1).any(axis=1)
+        return jump
+
+    def save(self, path):
+        meta = {'feature_names': self.feature_names, 'target_names': self.target_names, 'k': self.k,
+                'jump_km': self.jump_km, 'max_distance': self.max_distance}
+        np.savez(path, features=self.features, targets=self.targets, offset=self.offset, scale=self.scale,
+                 meta=json.dumps(meta))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as npz:
+            meta = json.loads(str(npz['meta']))
+            return cls(npz['features'], npz['targets'], npz['offset'], npz['scale'], meta['max_distance'],
+                       meta['k'], meta['jump_km'], meta['feature_names'], meta['target_names'])
+
+
+def _transform(x, feature_names):
+    x = np.array(x, dtype=np.float64)
+    for j, name in enumerate(feature_names):
+        if name in LOG_FEATURES:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x[:, j] = np.log10(x[:, j])
+    return x
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        raise SystemExit('usage: python plume_surrogate.py results.csv [surrogate.npz]')
+    results_path = sys.argv[1].rstrip('/')
+    surrogate_path = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(results_path)[0] + '_surrogate.npz'
+    surrogate = PlumeSurrogate.from_path(results_path)
+    surrogate.save(surrogate_path)
+    print(f"Surrogate of {len(surrogate)} runs saved at {surrogate_path}")
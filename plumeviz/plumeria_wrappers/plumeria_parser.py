@@ -0,0 +1,195 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Single-pass parser for Plumeria v2.3.1 output files.
+
+Each file is read once as bytes and split into lines a single time, then parsed into
+    header  : the scalars at the top of the file (13 values, 10 for runs with a sounding file)
+    heights : calculated, Sparks et al. (1997) and Mastin et al. (2009) plume heights (km)
+    dz      : the full vertical profile as a (n, 17) float array, one row per height step
+
+Layout of an output file (line numbers as read by the extract and plot scripts):
+    0-6      preamble (0-4 for sounding runs)
+    7-19     'label: value' header lines (5-14 for sounding runs)
+    20-23    dz table title and column labels
+    24..-6   dz table rows
+    -5       blank line
+    -4..-2   'label = value km' plume heights
+    -1       closing line
+
+All extract and plot scripts go through parse_file()/read_row(), see bench_parser.py in
+plumeviz/benchmarks for the throughput against the old readlines() based readers.
+'''
+
+import numpy as np
+from collections import namedtuple
+
+HEADER_COLUMNS = ['Relative humidity, %', 'Air temperature at vent (C)', 'Air pressure  at vent, atm',
+                  'vent diameter (m)', 'vent elevation (m)', 'initial velocity (m/s)',
+                  'magma temperature (c)', 'weight fraction gas', 'magma specific heat (j/kg k)',
+                  'magma density (kg/m3)', 'mixture density (kg/m3)', 'mass fraction water added',
+                  'mass flux total (kg/s)']
+HEIGHT_COLUMNS = ['calculated heigth (km)', 'sparks heigth (km)', 'mastin et al 2009 height (km)']
+DZ_COLUMNS = ['inum', 'z', 'm_m', 'm_a', 'm_v', 'm_l', 'm_i', 'u', 'r', 'T_mix',
+              'T_air', 'rho_mix', 'rho_air', 'time', 'p_air', 'water', 'ice']
+
+## row written by the extractors: header + heights + first dz row
+ROW_COLUMNS = HEADER_COLUMNS + HEIGHT_COLUMNS + DZ_COLUMNS
+
+HEADER_START, HEADER_END = 7, 20
+SOUNDING_HEADER_START, SOUNDING_HEADER_END = 5, 15
+DZ_START = 24
+FOOTER_LENGTH = 5
+
+ParsedOutput = namedtuple('ParsedOutput', ['header', 'heights', 'dz'])
+
+
+def _value_after(line, sep):
+    try:
+        return float(line.split(sep, 1)[1].replace(b'km', b''))
+    except (IndexError, ValueError):
+        return np.nan
+
+
+def _parse_dz(rows, n_cols=len(DZ_COLUMNS)):
+    dz = np.full((len(rows), n_cols), np.nan)
+    if not rows:
+        return dz
+    tokens = b' '.join(rows).split()
+    try:
+        if len(tokens) == dz.size:
+            dz[:] = np.array(tokens, dtype=np.float64).reshape(dz.shape)
+            return dz
+    except ValueError:
+        pass
+    # slow path, ragged or corrupt rows: parse row by row and leave NaN where a row cannot be read
+    for i, row in enumerate(rows):
+        try:
+            values = np.array(row.split(), dtype=np.float64)[:n_cols]
+            dz[i, :len(values)] = values
+        except ValueError:
+            continue
+    return dz
+
+
+def parse_bytes(data, sounding=False, profile=True):
+    """
+    Parse the contents of an output file.
+
+    Args:
+        data (bytes): File contents.
+        sounding (bool): True for runs that used an atmospheric sounding file (shorter header).
+        profile (bool): Parse the whole dz table, if False only the first row is parsed.
+
+    Returns:
+        ParsedOutput: header and heights as float arrays (NaN where missing), dz as a (n, 17) array.
+    """
+    start, end = (SOUNDING_HEADER_START, SOUNDING_HEADER_END) if sounding else (HEADER_START, HEADER_END)
+    if profile:
+        lines = data.splitlines()
+        head, tail = lines[:DZ_START + 1], lines[-FOOTER_LENGTH:]
+        dz_rows = lines[DZ_START:len(lines) - FOOTER_LENGTH]
+    else:
+        # only the first 25 and last 5 lines are needed, splitting the whole dz table would dominate the cost
+        head = data.split(b'\n', DZ_START + 1)[:DZ_START + 1]
+        tail = data.rstrip(b'\r\n').rsplit(b'\n', FOOTER_LENGTH)[-FOOTER_LENGTH:]
+        dz_rows = head[DZ_START:DZ_START + 1]
+
+    header = np.full(end - start, np.nan)
+    for i, line in enumerate(head[start:end]):
+        header[i] = _value_after(line, b':')
+
+    heights = _footer_heights(tail) if len(head) > DZ_START else np.full(len(HEIGHT_COLUMNS), np.nan)
+    return ParsedOutput(header, heights, _parse_dz(dz_rows))
+
+
+def _footer_heights(tail):
+    heights = np.full(len(HEIGHT_COLUMNS), np.nan)
+    for i, line in enumerate(tail[1:4]):
+        heights[i] = _value_after(line, b'=')
+    return heights
+
+
+def footer_heights(data):
+    """Heights of the footer (last lines) of an output file, NaN where missing, the end of the file is enough."""
+    return _footer_heights(data.rstrip(b'\r\n').rsplit(b'\n', FOOTER_LENGTH)[-FOOTER_LENGTH:])
+
+
+def parse_file(path, sounding=False, profile=True):
+    """Read an output file in one call and parse it, see parse_bytes()."""
+    with open(path, 'rb') as output_file:
+        return parse_bytes(output_file.read(), sounding, profile)
+
+
+def summary_row(parsed):
+    """Header, heights and first dz row as one flat list, the row layout of the extracted CSV."""
+    first = parsed.dz[0] if len(parsed.dz) else np.full(len(DZ_COLUMNS), np.nan)
+    return np.concatenate([parsed.header, parsed.heights, first]).tolist()
+
+
+def read_row(path, expected_length=len(ROW_COLUMNS), sounding=False):
+    """
+    Read the extracted CSV row of one output file, filling missing or unreadable data with NaN.
+
+    Args:
+        path (str): Output file.
+        expected_length (int): 33 for the full row, 16 for header and heights only.
+        sounding (bool): True for runs that used a sounding file.
+
+    Returns:
+        list: expected_length values.
+    """
+    values_list = [np.nan] * expected_length
+    try:
+        values = summary_row(parse_file(path, sounding, profile=False))
+    except OSError as e:
+        print(f"Error reading or parsing file {path}: {e}")
+        return values_list
+    values_list[:min(expected_length, len(values))] = values[:expected_length]
+    return values_list
+
+
+def read_row_and_profile(path, expected_length=len(ROW_COLUMNS), sounding=False):
+    """Same as read_row() but also returns the full dz table (0 rows if the file cannot be read)."""
+    values_list = [np.nan] * expected_length
+    try:
+        parsed = parse_file(path, sounding)
+    except OSError as e:
+        print(f"Error reading or parsing file {path}: {e}")
+        return values_list, np.empty((0, len(DZ_COLUMNS)))
+    values = summary_row(parsed)
+    values_list[:min(expected_length, len(values))] = values[:expected_length]
+    return values_list, parsed.dz
+
+
+def read_calculated_height(path):
+    """Calculated plume height (km) of one output file, NaN if it cannot be read."""
+    try:
+        return parse_file(path, profile=False).heights[0]
+    except OSError:
+        return np.nan
+
+
+def format_output(header, heights, dz):
+    """
+    Write header, heights and dz table in the Plumeria output layout, the inverse of parse_bytes().
+
+    Used to build synthetic output files for benchmarks and the mock Plumeria executable.
+    """
+    lines = ['', ' Plumeria v2.3.1', ' 1-D model of a wet volcanic plume', '', ' Input values', '', '']
+    lines += [f" {label + ':':<40}{value:>14.6g}" for label, value in zip(HEADER_COLUMNS, header)]
+    lines += ['', ' Plume properties as a function of height above the vent',
+              ''.join(f"{label:>12}" for label in DZ_COLUMNS), '']
+    lines += [''.join(f"{value:>12.4e}" for value in row) for row in dz]
+    lines += ['',
+              f" calculated plume height = {heights[0]:10.3f} km",
+              f" Sparks et al. (1997) height = {heights[1]:10.3f} km",
+              f" Mastin et al. (2009) height = {heights[2]:10.3f} km",
+              ' Done']
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,134 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Low-overhead launching of Plumeria runs, the 'spawn' backend of batch_executor.py.
+
+The 'thread' backend calls subprocess.run on a pool thread for every run: the Popen machinery (error
+pipe, closing inherited descriptors) and one blocked thread per running child. iter_spawn() starts
+the runs with os.posix_spawn, which execs the child without copying the address space of the parent
+(vfork-style on Linux), keeps at most max_concurrent children alive and reaps them all from a single
+event loop: a pidfd per child on Linux, polling with os.wait4 elsewhere. Timed-out runs are killed
+from the same loop, no timer threads.
+
+Every RunResult also carries cpu_time, the user + system CPU time of the child (os.wait4), so
+wall_time - cpu_time is the time a run is not on a CPU: I/O waits and scheduling delays as well as
+spawn, exec and reaping latency. It bounds the launch cost from above, it does not measure it alone.
+batch_executor.summarize() prints it as "time not on CPU", see bench_launch.py in plumeviz/benchmarks
+for the launch cost itself (runs per second of a program that does no work).
+
+Usage:
+    results = run_batch(jobs, plumeria_loc, backend='spawn', n_workers=8)
+'''
+
+import os
+import signal
+import selectors
+import time
+from timeit import default_timer as timer
+from batch_executor import RunResult
+
+
+def _pidfd(pid):
+    """pidfd of a child, readable once it exits, None where pidfds are not available."""
+    try:
+        return os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return None
+
+
+def iter_spawn(jobs, plumeria_loc, max_concurrent=None, timeout=0.5, poll_interval=0.001):
+    """
+    Run a batch of PLUMERIA jobs with posix_spawn and yield a RunResult as each run finishes.
+
+    Args:
+        jobs (iterable): (name, input_path) pairs, may be a generator, read as slots become free.
+        plumeria_loc (str): Path to the Plumeria executable (looked up in PATH if it has no directory).
+        max_concurrent (int, optional): Maximum number of running children. Defaults to os.cpu_count().
+        timeout (float): Timeout per run in seconds, the child is killed after it.
+        poll_interval (float): Sleep between os.wait4 polls when pidfds are not available.
+
+    Yields:
+        RunResult: Results in completion order.
+    """
+    if not hasattr(os, 'posix_spawnp'):
+        raise OSError("posix_spawn is not available on this platform, use the 'thread' backend")
+    max_concurrent = max_concurrent or os.cpu_count() or 1
+    jobs = iter(jobs)
+    running = {}                         # pid -> (name, start, deadline, pidfd)
+    selector = selectors.DefaultSelector()
+    exhausted = False
+
+    def finish(pid, status, rusage, timed_out=False):
+        name, start, _, pidfd = running.pop(pid)
+        if pidfd is not None:
+            selector.unregister(pidfd)
+            os.close(pidfd)
+        if timed_out:
+            return RunResult(name, None, timer() - start, True, f"Execution of '{name}' timed out.",
+                             rusage.ru_utime + rusage.ru_stime)
+        returncode = os.waitstatus_to_exitcode(status)
+        return RunResult(name, returncode, timer() - start, False, None, rusage.ru_utime + rusage.ru_stime)
+
+    try:
+        while True:
+            # fill the free slots
+            while not exhausted and len(running) < max_concurrent:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                name, input_path = job
+                start = timer()
+                try:
+                    pid = os.posix_spawnp(plumeria_loc, [plumeria_loc, input_path], os.environ)
+                except OSError as e:
+                    yield RunResult(name, None, timer() - start, False, f"Error executing '{name}': {e}", None)
+                    continue
+                pidfd = _pidfd(pid)
+                if pidfd is not None:
+                    selector.register(pidfd, selectors.EVENT_READ, pid)
+                running[pid] = (name, start, start + timeout, pidfd)
+
+            if not running:
+                return
+
+            # wait for the first exit or the nearest deadline
+            wait = max(0., min(deadline for _, _, deadline, _ in running.values()) - timer())
+            if selector.get_map():
+                candidates = [key.data for key, _ in selector.select(wait)]
+                candidates += [pid for pid, (_, _, _, pidfd) in running.items() if pidfd is None]
+            else:
+                candidates = list(running)
+            n_done = 0
+            for pid in candidates:
+                reaped, status, rusage = os.wait4(pid, os.WNOHANG)
+                if reaped:
+                    n_done += 1
+                    yield finish(pid, status, rusage)
+
+            # kill the runs past their deadline
+            now = timer()
+            for pid in [pid for pid, (_, _, deadline, _) in running.items() if deadline <= now]:
+                os.kill(pid, signal.SIGKILL)
+                _, status, rusage = os.wait4(pid, 0)
+                yield finish(pid, status, rusage, timed_out=True)
+
+            if not n_done and not selector.get_map():
+                time.sleep(min(poll_interval, wait))
+    finally:
+        # generator closed early, do not leave children behind
+        for pid, (_, _, _, pidfd) in running.items():
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.wait4(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            if pidfd is not None:
+                os.close(pidfd)
+        selector.close()
@@ -0,0 +1,138 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Columnar store of the full dz vertical profiles of every run.
+
+The extractors only keep the first dz row in the CSV, this store keeps the rest of each profile
+so that profiles never have to be re-parsed from the text files. A store is a directory with
+    values.f32    every profile row of every run concatenated, float32, C order (n_rows x 17)
+    offsets.npy   int64, rows of run i are values[offsets[i]:offsets[i + 1]]
+    runs.npy      run (output file) names, same order as offsets
+    meta.json     column labels and number of rows
+
+values.f32 is opened with np.memmap, so loading the profiles of any subset of runs is a zero-copy
+slice of the mapped file. Runs that could not be read are stored with zero rows so the run order
+matches the rows of the extracted CSV.
+
+The index (offsets.npy, runs.npy, meta.json) is rewritten on every flush() and on close(), after the
+values it points to, each file through a temporary file and os.replace. Values appended after the last
+index write (a writer that died before close) are truncated when the store is reopened with append=True.
+
+Usage:
+    with ProfileStoreWriter('plumeria_data/plume_values_profiles') as writer:
+        writer.add('Grid_Runs_out_run1.txt', dz)
+
+    store = ProfileStore('plumeria_data/plume_values_profiles')
+    dz = store.profile('Grid_Runs_out_run1.txt')   # (n, 17) float32 view
+'''
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from plumeria_parser import DZ_COLUMNS
+
+
+class ProfileStoreWriter:
+    """Append profiles to a store, existing stores are extended when append=True."""
+
+    def __init__(self, store_dir, columns=DZ_COLUMNS, append=False):
+        self.store_dir = store_dir
+        self.columns = list(columns)
+        os.makedirs(store_dir, exist_ok=True)
+        existing = append and os.path.exists(os.path.join(store_dir, 'meta.json'))
+        if existing:
+            store = ProfileStore(store_dir)
+            self.runs = list(store.runs)
+            self.offsets = list(store.offsets)
+            del store   # releases the memmap before the values are truncated
+        else:
+            self.runs = []
+            self.offsets = [0]
+        self._values = open(os.path.join(store_dir, 'values.f32'), 'r+b' if existing else 'wb')
+        if existing:
+            # drop the values of runs added after the last index write, they are not indexed
+            self._values.truncate(self.offsets[-1] * len(self.columns) * np.dtype(np.float32).itemsize)
+            self._values.seek(0, os.SEEK_END)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, run, dz):
+        """Append the (n, len(columns)) profile of one run."""
+        dz = np.ascontiguousarray(dz, dtype=np.float32).reshape(-1, len(self.columns))
+        self._values.write(dz.tobytes())
+        self.runs.append(run)
+        self.offsets.append(self.offsets[-1] + len(dz))
+
+    def flush(self):
+        """Write the values added so far to disk, then the index that points to them."""
+        self._values.flush()
+        os.fsync(self._values.fileno())
+        self._replace('offsets.npy', lambda f: np.save(f, np.asarray(self.offsets, dtype=np.int64)))
+        self._replace('runs.npy', lambda f: np.save(f, np.asarray(self.runs, dtype=str)))
+        meta = {'columns': self.columns, 'dtype': 'float32', 'n_rows': int(self.offsets[-1])}
+        self._replace('meta.json', lambda f: f.write(json.dumps(meta).encode()))
+
+    def close(self):
+        self.flush()
+        self._values.close()
+
+    def _replace(self, name, write):
+        path = os.path.join(self.store_dir, name)
+        with open(path + '.tmp', 'wb') as f:
+            write(f)
+        os.replace(path + '.tmp', path)
+
+
+class ProfileStore:
+    """Read-only, memory-mapped view of a profile store."""
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, 'meta.json')) as meta:
+            meta = json.load(meta)
+        self.columns = meta['columns']
+        self.offsets = np.load(os.path.join(store_dir, 'offsets.npy'))
+        self.runs = np.load(os.path.join(store_dir, 'runs.npy'))
+        self.index = {run: i for i, run in enumerate(self.runs)}
+        n_rows = int(self.offsets[-1])
+        if n_rows:
+            self.values = np.memmap(os.path.join(store_dir, 'values.f32'), dtype=np.float32, mode='r',
+                                    shape=(n_rows, len(self.columns)))
+        else:
+            self.values = np.empty((0, len(self.columns)), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.runs)
+
+    def profile(self, run):
+        """Profile of one run (by name or position) as a zero-copy (n, n_columns) view."""
+        i = self.index[run] if isinstance(run, str) else run
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def profiles(self, runs):
+        """Profiles of several runs, list of views."""
+        return [self.profile(run) for run in runs]
+
+    def column(self, run, label):
+        """One column of a run's profile, e.g. store.column(run, 'z')."""
+        return self.profile(run)[:, self.columns.index(label)]
+
+    def to_frame(self, runs):
+        """Profiles of several runs as one long DataFrame with a 'run' column (copies the data)."""
+        frames = []
+        for run in runs:
+            df = pd.DataFrame(np.asarray(self.profile(run)), columns=self.columns)
+            df['run'] = run if isinstance(run, str) else self.runs[run]
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Content-addressed result cache for Plumeria runs.
+
+Every run is keyed by a hash of its canonical input deck plus the hash of the Plumeria executable,
+so the key does not depend on the order in which a grid is enumerated. Outputs are stored as
+Grid_Runs_out_<key>.txt in a result store (a plain directory), and a sweep only executes the keys
+that are not already in the store. Extending a grid by one water fraction then only runs the new points.
+
+The canonical deck drops comments, blank lines and the output file name line, and rewrites every
+numeric value with repr(float(value)) so that e.g. '0.', '0.0' and '0' hash the same.
+'''
+
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+from plumeria_parser import footer_heights
+from run_paths import output_path  # path of the output file of a run in the (flat or sharded) result store
+
+KEY_LENGTH = 24  # hex characters kept in run names, Plumeria reads file names into fixed-length strings
+_binary_hashes = {}  # (path, size, mtime) -> sha256 of the executable
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """Return the sha256 hex digest of a file, memoised on (path, size, mtime)."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _binary_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as binary:
+            for chunk in iter(lambda: binary.read(chunk_size), b''):
+                digest.update(chunk)
+        _binary_hashes[memo_key] = digest.hexdigest()
+    return _binary_hashes[memo_key]
+
+
+def _canonical_token(token):
+    try:
+        return repr(float(token))
+    except ValueError:
+        return token.lower()
+
+
+def canonical_deck(deck_text):
+    """
+    Reduce a rendered input deck to the values Plumeria actually reads.
+
+    The first value line (the output file name) is dropped since it only names the run.
+    """
+    values = []
+    for line in deck_text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line:
+            values.append(' '.join(_canonical_token(token) for token in line.split()))
+    return '\n'.join(values[1:])
+
+
+def run_key(deck_text, binary_hash):
+    """Return the cache key of a run: sha256 of the Plumeria binary hash and the canonical deck, truncated to KEY_LENGTH."""
+    digest = hashlib.sha256()
+    digest.update(binary_hash.encode())
+    digest.update(b'\n')
+    digest.update(canonical_deck(deck_text).encode())
+    return digest.hexdigest()[:KEY_LENGTH]
+
+
+def is_complete_output(path):
+    """
+    Check that an output file exists and ends with a readable calculated plume height.
+
+    Runs that timed out leave a truncated file without the heights at the bottom, those are not
+    counted as cached so they are executed again.
+    """
+    try:
+        with open(path, 'rb') as output_file:
+            output_file.seek(0, os.SEEK_END)
+            size = output_file.tell()
+            output_file.seek(max(0, size - 512))
+            tail = output_file.read()
+    except OSError:
+        return False
+    return bool(np.isfinite(footer_heights(tail)[0]))
+
+
+def is_cached(store_loc, key, shard_levels=0):
+    """True if the result store already holds a complete output for this key."""
+    return is_complete_output(output_path(store_loc, key, shard_levels))
+
+
+def completed_runs(csv_path):
+    """
+    Keys of the runs already extracted into a CSV (its 'run' column) with a plume height.
+
+    Sweeps that delete their raw outputs once parsed (scratch mode, delete_raw) check these instead of the store,
+    rows without a 'calculated heigth (km)' are not counted so those runs are executed again.
+    """
+    if not os.path.exists(csv_path):
+        return set()
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    if 'run' not in columns:
+        return set()
+    height = 'calculated heigth (km)'
+    df = pd.read_csv(csv_path, usecols=['run', height] if height in columns else ['run'])
+    if height in columns:
+        df = df.loc[np.isfinite(pd.to_numeric(df[height], errors='coerce'))]
+    runs = df['run'].dropna().astype(str)
+    return set(runs.str.replace(r'^Grid_Runs_out_|\.txt$', '', regex=True))
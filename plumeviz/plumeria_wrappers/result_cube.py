@@ -0,0 +1,192 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Labelled N-d cube of the extracted sweep results.
+
+The flat CSV is regridded on the sweep parameters, vent diameter x w x T x u x humidity by default,
+with one dense float array per numeric column and NaN where a run is missing. Coordinates are
+sorted and looked up through a dict, so selecting a (u, T) panel or a w slice is an O(1) index
+into the arrays and returns views, no scan of the table:
+
+    cube = ResultCube.load('plumeria_data/plume_values_cube.npz')
+    panel = cube.sel(u=100, T=900)              # cube over (d, w, humidity)
+    z = panel['calculated heigth (km)']         # view of the 3-d array
+    df = panel.to_frame()                       # long DataFrame of the runs in the panel
+
+Cubes are saved as .npz (NumPy only). If xarray is installed, to_xarray() returns an
+xarray.Dataset that can be written to NetCDF.
+'''
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+try:
+    import xarray as xr
+except ImportError:
+    xr = None
+
+DIMS = ['vent diameter (m)', 'mass fraction water added', 'magma temperature (c)',
+        'initial velocity (m/s)', 'Relative humidity, %']
+
+## short names accepted by sel()
+DIM_ALIASES = {'d': 'vent diameter (m)', 'w': 'mass fraction water added', 'T': 'magma temperature (c)',
+               'u': 'initial velocity (m/s)', 'humidity': 'Relative humidity, %'}
+
+
+class ResultCube:
+    """Dense arrays of the sweep variables over labelled sweep dimensions."""
+
+    def __init__(self, dims, coords, data, scalars=None):
+        self.dims = list(dims)
+        self.coords = {dim: np.asarray(coords[dim]) for dim in self.dims}
+        self.data = data
+        self.scalars = dict(scalars or {})  # coordinates fixed by sel()
+        self._index = {dim: {value: i for i, value in enumerate(self.coords[dim].tolist())} for dim in self.dims}
+
+    @classmethod
+    def from_frame(cls, df, dims=DIMS, variables=None, dtype=np.float64, max_cells=200_000_000):
+        """
+        Regrid an extracted DataFrame, rows with a missing coordinate are dropped and duplicate runs keep the first row.
+
+        Args:
+            df (DataFrame): Extracted data.
+            dims (list): Sweep parameter columns.
+            variables (list): Columns to keep, default every other numeric column.
+            dtype: Data type of the arrays, float32 halves the memory.
+            max_cells (int): Refuse to build cubes with more cells than this over all variables together
+                (e.g. irregular adaptive sweeps).
+        """
+        dims = list(dims)
+        df = df.dropna(subset=dims).drop_duplicates(subset=dims, keep='first')
+        if variables is None:
+            variables = [c for c in df.select_dtypes(include='number').columns if c not in dims]
+
+        coords, codes = {}, []
+        for dim in dims:
+            coords[dim], code = np.unique(df[dim].to_numpy(), return_inverse=True)
+            codes.append(code)
+        shape = tuple(len(coords[dim]) for dim in dims)
+        n_cells = int(np.prod(shape))
+        if n_cells * len(variables) > max_cells:
+            raise ValueError(f"Cube of shape {shape} x {len(variables)} variables has {n_cells * len(variables)} cells "
+                             f"for {len(df)} runs, the sweep is not a grid or has too many variables")
+
+        flat_index = np.ravel_multi_index(codes, shape)
+        data = {}
+        for variable in variables:
+            values = np.full(n_cells, np.nan, dtype=dtype)
+            values[flat_index] = df[variable].to_numpy(dtype=dtype)
+            data[variable] = values.reshape(shape)
+        return cls(dims, coords, data)
+
+    def __getitem__(self, variable):
+        return self.data[variable]
+
+    @property
+    def shape(self):
+        return tuple(len(self.coords[dim]) for dim in self.dims)
+
+    def _dim(self, name):
+        return DIM_ALIASES.get(name, name)
+
+    def sel(self, selection=None, **kwargs):
+        """
+        Select single coordinate values, by full column name (selection dict) or short name (kwargs).
+
+        Returns:
+            ResultCube: cube over the remaining dims, its arrays are views of this cube's arrays.
+
+        Raises:
+            KeyError: if a value is not a coordinate of the cube.
+        """
+        selection = {self._dim(k): v for k, v in {**(selection or {}), **kwargs}.items()}
+        key = tuple(self._index[dim][selection[dim]] if dim in selection else slice(None) for dim in self.dims)
+        dims = [dim for dim in self.dims if dim not in selection]
+        return ResultCube(dims, self.coords, {variable: values[key] for variable, values in self.data.items()},
+                          {**self.scalars, **selection})
+
+    def to_frame(self, dropna=True, variables=None):
+        """
+        Long DataFrame with one row per cell, selected coordinates as constant columns. All-NaN cells are dropped.
+
+        Args:
+            variables (list, optional): Variables to convert, default all of them.
+        """
+        data = self.data if variables is None else {variable: self.data[variable] for variable in variables}
+        grids = np.meshgrid(*[self.coords[dim] for dim in self.dims], indexing='ij')
+        df = pd.DataFrame({dim: grid.ravel() for dim, grid in zip(self.dims, grids)})
+        for dim, value in self.scalars.items():
+            df[dim] = value
+        for variable, values in data.items():
+            df[variable] = values.ravel()
+        if dropna:
+            df = df.dropna(subset=list(data), how='all').reset_index(drop=True)
+        return df
+
+    def to_xarray(self):
+        """The cube as an xarray.Dataset (requires xarray)."""
+        if xr is None:
+            raise ImportError("xarray is not installed, use save() or to_frame()")
+        return xr.Dataset({variable: (self.dims, values) for variable, values in self.data.items()},
+                          coords={dim: self.coords[dim] for dim in self.dims})
+
+    def save(self, path):
+        """Save to a .npz file."""
+        arrays = {f"coord_{i}": self.coords[dim] for i, dim in enumerate(self.dims)}
+        arrays.update({f"var_{i}": values for i, values in enumerate(self.data.values())})
+        meta = json.dumps({'dims': self.dims, 'variables': list(self.data)})
+        np.savez(path, meta=np.array(meta), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Load a cube saved with save()."""
+        with np.load(path) as npz:
+            meta = json.loads(str(npz['meta']))
+            coords = {dim: npz[f"coord_{i}"] for i, dim in enumerate(meta['dims'])}
+            data = {variable: npz[f"var_{i}"] for i, variable in enumerate(meta['variables'])}
+        return cls(meta['dims'], coords, data)
+
+
+def update_cube(df, cube_path, dims=DIMS):
+    """
+    Add the rows of df (e.g. newly extracted runs) to a saved cube without reading the whole dataset.
+
+    Rows whose coordinates are all on the cube's grid are written into its arrays, new rows replace old
+    values. Otherwise the cube is regridded from its own cells plus df. Without a saved cube df is saved.
+    """
+    if not os.path.exists(cube_path):
+        return save_cube(df, cube_path, dims)
+    cube = ResultCube.load(cube_path)
+    dims = list(dims)
+    df = df.dropna(subset=dims).drop_duplicates(subset=dims, keep='last')
+    variables = [c for c in df.select_dtypes(include='number').columns if c not in dims]
+    on_grid = (cube.dims == dims and set(variables) <= set(cube.data)
+               and all(df[dim].isin(cube.coords[dim]).all() for dim in dims))
+    if not on_grid:
+        # new rows first, from_frame() keeps the first of duplicate runs
+        return save_cube(pd.concat([df, cube.to_frame()], ignore_index=True), cube_path, dims)
+
+    key = tuple(np.searchsorted(cube.coords[dim], df[dim].to_numpy()) for dim in dims)
+    for variable in variables:
+        cube.data[variable][key] = df[variable].to_numpy(dtype=cube.data[variable].dtype)
+    cube.save(cube_path)
+    return cube
+
+
+def save_cube(df, cube_path, dims=DIMS):
+    """Regrid df and save it, sweeps that are not a grid are reported and skipped."""
+    try:
+        cube = ResultCube.from_frame(df, dims)
+    except ValueError as e:
+        print(f"No result cube saved: {e}")
+        return None
+    cube.save(cube_path)
+    return cube
@@ -0,0 +1,289 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Binary columnar format for extracted results.
+
+A result store is a directory (by convention named *.plume) with
+    meta.json     column directory: name, kind and dtype of every column, number of rows, chunk
+                  size and min/max of every numeric column per chunk
+    <i>.bin       raw little-endian values of column i, opened with np.memmap
+    <i>.json      categories of a string column (e.g. the run file names), the .bin holds int32 codes
+
+Numeric columns are stored as float32, except the sweep dimensions (result_cube.DIMS), which stay
+float64 so that equality filters such as w == 0.07 are exact. String columns are stored once as
+categories with integer codes, instead of repeating the run name on every row of the CSV.
+
+Opening a store only reads meta.json, columns are mapped on first use. read() skips every chunk
+whose min/max cannot pass the filters and only copies the requested columns of the rows that do.
+
+Convert an existing CSV (in chunks, so the CSV never has to fit in memory):
+    python result_store.py plumeria_data/plume_values.csv [plumeria_data/plume_values.plume]
+
+Usage:
+    store = ResultStore('plumeria_data/plume_values.plume')
+    z = store.column('calculated heigth (km)')                # np.memmap, no copy
+    df = store.read(['mass flux (kg/s)', 'calculated heigth (km)'],
+                    filters={'initial velocity (m/s)': 100, 'magma temperature (c)': 900})
+'''
+
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+from result_cube import DIMS
+
+CHUNK_ROWS = 1_000_000
+
+
+class ResultStoreWriter:
+    """
+    Write DataFrames to a result store, append() can be called for every chunk of a large result.
+
+    With append=True the rows are added to an existing store (its columns and categories are kept), values
+    written after its meta.json (a writer that died before close) are dropped.
+
+    The kind of every column (numeric or category) is taken from the dtypes of the first append(), a later
+    value that is not a number in a numeric column raises ValueError instead of being stored as NaN.
+    """
+
+    def __init__(self, store_dir, chunk_rows=CHUNK_ROWS, float64_columns=DIMS, append=False):
+        self.store_dir = store_dir
+        self.chunk_rows = chunk_rows
+        self.float64_columns = set(float64_columns)
+        self.columns = None     # column directory, fixed by the first append()
+        self.chunks = []        # per chunk: number of rows and {column: [min, max]}
+        self.n_rows = 0
+        self._files = []
+        self._categories = []
+        os.makedirs(store_dir, exist_ok=True)
+        if append and os.path.exists(os.path.join(store_dir, 'meta.json')):
+            self._reopen()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _init_columns(self, df):
+        self.columns = []
+        for i, name in enumerate(df.columns):
+            if pd.api.types.is_numeric_dtype(df[name]) or pd.api.types.is_bool_dtype(df[name]):
+                dtype = 'float64' if name in self.float64_columns else 'float32'
+                self.columns.append({'name': name, 'kind': 'numeric', 'dtype': dtype})
+                self._categories.append(None)
+            else:
+                self.columns.append({'name': name, 'kind': 'category', 'dtype': 'int32'})
+                self._categories.append({})
+            self._files.append(open(os.path.join(self.store_dir, f"{i}.bin"), 'wb'))
+
+    def _reopen(self):
+        with open(os.path.join(self.store_dir, 'meta.json')) as meta:
+            meta = json.load(meta)
+        self.columns, self.chunks, self.n_rows = meta['columns'], meta['chunks'], meta['n_rows']
+        for i, column in enumerate(self.columns):
+            categories = None
+            if column['kind'] == 'category':
+                with open(os.path.join(self.store_dir, f"{i}.json")) as category_file:
+                    categories = {value: code for code, value in enumerate(json.load(category_file))}
+            self._categories.append(categories)
+            file = open(os.path.join(self.store_dir, f"{i}.bin"), 'r+b')
+            file.truncate(self.n_rows * np.dtype(column['dtype']).itemsize)
+            file.seek(0, os.SEEK_END)
+            self._files.append(file)
+
+    def append(self, df):
+        """Append the rows of df, its columns must match those of the first append()."""
+        if self.columns is None:
+            self._init_columns(df)
+        elif list(df.columns) != [column['name'] for column in self.columns]:
+            raise ValueError(f"Columns do not match the store {self.store_dir}")
+        for start in range(0, len(df), self.chunk_rows):
+            self._write_chunk(df.iloc[start:start + self.chunk_rows])
+
+    def _write_chunk(self, df):
+        stats = {}
+        for column, categories, file in zip(self.columns, self._categories, self._files):
+            values = df[column['name']]
+            if column['kind'] == 'numeric':
+                numeric = pd.to_numeric(values, errors='coerce')
+                invalid = numeric.isna() & values.notna()
+                if invalid.any():
+                    raise ValueError(f"Column '{column['name']}' of {self.store_dir} is numeric, "
+                                     f"got {values[invalid].iloc[0]!r}")
+                values = numeric.to_numpy(dtype=column['dtype'])
+                if np.isfinite(values).any():
+                    stats[column['name']] = [float(np.nanmin(values)), float(np.nanmax(values))]
+            else:
+                for value in pd.unique(values):
+                    if not pd.isna(value) and value not in categories:
+                        categories[value] = len(categories)
+                values = values.map(categories).fillna(-1).to_numpy(dtype=np.int32)
+            file.write(np.ascontiguousarray(values).tobytes())
+        self.chunks.append({'rows': len(df), 'stats': stats})
+        self.n_rows += len(df)
+
+    def close(self):
+        for file in self._files:
+            file.close()
+        for i, categories in enumerate(self._categories):
+            if categories is not None:
+                with open(os.path.join(self.store_dir, f"{i}.json"), 'w') as category_file:
+                    json.dump([_to_json(value) for value in categories], category_file)
+        with open(os.path.join(self.store_dir, 'meta.json'), 'w') as meta:
+            json.dump({'n_rows': self.n_rows, 'chunk_rows': self.chunk_rows,
+                       'columns': self.columns or [], 'chunks': self.chunks}, meta)
+
+
+def _to_json(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class ResultStore:
+    """Memory-mapped, read-only view of a result store."""
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, 'meta.json')) as meta:
+            meta = json.load(meta)
+        self.n_rows = meta['n_rows']
+        self.chunks = meta['chunks']
+        self._directory = {column['name']: (i, column) for i, column in enumerate(meta['columns'])}
+        self.columns = list(self._directory)
+        self._mapped = {}
+
+    def __len__(self):
+        return self.n_rows
+
+    def _map(self, name):
+        if name not in self._mapped:
+            i, column = self._directory[name]
+            path = os.path.join(self.store_dir, f"{i}.bin")
+            values = (np.memmap(path, dtype=column['dtype'], mode='r', shape=(self.n_rows,)) if self.n_rows
+                      else np.empty(0, dtype=column['dtype']))
+            categories = None
+            if column['kind'] == 'category':
+                with open(os.path.join(self.store_dir, f"{i}.json")) as category_file:
+                    categories = json.load(category_file)
+            self._mapped[name] = (values, categories)
+        return self._mapped[name]
+
+    def codes(self, name):
+        """Integer codes of a string column (-1 for missing) and its categories."""
+        return self._map(name)
+
+    def column(self, name, rows=slice(None)):
+        """A column as an array, numeric columns are zero-copy memmap views."""
+        values, categories = self._map(name)
+        if categories is None:
+            return values[rows]
+        return pd.Categorical.from_codes(np.asarray(values[rows]), categories=categories)
+
+    def _chunk_can_match(self, chunk, filters):
+        for column, op, value in filters:
+            if column not in chunk['stats']:
+                if self._directory[column][1]['kind'] == 'numeric':
+                    return False  # only NaN in this chunk
+                continue
+            lo, hi = chunk['stats'][column]
+            if op == '==' and not lo <= value <= hi:
+                return False
+            if op == 'in' and not any(lo <= v <= hi for v in value):
+                return False
+            if op == 'range' and ((value[0] is not None and hi < value[0]) or (value[1] is not None and lo >= value[1])):
+                return False
+        return True
+
+    def _chunk_mask(self, rows, filters):
+        mask = np.ones(rows.stop - rows.start, dtype=bool)
+        for column, op, value in filters:
+            values = self.column(column, rows)
+            if isinstance(values, pd.Categorical):
+                values = pd.Series(values)
+            if op == '==':
+                mask &= np.asarray(values == value)
+            elif op == 'in':
+                mask &= np.asarray(pd.Series(values).isin(value))
+            else:
+                if value[0] is not None:
+                    mask &= np.asarray(values >= value[0])
+                if value[1] is not None:
+                    mask &= np.asarray(values < value[1])
+        return mask
+
+    def read(self, columns=None, filters=()):
+        """
+        Copy the requested columns of the rows that pass the filters into a DataFrame.
+
+        Args:
+            columns (list): Columns, None for all.
+            filters: (column, op, value) triples, op is '==', 'in' or 'range' (value (lo, hi), lo <= x < hi),
+                or a {column: value} dict of equality filters.
+        """
+        if isinstance(filters, dict):
+            filters = [(column, '==', value) for column, value in filters.items()]
+        columns = self.columns if columns is None else list(columns)
+        missing = [c for c in columns + [f[0] for f in filters] if c not in self._directory]
+        if missing:
+            raise KeyError(f"Columns not in {self.store_dir}: {missing}")
+
+        parts = {column: [] for column in columns}
+        start = 0
+        for chunk in self.chunks:
+            rows = slice(start, start + chunk['rows'])
+            start = rows.stop
+            if not self._chunk_can_match(chunk, filters):
+                continue
+            mask = self._chunk_mask(rows, filters) if filters else None
+            for column in columns:
+                values, _ = self._map(column)
+                values = values[rows]
+                parts[column].append(np.asarray(values if mask is None else values[mask]))
+
+        data = {}
+        for column in columns:
+            values, categories = self._map(column)
+            values = np.concatenate(parts[column]) if parts[column] else np.empty(0, dtype=values.dtype)
+            data[column] = values if categories is None else pd.Categorical.from_codes(values, categories=categories)
+        return pd.DataFrame(data, columns=columns)
+
+    def to_frame(self):
+        """The whole store as a DataFrame."""
+        return self.read()
+
+
+def convert_csv(csv_path, store_dir=None, chunk_rows=CHUNK_ROWS):
+    """
+    Convert an extracted results CSV to a result store, the CSV is read chunk_rows rows at a time.
+
+    A first pass finds the columns that are numeric in every chunk, the others are read as strings, so the
+    column kinds do not depend on the first chunk (e.g. a string column that is empty in the first rows).
+
+    Returns:
+        str: The store directory (csv_path with a .plume extension by default).
+    """
+    store_dir = store_dir or os.path.splitext(csv_path)[0] + '.plume'
+    numeric = None
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+        kinds = {name: pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values)
+                 for name, values in chunk.items()}
+        numeric = kinds if numeric is None else {name: numeric[name] and kinds[name] for name in numeric}
+    dtypes = {name: object for name, is_numeric in (numeric or {}).items() if not is_numeric}
+    with ResultStoreWriter(store_dir, chunk_rows) as writer:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=dtypes):
+            writer.append(chunk)
+    return store_dir
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        raise SystemExit('usage: python result_store.py results.csv [results.plume]')
+    store_dir = convert_csv(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Done, {len(ResultStore(store_dir))} rows saved at {store_dir}")
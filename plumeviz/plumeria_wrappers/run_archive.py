@@ -0,0 +1,296 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Indexed archives of raw Plumeria run files.
+
+A finished sweep leaves millions of small Grid_Runs_out_*.txt (and Grid_Runs_in_*.txt) files, which
+exhaust inode quotas and slow down backups. compact() packs them into an archive directory (by
+convention named *.pvar) with
+    pack_<i>.bin    zlib-compressed files appended one after the other, a new pack is started
+                    every pack_size bytes
+    index.csv       run -> pack, offset, compressed length, size and crc32 of the uncompressed
+                    contents, one line per packed file
+
+Every file is compressed on its own, so a single run is read back with one seek and one decompress
+(RunArchive.read/parse), without unpacking anything else. Level 6 shrinks the outputs about 3.5x,
+decompressing them costs about a third of the parse time; level 0 stores them uncompressed for the
+fastest bulk extraction (still a few files instead of millions). Packs and index are append-only:
+compacting again adds the new and rewritten files (compared by size and crc32), and a run packed
+twice resolves to its last entry.
+
+Bulk extraction (RunArchive.extract_rows) reads each pack sequentially on a process pool instead of
+opening every loose file, see bench_archive.py in plumeviz/benchmarks.
+
+Compact a sweep (loose files are only deleted with --delete, after the index is written):
+    python run_archive.py out_TEST [out_TEST.pvar] [--inputs inp_TEST] [--level 6] [--delete]
+
+Usage:
+    archive = RunArchive('out_TEST.pvar')
+    parsed = archive.parse('Grid_Runs_out_run1.txt')     # plumeria_parser.ParsedOutput
+'''
+
+import os
+import sys
+import csv
+import zlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from plumeria_parser import ROW_COLUMNS, DZ_COLUMNS, parse_bytes, summary_row
+from run_paths import scan_files
+
+PACK_SIZE = 1 << 30          # bytes per pack file
+INDEX_COLUMNS = ['run', 'pack', 'offset', 'length', 'size', 'crc32']
+
+
+def _pack_name(pack):
+    return f"pack_{pack:05d}.bin"
+
+
+def is_archive(path):
+    return os.path.isfile(os.path.join(path, 'index.csv'))
+
+
+class ArchiveWriter:
+    """Append files to an archive, the index is written at every flush and on close()."""
+
+    def __init__(self, archive_dir, pack_size=PACK_SIZE, level=6, flush_every=10000):
+        self.archive_dir = archive_dir
+        self.pack_size = pack_size
+        self.level = level
+        self.flush_every = flush_every
+        self.n_files = 0
+        self._entries = []
+        os.makedirs(archive_dir, exist_ok=True)
+        self._index_path = os.path.join(archive_dir, 'index.csv')
+        _upgrade_index(self._index_path)
+        self.pack = 0
+        while os.path.exists(os.path.join(archive_dir, _pack_name(self.pack + 1))):
+            self.pack += 1
+        self._open_pack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open_pack(self):
+        self._file = open(os.path.join(self.archive_dir, _pack_name(self.pack)), 'ab')
+        self._file.seek(0, os.SEEK_END)
+
+    def add(self, run, data):
+        """Append the contents (bytes) of one file under the name run."""
+        if self._file.tell() >= self.pack_size:
+            self._file.close()
+            self.pack += 1
+            self._open_pack()
+        compressed = zlib.compress(data, self.level)
+        self._entries.append((run, self.pack, self._file.tell(), len(compressed), len(data), zlib.crc32(data)))
+        self._file.write(compressed)
+        self.n_files += 1
+        if len(self._entries) >= self.flush_every:
+            self.flush()
+
+    def add_file(self, path, run=None):
+        with open(path, 'rb') as run_file:
+            self.add(run or os.path.basename(path), run_file.read())
+
+    def flush(self):
+        """Write the packed data to disk, then its index lines (an entry never points to unwritten data)."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        new_index = not os.path.exists(self._index_path)
+        with open(self._index_path, 'a', newline='') as index_file:
+            writer = csv.writer(index_file)
+            if new_index:
+                writer.writerow(INDEX_COLUMNS)
+            writer.writerows(self._entries)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        self._entries = []
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class RunArchive:
+    """Random access to the files of an archive."""
+
+    def __init__(self, archive_dir):
+        if not is_archive(archive_dir):
+            raise FileNotFoundError(f"No archive index in {archive_dir}")
+        self.archive_dir = archive_dir
+        index = pd.read_csv(os.path.join(archive_dir, 'index.csv'))
+        if 'crc32' not in index:
+            index['crc32'] = np.nan     # archives packed before the crc32 column
+        self.index = index.drop_duplicates('run', keep='last').set_index('run')
+        self._lookup = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, run):
+        return run in self.index.index
+
+    @property
+    def runs(self):
+        return list(self.index.index)
+
+    def manifest(self):
+        """{run: (size, pack offset)}, the archive counterpart of the file manifest of parallel_extract.scan_changes()."""
+        return {run: (int(size), int(offset)) for run, size, offset
+                in zip(self.index.index, self.index['size'], self.index['offset'])}
+
+    def crc32(self, run):
+        """crc32 of the uncompressed contents of one file, computed from the data for entries indexed without it."""
+        crc = self.index.at[run, 'crc32']
+        return int(crc) if pd.notna(crc) else zlib.crc32(self.read(run))
+
+    def read(self, run):
+        """Uncompressed contents of one file."""
+        if self._lookup is None:
+            self._lookup = dict(zip(self.index.index, zip(self.index['pack'], self.index['offset'], self.index['length'])))
+        pack, offset, length = self._lookup[run]
+        with open(os.path.join(self.archive_dir, _pack_name(pack)), 'rb') as pack_file:
+            pack_file.seek(offset)
+            return zlib.decompress(pack_file.read(length))
+
+    def parse(self, run, sounding=False, profile=True):
+        """Parse one output file, see plumeria_parser.parse_bytes()."""
+        return parse_bytes(self.read(run), sounding, profile)
+
+    def extract_rows(self, runs=None, expected_length=len(ROW_COLUMNS), n_workers=None, chunk_size=2000,
+                     sounding=False, profiles=False):
+        """
+        Extracted CSV rows of the archived output files, the archive counterpart of parallel_extract.extract_rows().
+
+        Args:
+            runs (list): Runs to extract, None for every output file (Grid_Runs_out_*) in the archive.
+
+        Returns:
+            tuple: (rows, dzs), in the order of runs, dzs is None if profiles is False.
+        """
+        if runs is None:
+            runs = [run for run in self.index.index if run.startswith('Grid_Runs_out_')]
+        entries = self.index.loc[list(runs), ['pack', 'offset', 'length']]
+        entries['order'] = np.arange(len(entries))
+        entries = entries.sort_values(['pack', 'offset'])   # sequential reads within each pack
+
+        tasks = []
+        for pack, group in entries.groupby('pack', sort=True):
+            path = os.path.join(self.archive_dir, _pack_name(pack))
+            records = list(zip(group['order'], group['offset'], group['length']))
+            tasks += [(path, records[i:i + chunk_size]) for i in range(0, len(records), chunk_size)]
+
+        n_workers = n_workers or os.cpu_count()
+        args = [expected_length, sounding, profiles]
+        if n_workers == 1 or len(tasks) <= 1:
+            results = [_extract_records(path, records, *args) for path, records in tasks]
+        else:
+            n = len(tasks)
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(_extract_records, *zip(*tasks), *[[a] * n for a in args]))
+
+        rows, dzs = [None] * len(entries), [None] * len(entries)
+        for orders, chunk_rows, chunk_dzs in results:
+            for i, order in enumerate(orders):
+                rows[order] = chunk_rows[i]
+                if profiles:
+                    dzs[order] = chunk_dzs[i]
+        return rows, (dzs if profiles else None)
+
+
+def _extract_records(path, records, expected_length, sounding, profiles):
+    orders, rows, dzs = [], [], []
+    with open(path, 'rb') as pack_file:
+        for order, offset, length in records:
+            values_list = [np.nan] * expected_length
+            dz = np.empty((0, len(DZ_COLUMNS)), dtype=np.float32)
+            try:
+                pack_file.seek(offset)
+                parsed = parse_bytes(zlib.decompress(pack_file.read(length)), sounding, profiles)
+                values = summary_row(parsed)
+                values_list[:min(expected_length, len(values))] = values[:expected_length]
+                dz = parsed.dz.astype(np.float32)
+            except (OSError, zlib.error) as e:
+                print(f"Error reading record at {offset} of {path}: {e}")
+            orders.append(order)
+            rows.append(values_list)
+            dzs.append(dz)
+    return orders, rows, (dzs if profiles else None)
+
+
+def _upgrade_index(index_path):
+    """Add an empty crc32 column to an index written before the column existed."""
+    if not os.path.exists(index_path):
+        return
+    with open(index_path, newline='') as index_file:
+        header = next(csv.reader(index_file), None)
+    if header is None or header == INDEX_COLUMNS:
+        return
+    index = pd.read_csv(index_path)
+    index['crc32'] = pd.Series(dtype='Int64')
+    index[INDEX_COLUMNS].to_csv(index_path + '.tmp', index=False)
+    os.replace(index_path + '.tmp', index_path)
+
+
+def compact(out_loc, archive_dir=None, dir_loc=None, delete=False, pack_size=PACK_SIZE, level=6):
+    """
+    Pack the output files of a sweep (and its input decks) into an archive.
+
+    Files already in the archive with the same size and crc32 are skipped, so compact() can run after
+    every sweep; a file rewritten since it was packed is packed again.
+
+    Args:
+        out_loc (str): Output directory, flat or sharded.
+        archive_dir (str, optional): Archive, defaults to out_loc + '.pvar'.
+        dir_loc (str, optional): Input deck directory, its decks are packed too.
+        delete (bool): Delete the loose files once they are in the archive.
+        level (int): zlib compression level, 0 stores the files uncompressed.
+
+    Returns:
+        str: The archive directory.
+    """
+    archive_dir = archive_dir or out_loc.rstrip('/') + '.pvar'
+    archive = RunArchive(archive_dir) if is_archive(archive_dir) else None
+    packed_files = []
+    with ArchiveWriter(archive_dir, pack_size, level) as writer:
+        for directory in [out_loc] + ([dir_loc] if dir_loc else []):
+            for _, entry in scan_files(directory):
+                with open(entry.path, 'rb') as run_file:
+                    data = run_file.read()
+                # only identical contents count as archived, a rerun can rewrite a file with the same size
+                if not (archive is not None and entry.name in archive
+                        and archive.index.at[entry.name, 'size'] == len(data)
+                        and archive.crc32(entry.name) == zlib.crc32(data)):
+                    writer.add(entry.name, data)
+                packed_files.append(entry.path)
+        n_added = writer.n_files
+
+    if delete:
+        for path in packed_files:
+            os.remove(path)
+    print(f"{n_added} files added to {archive_dir}, {len(packed_files) - n_added} already archived"
+          + (f", {len(packed_files)} loose files deleted" if delete else ''))
+    return archive_dir
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not args:
+        raise SystemExit('usage: python run_archive.py out_dir [archive.pvar] [--inputs inp_dir] [--level 6] [--delete]')
+    options = {}
+    for option in ['--inputs', '--level']:
+        if option in sys.argv:
+            options[option] = sys.argv[sys.argv.index(option) + 1]
+            args.remove(options[option])
+    compact(args[0], args[1] if len(args) > 1 else None, options.get('--inputs'), delete='--delete' in sys.argv,
+            level=int(options.get('--level', 6)))
@@ -0,0 +1,84 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Layout of the per-run input and output files.
+
+With a million runs, one flat dir_loc and out_loc make every file creation and os.listdir slow on
+shared filesystems. Two options, set in input_parameters.py:
+
+shard_levels    files go to hashed subdirectories, 256 per level (md5 of the run name, two hex
+                characters per level): out_TEST/3f/Grid_Runs_out_run1.txt. One level keeps a
+                million runs at ~4000 files per directory. The subdirectories are created once
+                by make_shards(), scan_files() walks them.
+scratch_mode    input and output files are staged in a directory of scratch_root (/dev/shm, RAM
+                backed on Linux), every run is parsed into the persistent CSV and profile store as
+                it finishes (streaming_pipeline.py) and its files are deleted, so only the compacted
+                results reach the shared filesystem. The scratch directory name is derived from
+                out_loc so an interrupted sweep finds its files again.
+
+Plumeria reads file names into fixed-length strings, which is why shard and scratch names are short.
+'''
+
+import os
+import hashlib
+import tempfile
+
+SHARD_WIDTH = 2  # hex characters per level, 256 subdirectories
+
+
+def shard(name, levels):
+    """Relative shard directory of a run ('' for levels=0)."""
+    if not levels:
+        return ''
+    digest = hashlib.md5(name.encode()).hexdigest()
+    return os.path.join(*(digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(levels)))
+
+
+def input_path(dir_loc, name, levels=0):
+    return os.path.join(dir_loc, shard(name, levels), f"Grid_Runs_in_{name}.txt")
+
+
+def output_path(out_loc, name, levels=0):
+    return os.path.join(out_loc, shard(name, levels), f"Grid_Runs_out_{name}.txt")
+
+
+def make_shards(directory, levels):
+    """Create directory and all of its shard subdirectories."""
+    os.makedirs(directory, exist_ok=True)
+    if levels:
+        for i in range(16**SHARD_WIDTH):
+            make_shards(os.path.join(directory, f"{i:0{SHARD_WIDTH}x}"), levels - 1)
+
+
+def scan_files(directory, suffix='.txt'):
+    """
+    Walk a flat or sharded run directory.
+
+    Yields:
+        tuple: (path relative to directory, os.DirEntry) of every file ending with suffix.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                for relative, sub_entry in scan_files(entry.path, suffix):
+                    yield os.path.join(entry.name, relative), sub_entry
+            elif entry.name.endswith(suffix) and entry.is_file():
+                yield entry.name, entry
+
+
+def scratch_dir(out_loc, scratch_root='/dev/shm'):
+    """
+    Scratch directory of a sweep, the same for every call with the same out_loc.
+
+    Falls back to the system temporary directory when scratch_root does not exist or is not writable.
+    """
+    if not (os.path.isdir(scratch_root) and os.access(scratch_root, os.W_OK)):
+        scratch_root = tempfile.gettempdir()
+    key = hashlib.md5(os.path.abspath(out_loc).encode()).hexdigest()[:8]
+    return os.path.join(scratch_root, f"pv_{key}")
@@ -0,0 +1,166 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Streaming run -> parse pipeline.
+
+Instead of writing every run to out_loc and extracting everything afterwards with
+batch_extract_plumeria_output_Main.py, each finished run is handed to a consumer thread that
+parses the output file right away and appends the row to the result CSV. Rows are flushed every
+flush_every runs or flush_seconds, so partial results can be inspected while a sweep is still
+running, and raw output (and input) files can be deleted once parsed to keep disk usage flat. Raw
+files are only deleted after the flush that wrote their rows (and profiles), so a crash never loses
+a run that is neither in the CSV nor on disk.
+
+Only the values Plumeria writes are streamed (same columns as batch_extract_plumeria_ouput_AUX.py
+plus the run name). Derived columns need the whole sweep (dry plume heights, rho_dry) and are
+computed afterwards on the CSV.
+
+Note: with delete_raw on, finished runs are no longer visible to the result cache (result_cache.py),
+use the sweep journal to resume.
+
+Usage:
+    with StreamingExtractor(csv_path, out_loc) as extractor:
+        for result in iter_batch(jobs, plumeria_loc):
+            extractor(result)
+'''
+
+import os
+import queue
+import threading
+import numpy as np
+import pandas as pd
+from timeit import default_timer as timer
+from plumeria_parser import ROW_COLUMNS, parse_file, summary_row
+from profile_store import ProfileStoreWriter
+from run_paths import input_path, output_path
+
+_STOP = object()
+
+
+class StreamingExtractor:
+    """Consumer thread that parses finished runs and appends them to a CSV file."""
+
+    def __init__(self, csv_path, out_loc, dir_loc=None, delete_raw=False, flush_every=1000, flush_seconds=30.0,
+                 profile_store_dir=None, shard_levels=0):
+        self.csv_path = csv_path
+        self.out_loc = out_loc
+        self.dir_loc = dir_loc            # if given, input decks are deleted with the output
+        self.delete_raw = delete_raw
+        self.shard_levels = shard_levels  # hashed subdirectories of out_loc and dir_loc, see run_paths.py
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.n_rows = 0
+        self._n_not_run = 0               # counted by __call__
+        self._n_no_height = 0             # counted by the consumer thread
+        self._rows = []
+        self._pending_delete = []         # raw files of the parsed rows, deleted once the rows are flushed
+        self._error = None                # first exception of the consumer thread, raised by __call__ and close()
+        self._error_raised = False
+        # full dz profiles are appended to a profile store (see profile_store.py) if a directory is given
+        self._profiles = ProfileStoreWriter(profile_store_dir, append=True) if profile_store_dir else None
+        self._queue = queue.Queue(maxsize=10 * flush_every)  # bounded so a slow disk pushes back on the runs
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def n_failed(self):
+        """Runs without a usable output: not finished, or an output without a plume height."""
+        return self._n_not_run + self._n_no_height
+
+    def __call__(self, result):
+        """Queue a finished RunResult, runs that did not finish are only counted."""
+        self._raise_error()
+        if result.returncode == 0:
+            self._queue.put(result.name)
+        else:
+            self._n_not_run += 1
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._error is None and self._profiles is not None:
+            self._profiles.close()
+        print(f"{self.n_rows} runs streamed to {self.csv_path}, {self.n_failed} runs without output or plume height")
+        if not self._error_raised:
+            self._raise_error()
+
+    def _raise_error(self):
+        """Re-raise an error of the consumer thread in the caller."""
+        if self._error is not None:
+            self._error_raised = True
+            raise RuntimeError(f"Streaming extraction to {self.csv_path} stopped: {self._error!r}") from self._error
+
+    def _flush(self):
+        if self._rows:
+            df = pd.DataFrame(self._rows, columns=ROW_COLUMNS + ['run'])
+            df.to_csv(self.csv_path, mode='a', index=False, header=not os.path.exists(self.csv_path))
+            self.n_rows += len(self._rows)
+            self._rows = []
+            if self._profiles is not None:
+                self._profiles.flush()   # index of the profiles matches the rows written
+        for path in self._pending_delete:
+            if os.path.exists(path):
+                os.remove(path)
+        self._pending_delete = []
+        self._last_flush = timer()
+
+    def _consume(self):
+        self._last_flush = timer()
+        while True:
+            try:
+                name = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                name = None
+            if name is _STOP:
+                break
+            if self._error is not None:
+                continue    # keep draining the queue so that __call__ never blocks, the error is raised there
+            try:
+                if name is None:
+                    self._flush()
+                else:
+                    self._consume_run(name)
+            except Exception as e:
+                self._error = e
+        if self._error is None:
+            try:
+                self._flush()
+            except Exception as e:
+                self._error = e
+
+    def _consume_run(self, name):
+        path = output_path(self.out_loc, name, self.shard_levels)
+        try:
+            parsed = parse_file(path, profile=self._profiles is not None)
+        except OSError as e:
+            print(f"Could not read output of {name}: {e}")
+            return
+        if not np.isfinite(parsed.heights[0]):
+            # truncated or garbled output, no row is written and the raw file is kept
+            print(f"No plume height in the output of {name}, counted as failed")
+            self._n_no_height += 1
+            return
+        self._rows.append(summary_row(parsed) + [os.path.basename(path)])
+        if self._profiles is not None:
+            self._profiles.add(os.path.basename(path), parsed.dz)
+
+        if self.delete_raw:
+            self._pending_delete.append(path)
+            if self.dir_loc:
+                self._pending_delete.append(input_path(self.dir_loc, name, self.shard_levels))
+
+        if len(self._rows) >= self.flush_every or timer() - self._last_flush > self.flush_seconds:
+            self._flush()
@@ -0,0 +1,191 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Resumable sweep journal backed by SQLite.
+
+Every run of a sweep is recorded with its parameters, state (pending/running/done/timeout/failed),
+number of attempts, timeout, wall time and output path. If a sweep crashes, is interrupted (Ctrl-C)
+or the job is preempted, run_with_journal() on the same journal picks up only the unfinished runs.
+Runs that timed out are retried automatically with a longer timeout (timeout * timeout_factor)
+until max_attempts is reached; runs that exit with an error are marked failed and are not retried.
+
+Usage:
+    with SweepJournal('inp_TEST/sweep_journal.sqlite') as journal:
+        journal.add_runs(rows)   # (name, params, input_path, output_path, timeout)
+        run_with_journal(journal, plumeria_loc, backend='thread')
+'''
+
+import json
+import sqlite3
+import time
+from itertools import groupby
+from batch_executor import iter_batch
+
+STATES = ('pending', 'running', 'done', 'timeout', 'failed')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    name        TEXT PRIMARY KEY,
+    params      TEXT NOT NULL,
+    state       TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    timeout     REAL NOT NULL,
+    wall_time   REAL,
+    input_path  TEXT NOT NULL,
+    output_path TEXT,
+    error       TEXT,
+    updated     REAL
+);
+CREATE INDEX IF NOT EXISTS runs_state ON runs (state);
+'''
+
+
+class SweepJournal:
+    """Per-run state of a sweep stored in a SQLite file."""
+
+    def __init__(self, path, commit_every=1000):
+        self.path = path
+        self.commit_every = commit_every  # writes between commits, committing every run would fsync a million times
+        self._pending_writes = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, sql, args):
+        self.conn.execute(sql, args)
+        self._pending_writes += 1
+        if self._pending_writes >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self.conn.commit()
+        self._pending_writes = 0
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def add_runs(self, rows, retire_missing=False):
+        """
+        Register runs as pending. Runs already in the journal with the same parameters and paths keep their
+        state, a name reused for other parameters or paths (a new grid) is reset to pending.
+
+        Args:
+            rows (iterable): (name, params, input_path, output_path, timeout), params is a JSON serialisable dict.
+            retire_missing (bool): rows is the whole grid, delete the runs of an earlier grid that are not in it.
+        """
+        names = []
+
+        def collect(rows):
+            for row in rows:
+                names.append((row[0],))
+                yield row
+
+        rows = collect(rows)
+        self.conn.executemany(
+            'INSERT INTO runs (name, params, input_path, output_path, timeout, updated) VALUES (?, ?, ?, ?, ?, ?) '
+            "ON CONFLICT (name) DO UPDATE SET params = excluded.params, input_path = excluded.input_path, "
+            "output_path = excluded.output_path, timeout = excluded.timeout, state = 'pending', attempts = 0, "
+            'wall_time = NULL, error = NULL, updated = excluded.updated '
+            'WHERE params != excluded.params OR input_path != excluded.input_path '
+            'OR output_path IS NOT excluded.output_path',
+            ((name, json.dumps(params), input_path, output_path, timeout, time.time())
+             for name, params, input_path, output_path, timeout in rows))
+        if retire_missing:
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS grid (name TEXT PRIMARY KEY)')
+            self.conn.execute('DELETE FROM grid')
+            self.conn.executemany('INSERT OR IGNORE INTO grid (name) VALUES (?)', names)
+            retired = self.conn.execute('DELETE FROM runs WHERE name NOT IN (SELECT name FROM grid)').rowcount
+            self.conn.execute('DELETE FROM grid')
+            if retired:
+                print(f"{retired} runs of an earlier grid removed from the journal")
+        self.commit()
+
+    def mark_running(self, name):
+        self._write("UPDATE runs SET state = 'running', attempts = attempts + 1, updated = ? WHERE name = ?",
+                    (time.time(), name))
+
+    def record(self, result, timeout_factor=2.0):
+        """Store a RunResult, timed-out runs get their timeout multiplied by timeout_factor for the next attempt."""
+        if result.timed_out:
+            self._write("UPDATE runs SET state = 'timeout', wall_time = ?, error = ?, timeout = timeout * ?, updated = ? "
+                        "WHERE name = ?", (result.wall_time, result.error, timeout_factor, time.time(), result.name))
+        else:
+            state = 'done' if result.returncode == 0 else 'failed'
+            self._write('UPDATE runs SET state = ?, wall_time = ?, error = ?, updated = ? WHERE name = ?',
+                        (state, result.wall_time, result.error, time.time(), result.name))
+
+    def reset(self, names):
+        """Mark runs pending again with no attempts, e.g. done runs whose results were lost."""
+        self.conn.executemany("UPDATE runs SET state = 'pending', attempts = 0, updated = ? WHERE name = ?",
+                              ((time.time(), name) for name in names))
+        self.commit()
+
+    def unfinished(self, max_attempts=3):
+        """
+        Runs still to do: pending, interrupted while running, or timed out with attempts left.
+
+        Returns:
+            list: (name, input_path, timeout) sorted by timeout.
+        """
+        return self.conn.execute(
+            "SELECT name, input_path, timeout FROM runs WHERE state IN ('pending', 'running') "
+            "OR (state = 'timeout' AND attempts < ?) ORDER BY timeout, rowid", (max_attempts,)).fetchall()
+
+    def runs(self, state=None):
+        """Return (name, params, state, attempts, wall_time, output_path) rows, optionally only for one state."""
+        sql = 'SELECT name, params, state, attempts, wall_time, output_path FROM runs'
+        rows = self.conn.execute(sql + ' WHERE state = ?', (state,)) if state else self.conn.execute(sql)
+        return [(name, json.loads(params), *rest) for name, params, *rest in rows]
+
+    def counts(self):
+        """Number of runs per state."""
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(self.conn.execute('SELECT state, COUNT(*) FROM runs GROUP BY state'))
+        return counts
+
+
+def run_with_journal(journal, plumeria_loc, backend='thread', n_workers=None, max_in_flight=None,
+                     max_attempts=3, timeout_factor=2.0, on_result=None):
+    """
+    Execute every unfinished run of a journal, retrying timed-out runs with a longer timeout.
+
+    on_result, if given, is called with every RunResult once it is recorded (e.g. a StreamingExtractor).
+
+    Returns:
+        dict: Number of runs per state once the sweep is finished.
+    """
+    def jobs(group):
+        for name, input_path, _ in group:
+            journal.mark_running(name)
+            yield name, input_path
+
+    try:
+        todo = journal.unfinished(max_attempts)
+        while todo:
+            # iter_batch takes a single timeout, so runs are executed in groups of equal timeout
+            for timeout, group in groupby(todo, key=lambda row: row[2]):
+                for result in iter_batch(jobs(group), plumeria_loc, backend, n_workers, max_in_flight, timeout):
+                    journal.record(result, timeout_factor)
+                    if on_result is not None:
+                        on_result(result)
+            journal.commit()
+            todo = journal.unfinished(max_attempts)
+    finally:
+        journal.commit()
+
+    counts = journal.counts()
+    print(', '.join(f"{n} {state}" for state, n in counts.items()))
+    return counts
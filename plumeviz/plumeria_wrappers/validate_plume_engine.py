@@ -0,0 +1,130 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Author       : Edgar Carrillo
+# Created      : 2026-10-17
+# Last Modified: 2026-10-17
+# Affiliation  : Vanderbilt University
+
+'''
+Validation of the in-process plume engine (plume_engine.py) against Plumeria v2.3.1 output files.
+
+The parameters of every run are read back from the header of its output file (the deck values that
+are not in the header, lapse rates and tropopause, are the make_inp_file() defaults), the same runs
+are integrated with the engine and both are compared:
+    height_err          relative error of the calculated plume height
+    rho_mix_err         relative error of the mixture density at the vent
+    mass_flux_err       relative error of the vent mass flux
+    <column>_rms_err    RMS relative error of the u, T_mix, rho_mix and r profiles, the engine profile
+                        is interpolated at the heights of the Fortran dz table
+    regime_match        both runs collapse (denser than air at the top) or both rise buoyantly
+
+Usage:
+    python validate_plume_engine.py out_TEST [plumeria_data/engine_validation.csv]
+'''
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+from plumeria_parser import HEADER_COLUMNS, DZ_COLUMNS, parse_file
+from plume_engine import simulate
+
+PROFILE_COLUMNS = ['u', 'T_mix', 'rho_mix', 'r']
+
+## simulate() argument: output file header column
+HEADER_PARAMS = {
+    'humid': 'Relative humidity, %',
+    'air_temp': 'Air temperature at vent (C)',
+    'vent_diam': 'vent diameter (m)',
+    'vent_elev': 'vent elevation (m)',
+    'vent_vel': 'initial velocity (m/s)',
+    'magma_temp': 'magma temperature (c)',
+    'gas_frac': 'weight fraction gas',
+    'specific_heat': 'magma specific heat (j/kg k)',
+    'magma_density': 'magma density (kg/m3)',
+    'water_wt': 'mass fraction water added',
+}
+
+
+def _relative_error(value, reference):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (value - reference) / reference
+
+
+def collapsed(dz):
+    """True if the mixture is still denser than the air in the last row of a dz table."""
+    return bool(len(dz)) and dz[-1, DZ_COLUMNS.index('rho_mix')] > dz[-1, DZ_COLUMNS.index('rho_air')]
+
+
+def profile_error(reference, engine, column):
+    """RMS relative error of a dz column, over the heights of the reference table covered by both runs."""
+    z = DZ_COLUMNS.index('z')
+    i = DZ_COLUMNS.index(column)
+    if len(reference) == 0 or len(engine) < 2:
+        return np.nan
+    covered = reference[:, z] <= engine[-1, z]
+    if not covered.any():
+        return np.nan
+    values = np.interp(reference[covered, z], engine[:, z], engine[:, i])
+    return float(np.sqrt(np.nanmean(_relative_error(values, reference[covered, i])**2)))
+
+
+def validate(out_loc, chunk_size=2000, **kwargs):
+    """
+    Compare every Plumeria output file in out_loc with the engine.
+
+    Args:
+        out_loc (str): Directory of Plumeria output files (runs without a sounding file).
+        chunk_size (int): Runs integrated together.
+        **kwargs: Passed to simulate(), e.g. alpha or step_fraction.
+
+    Returns:
+        DataFrame: One row per run, see the module docstring for the columns.
+    """
+    paths = sorted(os.path.join(out_loc, f) for f in os.listdir(out_loc) if f.endswith('.txt'))
+    references = []
+    for path in paths:
+        parsed = parse_file(path)
+        if np.isfinite(parsed.header).all() and len(parsed.dz):
+            references.append((os.path.basename(path), parsed))
+    if not references:
+        raise ValueError(f"No readable Plumeria output files in {out_loc}")
+
+    rows = []
+    for start in range(0, len(references), chunk_size):
+        chunk = references[start:start + chunk_size]
+        headers = np.array([parsed.header for _, parsed in chunk])
+        params = {key: headers[:, HEADER_COLUMNS.index(column)] for key, column in HEADER_PARAMS.items()}
+        for (run, reference), engine in zip(chunk, simulate(**params, **kwargs)):
+            row = {'run': run}
+            row.update({key: reference.header[HEADER_COLUMNS.index(column)] for key, column in HEADER_PARAMS.items()})
+            row['height_fortran (km)'] = reference.heights[0]
+            row['height_engine (km)'] = engine.heights[0]
+            row['height_err'] = _relative_error(engine.heights[0], reference.heights[0])
+            row['rho_mix_err'] = _relative_error(engine.header[10], reference.header[10])
+            row['mass_flux_err'] = _relative_error(engine.header[12], reference.header[12])
+            for column in PROFILE_COLUMNS:
+                row[f"{column}_rms_err"] = profile_error(reference.dz, engine.dz, column)
+            row['regime_match'] = collapsed(reference.dz) == collapsed(engine.dz)
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def summarize(df):
+    """Print the median and 90th percentile of the absolute errors and the regime agreement."""
+    errors = [c for c in df.columns if c.endswith('_err')]
+    summary = df[errors].abs().quantile([0.5, 0.9]).T
+    summary.columns = ['median', 'p90']
+    print(f"{len(df)} runs, regime agrees in {df['regime_match'].mean():.1%}")
+    print(summary.to_string(float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        raise SystemExit('usage: python validate_plume_engine.py out_dir [report.csv]')
+    df = validate(sys.argv[1])
+    summarize(df)
+    if len(sys.argv) > 2:
+        df.to_csv(sys.argv[2], index=False)
+        print(f"Report saved at {sys.argv[2]}")
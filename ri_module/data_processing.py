@@ -1,23 +1,34 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from constants import COLUMNS
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plumeviz', 'plumeria_wrappers'))
+from plume_dataset import PlumeDataset
 
-def load_data(input_file_path):
+
+def load_data(input_file_path, columns=None, **filters):
     """Load and clean the dataset.
 
+    Only the requested columns and the rows that pass the filters are read (see plume_dataset.py).
+
     Args:
         input_file_path (str): Path to the input CSV file.
+        columns (list, optional): Columns to load. Defaults to None (all columns).
+        **filters: Row filters, e.g. u=[75, 100, 125], T=900, w=(0, 0.3).
 
     Returns:
         pd.DataFrame: Cleaned DataFrame.
     """
     if not os.path.exists(input_file_path):
         raise FileNotFoundError(f"File not found: {input_file_path}")
-    
+    if columns is not None and COLUMNS["vent_diameter"] not in columns:
+        columns = list(columns) + [COLUMNS["vent_diameter"]]
+
     try:
-        df = pd.read_csv(input_file_path)
+        df = PlumeDataset(input_file_path).read(columns, compact=False, **filters)
     except Exception as e:
         raise RuntimeError(f"Error reading file {input_file_path}: {e}")
     
@@ -100,6 +111,88 @@ def ri_borders(df_condition, water_fraction):
     return df_w[df_w['diff'] > threshold].index
 
 
+def border_thresholds(water_fraction, temperature, velocity, std_dev):
+    """Jump threshold of ri_borders() for every group, vectorized over arrays of group keys.
+
+    Args:
+        water_fraction, temperature, velocity (np.ndarray): Group keys.
+        std_dev (np.ndarray): Standard deviation of the plume height jumps of each group.
+
+    Returns:
+        np.ndarray: Thresholds, same conditions and order as ri_borders().
+    """
+    factor = np.select(
+        [
+            water_fraction >= 0.3,
+            (water_fraction < 0.3) & (1000 < temperature) & (temperature < 1100) & (velocity > 100),
+            (water_fraction < 0.3) & (temperature == 1000) & (velocity == 125),
+        ],
+        [6, 1.5, 3],
+        default=8,
+    )
+    return factor * std_dev
+
+
+def _group_borders(df):
+    """Change points of a frame already sorted by (velocity, temperature, water fraction, mass flux)."""
+    keys = [COLUMNS["initial_velocity"], 'magma temperature (c)', COLUMNS["external_water"]]
+    groups = df.groupby(keys, sort=False)[COLUMNS["plume_height"]]
+    diff = groups.diff().abs()
+
+    # population std of the jumps of each group (same as np.std on the non-NaN diffs)
+    group_id = groups.ngroup()
+    jumps = pd.DataFrame({'group': group_id, 'diff': diff}).dropna()
+    n = jumps.groupby('group')['diff'].transform('count')
+    mean = jumps.groupby('group')['diff'].transform('sum') / n
+    std_dev = np.sqrt(((jumps['diff'] - mean)**2).groupby(jumps['group']).transform('sum') / n)
+
+    threshold = border_thresholds(
+        df.loc[jumps.index, COLUMNS["external_water"]].to_numpy(),
+        df.loc[jumps.index, 'magma temperature (c)'].to_numpy(),
+        df.loc[jumps.index, COLUMNS["initial_velocity"]].to_numpy(),
+        std_dev.to_numpy(),
+    )
+    return df.loc[jumps.index[jumps['diff'].to_numpy() > threshold]]
+
+
+def ri_borders_grouped(df, velocities, temperatures, water_fractions, n_workers=1):
+    """Identify the Ri borders of every (velocity, temperature, water fraction) condition at once.
+
+    The data is sorted once by (velocity, temperature, water fraction, mass flux) and the plume height
+    jumps, their standard deviation and the thresholds of ri_borders() are computed for all groups in
+    one vectorized pass. Gives the same rows, in the same order, as calling filter_data() and
+    ri_borders() for every condition.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        velocities (list): Initial velocities, in the order of the output.
+        temperatures (list): Magma temperatures, in the order of the output.
+        water_fractions (list): External water fractions, in the order of the output.
+        n_workers (int, optional): Split the (velocity, temperature) conditions across this many processes. Defaults to 1.
+
+    Returns:
+        pd.DataFrame: Rows at the Ri borders, with their original index.
+    """
+    # position of each row's condition in the requested order, rows outside the conditions are dropped
+    order = pd.DataFrame({
+        'u': pd.Categorical(df[COLUMNS["initial_velocity"]], categories=velocities).codes,
+        'T': pd.Categorical(df['magma temperature (c)'], categories=temperatures).codes,
+        'w': pd.Categorical(df[COLUMNS["external_water"]], categories=water_fractions).codes,
+    }, index=df.index)
+    order = order.loc[(order >= 0).all(axis=1)]
+    order[COLUMNS["mass_flux"]] = df.loc[order.index, COLUMNS["mass_flux"]]
+    df_sorted = df.loc[order.sort_values(by=['u', 'T', 'w', COLUMNS["mass_flux"]], kind='mergesort').index]
+
+    if n_workers <= 1:
+        return _group_borders(df_sorted)
+
+    conditions = [group for _, group in df_sorted.groupby(
+        [COLUMNS["initial_velocity"], 'magma temperature (c)'], sort=False)]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        borders = list(executor.map(_group_borders, conditions))
+    return pd.concat(borders) if borders else df.iloc[:0]
+
+
 def reduce_dataframe(df):
     """Reduce DataFrame to unique rows.
 
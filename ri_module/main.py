@@ -1,17 +1,17 @@
-from data_processing import load_data, filter_data, reduce_dataframe, ri_borders
+from data_processing import load_data, filter_data, reduce_dataframe, ri_borders_grouped
 from plotting import plot_data
 from constants import COLUMNS
-import pandas as pd 
 
 # Define file paths
 INPUT_PATH = '../data/input/plumeria_data.csv'
 OUTPUT_PATH = '../data/output/collapse_conditions.csv'
+N_WORKERS = 1  # processes for the border detection, the (velocity, temperature) conditions are split across them
 
 def main():
     """Main script to process data, save output, and generate plots."""
     # Load data
     print("Loading data...")
-    df = load_data(INPUT_PATH)
+    df = load_data(INPUT_PATH, u=[75, 100, 125], T=[700, 900, 1100])
     print("Data loaded successfully.")
 
     # Define conditions
@@ -19,22 +19,13 @@ def main():
     temperatures = [700, 900, 1100]
     water_fractions = [w / 100 for w in range(61)]  # 0.00 to 0.60 in increments of 0.01
 
-    # Identify Ri borders and collect results
+    # Identify Ri borders of all conditions in one grouped pass
     print("Identifying Ri borders...")
-    selected_rows = []
-    for vel in velocities:
-        for temp in temperatures:
-            df_condition = filter_data(df, vel, temp)
-            if df_condition.empty:
-                continue
-            for water_fraction in water_fractions:
-                change_points = ri_borders(df_condition, water_fraction)
-                if not change_points.empty:
-                    selected_rows.append(df_condition.loc[change_points])
-
-    # Combine and save selected rows
-    if selected_rows:
-        result_df = pd.concat(selected_rows).reset_index(drop=True)
+    selected_rows = ri_borders_grouped(df, velocities, temperatures, water_fractions, n_workers=N_WORKERS)
+
+    # Save selected rows
+    if not selected_rows.empty:
+        result_df = selected_rows.reset_index(drop=True)
         result_df.to_csv(OUTPUT_PATH, index=False)
         print(f"Collapse conditions saved to {OUTPUT_PATH}.")
     else: